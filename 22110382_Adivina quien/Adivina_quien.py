@@ -1,200 +1,27 @@
-import json
-import os
-import math
-import random
+import argparse
 import tkinter as tk
 from tkinter import messagebox
 from tkinter import simpledialog
 from tkinter import ttk # Para widgets más modernos si se desea
 from PIL import Image, ImageTk
+from estrategias import ESTRATEGIAS
+from motor import ESTRATEGIA_POR_DEFECTO, SistemaInferenciaAnimales
 
-# Nombre del archivo para la base de conocimientos (sin cambios)
-ARCHIVO_CONOCIMIENTO = "conocimiento_animales.json"
 
-# --- Clase SistemaInferenciaAnimales (Lógica del Juego) ---
-class SistemaInferenciaAnimales:
-    def __init__(self, archivo_conocimiento=ARCHIVO_CONOCIMIENTO):
-        self.archivo_conocimiento = archivo_conocimiento
-        self.animales_caracteristicas = self._cargar_conocimiento()
-        self.reset_game_state() # Inicializar estado
-
-    def _cargar_conocimiento(self):
-        # Método privado para encapsular la carga
-        if os.path.exists(self.archivo_conocimiento):
-            try:
-                with open(self.archivo_conocimiento, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    # Convertir listas a sets
-                    return {animal: set(caracteristicas) for animal, caracteristicas in data.items()}
-            except (json.JSONDecodeError, IOError) as e:
-                messagebox.showerror("Error de Carga", f"Error al cargar la base de conocimientos: {e}\nSe iniciará con una base vacía.")
-                return {}
-        return {}
-
-    def _guardar_conocimiento(self):
-        # Método privado para encapsular el guardado
-        try:
-            data_to_save = {animal: sorted(list(caracteristicas))
-                            for animal, caracteristicas in self.animales_caracteristicas.items()}
-            with open(self.archivo_conocimiento, 'w', encoding='utf-8') as f:
-                json.dump(data_to_save, f, indent=4, ensure_ascii=False, sort_keys=True)
-            print(f"Base de conocimientos guardada en {self.archivo_conocimiento}") # Log en consola
-        except IOError as e:
-            messagebox.showerror("Error de Guardado", f"Error al guardar la base de conocimientos: {e}")
-
-    def reset_game_state(self):
-        """Reinicia las variables para un nuevo juego."""
-        self.posibles_animales = set(self.animales_caracteristicas.keys())
-        self.caracteristicas_preguntadas = set()
-        self.caracteristicas_confirmadas = set()
-        self.caracteristicas_negadas = set()
-        self.current_question = None
-        self.last_guess = None # Para saber qué se adivinó incorrectamente
-
-    def is_knowledge_base_empty(self):
-        """Verifica si hay animales en la base de datos."""
-        return not bool(self.animales_caracteristicas)
-
-    def get_next_question(self):
-        """
-        Determina y devuelve la siguiente mejor pregunta o un estado final.
-
-        Returns:
-            tuple: (estado, data) donde estado puede ser:
-                'QUESTION', 'GUESS', 'NO_OPTIONS', 'LEARN_NO_QUESTIONS'
-                y data es la pregunta (str), el animal/es a adivinar (str/set), o None.
-        """
-        if not self.posibles_animales:
-            return ('NO_OPTIONS', None)
-
-        if len(self.posibles_animales) == 1:
-            self.last_guess = list(self.posibles_animales)[0]
-            return ('GUESS', self.last_guess)
-
-        mejor_caracteristica = self._seleccionar_mejor_pregunta()
-
-        if mejor_caracteristica is None:
-            # No hay más preguntas que distingan, pero hay varios animales
-            if len(self.posibles_animales) > 1:
-                # Elegir uno al azar o el primero para intentar adivinar
-                self.last_guess = random.choice(list(self.posibles_animales))
-                # Devolver todos los posibles por si falla y necesita aprender
-                return ('LEARN_NO_QUESTIONS', self.posibles_animales)
-            else: # Esto no debería pasar si la lógica es correcta, pero por si acaso
-                return ('NO_OPTIONS', None)
-
-
-        self.current_question = mejor_caracteristica
-        return ('QUESTION', f"¿Tu animal {mejor_caracteristica}?")
-
-
-    def _seleccionar_mejor_pregunta(self):
-        """Lógica interna para seleccionar la mejor pregunta."""
-        mejor_caracteristica = None
-        mejor_score = -1
-
-        caracteristicas_relevantes = set()
-        for animal in self.posibles_animales:
-            if animal in self.animales_caracteristicas:
-                caracteristicas_relevantes.update(self.animales_caracteristicas[animal] - self.caracteristicas_preguntadas)
-
-        if not caracteristicas_relevantes:
-            return None
-
-        for caracteristica in caracteristicas_relevantes:
-            animales_con = sum(1 for animal in self.posibles_animales if animal in self.animales_caracteristicas and caracteristica in self.animales_caracteristicas[animal])
-            animales_sin = len(self.posibles_animales) - animales_con
-
-            if animales_con == 0 or animales_sin == 0:
-                continue
-
-            score = min(animales_con, animales_sin)
-            if score > mejor_score:
-                mejor_score = score
-                mejor_caracteristica = caracteristica
-
-        return mejor_caracteristica
-
-    def process_answer(self, respuesta_si):
-        """
-        Actualiza el estado basado en la respuesta ('si' o 'no') a self.current_question.
-
-        Args:
-            respuesta_si (bool): True si la respuesta fue 'si', False si fue 'no'.
-        """
-        if self.current_question is None:
-            return # No debería pasar si el flujo es correcto
-
-        question_feature = self.current_question # La característica actual
-        self.caracteristicas_preguntadas.add(question_feature)
-
-        animales_a_eliminar = set()
-        if respuesta_si:
-            self.caracteristicas_confirmadas.add(question_feature)
-            for animal in self.posibles_animales:
-                if animal not in self.animales_caracteristicas or question_feature not in self.animales_caracteristicas[animal]:
-                    animales_a_eliminar.add(animal)
-        else: # Respuesta fue 'no'
-            self.caracteristicas_negadas.add(question_feature)
-            for animal in self.posibles_animales:
-                if animal in self.animales_caracteristicas and question_feature in self.animales_caracteristicas[animal]:
-                    animales_a_eliminar.add(animal)
-
-        self.posibles_animales -= animales_a_eliminar
-        self.current_question = None # Resetear pregunta actual después de procesar
-
-    def aprender_nuevo_animal(self, nombre_animal_correcto, caracteristica_distintiva):
-        """
-        Añade un nuevo animal a la base de conocimientos. Usa el estado interno
-        (confirmadas, negadas) del juego actual.
-
-        Args:
-            nombre_animal_correcto (str): El nombre del animal a aprender.
-            caracteristica_distintiva (str): La característica clave proporcionada por el usuario.
-
-        Returns:
-            bool: True si el aprendizaje fue exitoso, False en caso contrario.
-        """
-        nombre_animal_correcto = nombre_animal_correcto.lower().strip()
-        caracteristica_distintiva = caracteristica_distintiva.lower().strip()
-
-        if not nombre_animal_correcto or not caracteristica_distintiva:
-            messagebox.showwarning("Aprendizaje Fallido", "Debe proporcionar un nombre y una característica distintiva.")
-            return False
-
-        if nombre_animal_correcto in self.animales_caracteristicas:
-            # Lógica para manejar animales existentes (informar, no sobrescribir por simplicidad)
-            conocimiento_existente = self.animales_caracteristicas[nombre_animal_correcto]
-            conflictos_si = self.caracteristicas_confirmadas - conocimiento_existente
-            conflictos_no = self.caracteristicas_negadas.intersection(conocimiento_existente)
-            if conflictos_si or conflictos_no:
-                msg = f"Ya conozco al '{nombre_animal_correcto}', pero tus respuestas contradicen mi información:\n"
-                if conflictos_si: msg += f"- Confirmaste: {conflictos_si}\n"
-                if conflictos_no: msg += f"- Negaste características que tenía: {conflictos_no}\n"
-                msg += "No modificaré la entrada existente."
-                messagebox.showinfo("Conflicto de Conocimiento", msg)
-            else:
-                messagebox.showinfo("Animal Conocido", f"Ya conozco al '{nombre_animal_correcto}' y tus respuestas coinciden. ¡Quizás fallé en adivinar antes!")
-            return False # No se aprendió nada nuevo en este caso
-
-        # Crear nuevo animal
-        nuevas_caracteristicas = set(self.caracteristicas_confirmadas) # Copia
-        nuevas_caracteristicas.add(caracteristica_distintiva)
-        nuevas_caracteristicas -= self.caracteristicas_negadas # Asegurar consistencia
-
-        self.animales_caracteristicas[nombre_animal_correcto] = nuevas_caracteristicas
-        self._guardar_conocimiento() # Guardar inmediatamente
-        messagebox.showinfo("¡Aprendizaje Exitoso!", f"¡He aprendido sobre el '{nombre_animal_correcto}'!")
-        return True
+def avisar_con_messagebox(tipo, titulo, mensaje):
+    # Muestra los avisos del motor como ventanas emergentes
+    mostrar = {"error": messagebox.showerror, "advertencia": messagebox.showwarning, "info": messagebox.showinfo}
+    mostrar[tipo](titulo, mensaje)
 
 
 # --- Clase AnimalGuesserApp (Interfaz Gráfica Tkinter) ---
 class AnimalGuesserApp:
-    def __init__(self, master):
+    def __init__(self, master, estrategia=ESTRATEGIA_POR_DEFECTO, ruido=None):
         self.master = master
         master.title("Adivinador de Animales")
         master.geometry("800x700") # Tamaño inicial
         master.iconbitmap("icono.ico")
+        master.protocol("WM_DELETE_WINDOW", self.on_close) # Terminar de guardar antes de salir
 
         # Estilo (opcional, para botones más modernos)
         style = ttk.Style()
@@ -203,7 +30,8 @@ class AnimalGuesserApp:
         style.configure("Header.TLabel", font=('Helvetica', 20, 'bold'))
 
         # Instancia del sistema de inferencia
-        self.sistema_inferencia = SistemaInferenciaAnimales()
+        self.sistema_inferencia = SistemaInferenciaAnimales(estrategia=estrategia, ruido=ruido,
+                                                            avisar=avisar_con_messagebox)
 
         # --- Widgets ---
 
@@ -326,6 +154,7 @@ class AnimalGuesserApp:
         self.control_frame.pack() # Mostrar botón de reiniciar
 
         if es_correcto:
+            self.sistema_inferencia.registrar_partida(self.sistema_inferencia.last_guess)
             self.question_label.config(text="¡Genial! ¡He adivinado! :)")
             messagebox.showinfo("¡Éxito!", "¡He adivinado tu animal!")
         else:
@@ -403,6 +232,7 @@ class AnimalGuesserApp:
         aprendido = self.sistema_inferencia.aprender_nuevo_animal(nombre_nuevo, caracteristica_nueva)
 
         if aprendido:
+            self.sistema_inferencia.registrar_partida(nombre_nuevo)
             # Limpiar y volver al estado inicial para jugar de nuevo
             self.hide_all_frames()
             self.control_frame.pack()
@@ -418,6 +248,12 @@ class AnimalGuesserApp:
             messagebox.showinfo("Aprendizaje", "Puedes intentar enseñar de nuevo o reiniciar el juego.")
 
 
+    def on_close(self):
+        """Espera a que se guarde lo aprendido y cierra la ventana."""
+        self.sistema_inferencia.cerrar()
+        self.master.destroy()
+
+
     # --- Helpers para habilitar/deshabilitar y mostrar/ocultar ---
     def enable_answer_buttons(self, enabled):
         state = tk.NORMAL if enabled else tk.DISABLED
@@ -438,7 +274,20 @@ class AnimalGuesserApp:
 
 # --- Ejecución Principal ---
 if __name__ == "__main__":
-    root = tk.Tk()
-    root.configure(bg='#E8F5E9')
-    app = AnimalGuesserApp(root)
-    root.mainloop()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Adivinador de animales")
+    parser.add_argument("--estrategia", choices=sorted(ESTRATEGIAS), default=ESTRATEGIA_POR_DEFECTO)
+    parser.add_argument("--ruido", type=float, default=None,
+                        help="Modo tolerante a errores con esta probabilidad de respuesta equivocada (ej. 0.05)")
+    parser.add_argument("--evaluar", action="store_true",
+                        help="Mostrar preguntas promedio y peor caso de cada estrategia y salir")
+    args = parser.parse_args()
+
+    if args.evaluar:
+        sistema = SistemaInferenciaAnimales()
+        for nombre in ESTRATEGIAS:
+            print(sistema.evaluar_estrategia(nombre))
+    else:
+        root = tk.Tk()
+        root.configure(bg='#E8F5E9')
+        app = AnimalGuesserApp(root, estrategia=args.estrategia, ruido=args.ruido)
+        root.mainloop()
\ No newline at end of file
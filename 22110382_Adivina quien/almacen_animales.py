@@ -0,0 +1,254 @@
+import json
+import os
+import queue
+import threading
+from array import array
+from matriz_conocimiento import MatrizConocimiento, a_arreglos
+
+# Persistencia de la base de animales sin bloquear la interfaz.
+# - Cada animal aprendido se anexa como una línea JSON a
+#   <archivo>.journal.jsonl, con fsync, desde un hilo escritor: aprender
+#   solo encola la línea.
+# - conocimiento_animales.json sigue siendo la base legible de siempre, pero
+#   solo se reescribe al compactar (en el mismo hilo, con archivo temporal y
+#   os.replace, así nunca queda a medio escribir).
+# - Al compactar también se escribe <base>.bin, una foto binaria con los
+#   nombres y los ids de características de cada animal. Cargarla evita
+#   procesar el JSON texto por texto; se usa solo si corresponde al JSON actual
+#   (mismo tamaño y fecha de modificación).
+# - Si el proceso muere a mitad de una compactación, al cargar se reaplican la
+#   bitácora vieja (.compactando) y la nueva.
+# - El conteo de partidas (<base>_partidas.json) y el árbol de decisión
+#   también los reescribe el hilo escritor, con archivo temporal y os.replace;
+#   si se encolan varias versiones de un archivo antes de que llegue a
+#   escribirlo, solo se escribe la más reciente.
+
+UMBRAL_COMPACTAR = 1000
+MAGICO = b"ADIVINA-QUIEN 3\n" # 3: solo se fusionan variantes de escritura (canonizacion.py)
+
+
+class AlmacenAnimales:
+    def __init__(self, archivo, umbral_compactar=UMBRAL_COMPACTAR):
+        self.archivo = archivo
+        self.journal = archivo + ".journal.jsonl"
+        self.journal_compactando = archivo + ".journal.compactando.jsonl"
+        self.foto = os.path.splitext(archivo)[0] + ".bin"
+        self.umbral_compactar = umbral_compactar
+        self.matriz = None
+        # Quien modifica la matriz debe tomar este candado: el hilo escritor la copia al compactar
+        self.bloqueo = threading.Lock()
+        self._cola = queue.Queue()
+        self._hilo = None
+        self._pendientes = 0
+        self._reemplazos = {} # archivo -> función que escribe su última versión aún sin escribir
+        self._bloqueo_reemplazos = threading.Lock()
+
+    def cargar(self):
+        """
+        Carga la base: foto binaria (o JSON si no hay foto válida) más las bitácoras.
+
+        Returns:
+            MatrizConocimiento: La base cargada.
+
+        Raises:
+            json.JSONDecodeError, IOError: Si el JSON está dañado o no se puede leer.
+        """
+        matriz = self._cargar_foto()
+        foto_valida = matriz is not None
+        if matriz is None:
+            datos = {}
+            if os.path.exists(self.archivo):
+                with open(self.archivo, 'r', encoding='utf-8') as f:
+                    datos = json.load(f)
+            matriz = MatrizConocimiento(datos)
+
+        for journal in (self.journal_compactando, self.journal):
+            for entrada in self._leer_journal(journal):
+                # Una bitácora ya incluida en la foto puede reaplicarse tras un fallo
+                if entrada["animal"] not in matriz.indice_animal:
+                    matriz.agregar_animal(entrada["animal"], entrada["caracteristicas"])
+                    self._pendientes += 1
+
+        self.matriz = matriz
+        if self._pendientes >= self.umbral_compactar:
+            self._encolar(("compactar", None))
+        elif len(matriz) and not foto_valida:
+            self._encolar(("foto", None)) # La próxima carga ya será rápida
+        return matriz
+
+    def _firma_json(self):
+        if not os.path.exists(self.archivo):
+            return None
+        estado = os.stat(self.archivo)
+        return [estado.st_size, estado.st_mtime_ns]
+
+    def _cargar_foto(self):
+        if not os.path.exists(self.foto):
+            return None
+        try:
+            with open(self.foto, 'rb') as f:
+                datos = f.read()
+            if not datos.startswith(MAGICO):
+                return None
+            fin = datos.index(b"\n", len(MAGICO))
+            cabecera = json.loads(datos[len(MAGICO):fin])
+            if cabecera["json"] != self._firma_json():
+                return None # El JSON se editó después de escribir la foto
+
+            posicion = fin + 1
+            bloques = []
+            for tipo, tamano in cabecera["bloques"]:
+                bloque = datos[posicion:posicion + tamano]
+                posicion += tamano
+                if tipo == "texto":
+                    texto = bloque.decode("utf-8")
+                    bloques.append(texto.split("\n") if texto else [])
+                else:
+                    arreglo = array(tipo)
+                    arreglo.frombytes(bloque)
+                    bloques.append(arreglo)
+            return MatrizConocimiento.desde_arreglos(*bloques)
+        except (ValueError, KeyError, IOError) as e:
+            print(f"Foto binaria ignorada: {e}") # Se carga el JSON
+            return None
+
+    @staticmethod
+    def _leer_journal(journal):
+        if not os.path.exists(journal):
+            return
+        with open(journal, 'r', encoding='utf-8') as f:
+            for linea in f:
+                try:
+                    yield json.loads(linea)
+                except json.JSONDecodeError:
+                    # Última línea truncada por una caída: se descarta
+                    break
+
+    def _encolar(self, tarea):
+        if self._hilo is None or not self._hilo.is_alive():
+            self._hilo = threading.Thread(target=self._escritor, daemon=True)
+            self._hilo.start()
+        self._cola.put(tarea)
+
+    def registrar(self, animal, caracteristicas):
+        """
+        Encola un animal aprendido para anexarlo a la bitácora. No bloquea: la
+        escritura y el fsync ocurren en el hilo escritor.
+
+        Args:
+            animal (str): Nombre del animal (ya agregado a la matriz).
+            caracteristicas (iterable): Sus características.
+        """
+        self._encolar(("animal", {"animal": animal, "caracteristicas": sorted(caracteristicas)}))
+
+    def _reemplazar(self, archivo, escribir):
+        # Si el archivo ya tenía una versión esperando, solo se escribirá esta
+        with self._bloqueo_reemplazos:
+            encolado = archivo in self._reemplazos
+            self._reemplazos[archivo] = escribir
+        if not encolado:
+            self._encolar(("reemplazar", archivo))
+
+    def guardar_partidas(self, archivo, partidas):
+        """
+        Encola el conteo de partidas para reescribirlo en el hilo escritor. No
+        bloquea; si ya había un conteo esperando, se reemplaza por este.
+
+        Args:
+            archivo (str): Archivo JSON de partidas.
+            partidas (dict): animal -> veces jugado (se guarda una copia).
+        """
+        partidas = dict(partidas)
+        self._reemplazar(archivo, lambda f: json.dump(partidas, f, ensure_ascii=False))
+
+    def guardar_arbol(self, archivo, datos):
+        """
+        Encola un árbol de decisión para reescribirlo en el hilo escritor.
+
+        Args:
+            archivo (str): Archivo JSON del árbol.
+            datos (dict): Copia del árbol (ver ArbolDecision.instantanea); no se modifica después.
+        """
+        self._reemplazar(archivo, lambda f: json.dump(datos, f, ensure_ascii=False, separators=(",", ":")))
+
+    def _escritor(self):
+        while True:
+            tipo, datos = self._cola.get()
+            try:
+                if tipo == "animal":
+                    with open(self.journal, 'a', encoding='utf-8') as f:
+                        f.write(json.dumps(datos, ensure_ascii=False) + "\n")
+                        f.flush()
+                        os.fsync(f.fileno())
+                    self._pendientes += 1
+                    if self._pendientes >= self.umbral_compactar:
+                        self.compactar()
+                elif tipo == "compactar":
+                    self.compactar()
+                elif tipo == "foto":
+                    with self.bloqueo:
+                        listas = self.matriz.listas()
+                    self._escribir_foto(*listas)
+                elif tipo == "reemplazar":
+                    with self._bloqueo_reemplazos:
+                        escribir = self._reemplazos.pop(datos)
+                    self._escribir_atomico(datos, escribir, modo='w')
+            except (IOError, OSError) as e:
+                print(f"Error al guardar la base de conocimientos: {e}")
+            finally:
+                self._cola.task_done()
+
+    def compactar(self):
+        """Reescribe el JSON y la foto binaria de forma atómica y descarta la bitácora aplicada."""
+        with self.bloqueo:
+            if os.path.exists(self.journal):
+                if os.path.exists(self.journal_compactando):
+                    # Restos de una compactación interrumpida: se anexan primero
+                    with open(self.journal_compactando, 'a', encoding='utf-8') as destino, \
+                            open(self.journal, 'r', encoding='utf-8') as origen:
+                        destino.write(origen.read())
+                    os.remove(self.journal)
+                else:
+                    os.replace(self.journal, self.journal_compactando)
+            animales, caracteristicas, caracteristicas_de = self.matriz.listas()
+            self._pendientes = 0
+
+        data_to_save = {animal: sorted(caracteristicas[i] for i in ids)
+                        for animal, ids in zip(animales, caracteristicas_de)}
+        self._escribir_atomico(self.archivo, lambda f: json.dump(
+            data_to_save, f, indent=4, ensure_ascii=False, sort_keys=True), modo='w')
+
+        self._escribir_foto(animales, caracteristicas, caracteristicas_de)
+        if os.path.exists(self.journal_compactando):
+            os.remove(self.journal_compactando)
+        print(f"Base de conocimientos guardada en {self.archivo}") # Log en consola
+
+    def _escribir_foto(self, animales, caracteristicas, caracteristicas_de):
+        # Puede incluir animales que aún están en la bitácora: al reaplicarla se omiten
+        bloques = []
+        for arreglo in a_arreglos(animales, caracteristicas, caracteristicas_de):
+            if isinstance(arreglo, list):
+                bloques.append(("texto", "\n".join(arreglo).encode("utf-8")))
+            else:
+                bloques.append((arreglo.typecode, arreglo.tobytes()))
+        cabecera = json.dumps({"json": self._firma_json(),
+                               "bloques": [(tipo, len(bloque)) for tipo, bloque in bloques]})
+
+        def escribir_foto(f):
+            f.write(MAGICO + cabecera.encode("utf-8") + b"\n")
+            for _, bloque in bloques:
+                f.write(bloque)
+        self._escribir_atomico(self.foto, escribir_foto, modo='wb')
+
+    @staticmethod
+    def _escribir_atomico(archivo, escribir, modo):
+        temporal = archivo + ".tmp"
+        with open(temporal, modo, **({} if 'b' in modo else {"encoding": "utf-8"})) as f:
+            escribir(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporal, archivo)
+
+    def esperar(self):
+        """Espera a que el hilo escritor termine lo encolado (p. ej. al salir)."""
+        self._cola.join()
@@ -0,0 +1,212 @@
+import json
+import os
+
+# Árbol de decisión que guarda las preguntas elegidas por una estrategia.
+# Cada partida empieza en la raíz y baja un nodo por respuesta, así que las
+# primeras preguntas (las más caras, con todos los animales como candidatos)
+# se calculan una sola vez para todas las partidas. Los nodos se expanden
+# conforme se visitan y el árbol se guarda junto a la base de conocimientos.
+#
+# Nodos en listas paralelas; la raíz es el nodo 0. pregunta[nodo] es el id de
+# la característica a preguntar, HOJA si ya no hay pregunta que distinga a los
+# candidatos o PENDIENTE si aún no se ha calculado.
+#
+# El árbol es voraz: cada nodo guarda la pregunta que la estrategia elige para
+# sus candidatos (p. ej. la de mayor ganancia de información inmediata), no el
+# árbol con menos preguntas en promedio, cuya construcción es NP-difícil.
+#
+# Las estrategias con pesos a priori (usa_pesos) eligen según las veces que se
+# ha jugado cada animal. El árbol recuerda el peso total con que se empezó
+# (peso_base) y deja de ser vigente cuando los pesos crecen más de
+# TOLERANCIA_PESOS desde entonces: el motor lo reinicia y no se carga de disco.
+
+HOJA = -1
+PENDIENTE = -2
+TOLERANCIA_PESOS = 0.1
+
+
+class ArbolDecision:
+    def __init__(self, peso_base=None):
+        self.pregunta = []
+        self.si = []
+        self.no = []
+        self.padre = []
+        self.modificado = False # Hay cambios sin guardar
+        self.peso_base = peso_base # Peso a priori total de la base al empezar el árbol
+        self.generacion = 0 # Cambia al reiniciar: las partidas en curso dejan de seguir el árbol
+        self._nuevo_nodo(-1)
+
+    def __len__(self):
+        return len(self.pregunta)
+
+    def _nuevo_nodo(self, padre):
+        self.pregunta.append(PENDIENTE)
+        self.si.append(-1)
+        self.no.append(-1)
+        self.padre.append(padre)
+        return len(self.pregunta) - 1
+
+    def reiniciar(self, peso_base):
+        """Descarta todos los nodos (en su lugar: las sesiones comparten el árbol)."""
+        self.pregunta, self.si, self.no, self.padre = [], [], [], []
+        self._nuevo_nodo(-1)
+        self.peso_base = peso_base
+        self.generacion += 1
+        self.modificado = True
+
+    def pesos_vigentes(self, peso_total):
+        """
+        Indica si las preguntas se eligieron con pesos a priori parecidos a los actuales.
+
+        Args:
+            peso_total (float): Peso a priori total actual de la base.
+        """
+        return self.peso_base is not None and self.peso_base <= peso_total <= self.peso_base * (1 + TOLERANCIA_PESOS)
+
+    def estado(self, nodo, matriz):
+        """
+        Candidatos y respuestas que llevan de la raíz hasta el nodo.
+
+        Returns:
+            tuple: (máscara de candidatos, ids confirmados, ids negados)
+        """
+        candidatos, confirmadas, negadas = matriz.todos, set(), set()
+        while self.padre[nodo] >= 0:
+            padre = self.padre[nodo]
+            columna = matriz.columna(self.pregunta[padre])
+            if self.si[padre] == nodo:
+                candidatos &= columna
+                confirmadas.add(self.pregunta[padre])
+            else:
+                candidatos &= ~columna
+                negadas.add(self.pregunta[padre])
+            nodo = padre
+        return candidatos, confirmadas, negadas
+
+    def expandir(self, nodo, matriz, estrategia, estado=None):
+        """
+        Calcula la pregunta de un nodo pendiente y crea sus dos hijos.
+
+        Args:
+            estado (tuple): (candidatos, confirmadas, negadas) del nodo si ya se
+                conocen; si no, se recalculan desde la raíz.
+        """
+        candidatos, confirmadas, negadas = estado or self.estado(nodo, matriz)
+        id_car = estrategia.elegir(matriz, candidatos, confirmadas, negadas)
+        if id_car is not None:
+            columna = matriz.columna(id_car)
+            if not (candidatos & columna) or not (candidatos & ~columna):
+                id_car = None
+        self.modificado = True
+        if id_car is None:
+            self.pregunta[nodo] = HOJA
+            return
+        self.pregunta[nodo] = id_car
+        self.si[nodo] = self._nuevo_nodo(nodo)
+        self.no[nodo] = self._nuevo_nodo(nodo)
+
+    def pregunta_en(self, nodo, matriz, estrategia, estado=None):
+        """
+        Id de la característica a preguntar en el nodo, expandiéndolo si hace falta.
+
+        Args:
+            estado (tuple): Estado del nodo, si ya se conoce (ver expandir()).
+
+        Returns:
+            int: Id de la característica, o None si el nodo es una hoja.
+        """
+        if self.pregunta[nodo] == PENDIENTE:
+            self.expandir(nodo, matriz, estrategia, estado)
+        id_car = self.pregunta[nodo]
+        return None if id_car == HOJA else id_car
+
+    def hijo(self, nodo, respuesta_si):
+        return self.si[nodo] if respuesta_si else self.no[nodo]
+
+    def completar(self, matriz, estrategia):
+        """Expande todos los nodos pendientes (árbol completo)."""
+        pila = [nodo for nodo, id_car in enumerate(self.pregunta) if id_car == PENDIENTE]
+        while pila:
+            nodo = pila.pop()
+            self.expandir(nodo, matriz, estrategia)
+            if self.pregunta[nodo] >= 0:
+                pila += [self.si[nodo], self.no[nodo]]
+
+    def agregar_animal(self, matriz, id_animal):
+        """
+        Ajusta el árbol a un animal recién aprendido.
+
+        Las preguntas del camino que sigue el animal siguen dividiendo a los
+        candidatos, así que solo la hoja a la que llega vuelve a quedar
+        pendiente; el resto del árbol no se toca.
+
+        Returns:
+            int: Nodo que quedó pendiente (o el pendiente al que llegó).
+        """
+        caracteristicas = set(matriz.caracteristicas_de[id_animal])
+        nodo = 0
+        while self.pregunta[nodo] >= 0:
+            nodo = self.hijo(nodo, self.pregunta[nodo] in caracteristicas)
+        if self.pregunta[nodo] == HOJA:
+            self.pregunta[nodo] = PENDIENTE
+            self.modificado = True
+        return nodo
+
+    def instantanea(self, matriz):
+        """
+        Copia del árbol lista para json.dump, con las preguntas como texto.
+
+        Solo copia listas, así que es barata; la serialización y la escritura
+        pueden hacerse en otro hilo (ver AlmacenAnimales.guardar_arbol).
+        """
+        usadas = sorted({id_car for id_car in self.pregunta if id_car >= 0})
+        posicion = {id_car: i for i, id_car in enumerate(usadas)}
+        return {
+            "huella": matriz.huella(),
+            "peso_base": self.peso_base,
+            "caracteristicas": [matriz.caracteristicas[id_car] for id_car in usadas],
+            "pregunta": [posicion.get(id_car, id_car) for id_car in self.pregunta],
+            "si": list(self.si),
+            "no": list(self.no),
+            "padre": list(self.padre),
+        }
+
+    def guardar(self, archivo, matriz):
+        """Guarda el árbol (escritura atómica) con las preguntas como texto."""
+        datos = self.instantanea(matriz)
+        temporal = archivo + ".tmp"
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump(datos, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(temporal, archivo)
+        self.modificado = False
+
+    @classmethod
+    def cargar(cls, archivo, matriz, usa_pesos=False):
+        """
+        Carga un árbol guardado si corresponde a la base actual.
+
+        Args:
+            usa_pesos (bool): Si la estrategia elige con los pesos a priori; en
+                ese caso también se descarta si los pesos ya no son vigentes.
+
+        Returns:
+            ArbolDecision: El árbol, o None si no existe, está dañado o la base cambió.
+        """
+        if not os.path.exists(archivo):
+            return None
+        try:
+            with open(archivo, 'r', encoding='utf-8') as f:
+                datos = json.load(f)
+        except (json.JSONDecodeError, IOError):
+            return None
+        if datos.get("huella") != matriz.huella():
+            return None
+        ids = [matriz.indice_caracteristica.get(c) for c in datos["caracteristicas"]]
+        if None in ids:
+            return None
+        arbol = cls(datos.get("peso_base"))
+        if usa_pesos and not arbol.pesos_vigentes(matriz.peso(matriz.todos)):
+            return None
+        arbol.pregunta = [ids[i] if i >= 0 else i for i in datos["pregunta"]]
+        arbol.si, arbol.no, arbol.padre = datos["si"], datos["no"], datos["padre"]
+        return arbol
@@ -0,0 +1,102 @@
+import difflib
+import re
+import unicodedata
+
+# Canonización de características escritas a mano.
+# La base tiene variantes de escritura de la misma característica ("es
+# doméstico" / "es doméstica", "Es Doméstico.", "es domestico"), que el
+# adivinador trataba como preguntas distintas. Cada texto se reduce a una
+# clave: minúsculas, sin acentos ni signos. Los textos con la misma clave, o
+# con claves casi iguales según difflib, comparten un mismo id en la matriz; el
+# texto canónico (el que se pregunta) es la variante más corta.
+# Las aclaraciones ("nada muy bien", "tiene cuatro patas (la mayoría)", "pasa
+# por metamorfosis (renacuajo)") no se quitan de la clave: suelen valer solo
+# para un animal, y fusionarlas haría preguntar algo que otro animal no cumple.
+# Solo se fusionan flexiones palabra por palabra, así que dos claves fusionables
+# comparten las primeras 4 letras de cada palabra: esa firma agrupa a los
+# candidatos y difflib solo compara claves del mismo grupo.
+
+UMBRAL_SIMILITUD = 0.9
+
+_NO_ALFANUMERICO = re.compile(r"[^0-9a-z]+")
+
+
+def normalizar(texto):
+    """
+    Clave de comparación de una característica.
+
+    Args:
+        texto (str): Característica tal como se escribió.
+
+    Returns:
+        str: Minúsculas, sin acentos ni signos y con espacios colapsados.
+    """
+    texto = unicodedata.normalize("NFKD", texto.lower())
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    return _NO_ALFANUMERICO.sub(" ", texto).strip()
+
+
+def firma(clave):
+    """Primeras 4 letras de cada palabra: las claves fusionables tienen la misma."""
+    return tuple(palabra[:4] for palabra in clave.split())
+
+
+def _compatibles(clave, otra):
+    # Solo se fusionan flexiones palabra por palabra ("domestico" / "domestica"):
+    # "vuela" / "no vuela", "aulla" / "maulla" o "africa" / "america" se parecen
+    # según difflib, pero son características distintas
+    palabras, otras = clave.split(), otra.split()
+    if len(palabras) != len(otras):
+        return False
+    for palabra, otra_palabra in zip(palabras, otras):
+        raiz = max(len(palabra), len(otra_palabra)) - 2
+        if palabra != otra_palabra and (raiz < 4 or palabra[:raiz] != otra_palabra[:raiz]):
+            return False
+    return True
+
+
+class Canonizador:
+    def __init__(self, umbral=UMBRAL_SIMILITUD):
+        self.umbral = umbral
+        self.claves = []   # id -> clave
+        self.ids = {}      # clave -> id
+        self.grupos = {}   # firma -> ids con esa firma
+
+    def agregar(self, texto, id_car):
+        """Registra la clave del texto para el id (si aún no la tiene otro)."""
+        clave = normalizar(texto)
+        if clave in self.ids:
+            return
+        while len(self.claves) <= id_car:
+            self.claves.append(None)
+        self.claves[id_car] = clave
+        self.ids[clave] = id_car
+        self.grupos.setdefault(firma(clave), []).append(id_car)
+
+    def buscar(self, texto):
+        """
+        Id de una característica equivalente ya registrada.
+
+        Args:
+            texto (str): Característica nueva.
+
+        Returns:
+            int: Id de la característica equivalente, o None si no hay ninguna.
+        """
+        clave = normalizar(texto)
+        if clave in self.ids:
+            return self.ids[clave]
+        candidatos = [id_car for id_car in self.grupos.get(firma(clave), ())
+                      if _compatibles(clave, self.claves[id_car])]
+        if not candidatos:
+            return None
+        comparador = difflib.SequenceMatcher()
+        comparador.set_seq2(clave)
+        mejor, mejor_puntaje = None, self.umbral
+        for id_car in candidatos:
+            comparador.set_seq1(self.claves[id_car])
+            if comparador.real_quick_ratio() >= mejor_puntaje and comparador.quick_ratio() >= mejor_puntaje:
+                puntaje = comparador.ratio()
+                if puntaje >= mejor_puntaje:
+                    mejor, mejor_puntaje = id_car, puntaje
+        return mejor
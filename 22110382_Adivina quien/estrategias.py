@@ -0,0 +1,149 @@
+import heapq
+import math
+from matriz_conocimiento import ids_de_mascara
+
+# Estrategias intercambiables para elegir la siguiente pregunta.
+# Cada estrategia expone elegir(matriz, candidatos, confirmadas, negadas), que
+# devuelve el id de la característica a preguntar (o None si ninguna distingue a
+# los candidatos), e invalidar(), que se llama cuando la base de conocimientos cambia.
+# Las estrategias son deterministas, así que el motor guarda sus elecciones en
+# un árbol de decisión (arbol_decision.py) y solo las calcula una vez.
+#   minmax        criterio original: maximiza min(animales_con, animales_sin)
+#   entropia      máxima ganancia de información, con pesos a priori por animal
+#   anticipacion  entropía mirando 2 preguntas adelante entre las mejores candidatas
+#   arbol         entropía con el árbol de decisión completo precalculado al iniciar
+#                 (voraz: la mejor pregunta inmediata en cada nodo, no el árbol óptimo)
+
+
+def entropia_binaria(p):
+    """Entropía (bits) de una respuesta sí/no con probabilidad p de 'sí'."""
+    if p <= 0.0 or p >= 1.0:
+        return 0.0
+    return -(p * math.log2(p) + (1 - p) * math.log2(1 - p))
+
+
+class EstrategiaMinMax:
+    nombre = "minmax"
+    usa_pesos = False # No depende de las veces jugadas: su árbol no caduca con las partidas
+
+    def elegir(self, matriz, candidatos, confirmadas=(), negadas=()):
+        return matriz.mejor_division(candidatos, set(confirmadas) | set(negadas))
+
+    def invalidar(self):
+        pass
+
+
+class EstrategiaEntropia:
+    nombre = "entropia"
+    usa_pesos = True
+
+    def puntajes(self, matriz, candidatos, excluidas=()):
+        """
+        Ganancia de información de cada característica que divide a los candidatos.
+
+        Con respuestas verídicas la ganancia es la entropía de la respuesta, que
+        se calcula con los pesos a priori (1 + veces jugado) de cada animal.
+
+        Returns:
+            list: Pares (ganancia en bits, id de característica).
+        """
+        if candidatos.bit_count() < 2:
+            return []
+        total = matriz.peso(candidatos)
+        return [(entropia_binaria(peso / total), id_car)
+                for id_car, peso in matriz.pesos_por_caracteristica(candidatos)
+                if peso < total and id_car not in excluidas]
+
+    def elegir(self, matriz, candidatos, confirmadas=(), negadas=()):
+        puntajes = self.puntajes(matriz, candidatos, set(confirmadas) | set(negadas))
+        if not puntajes:
+            return None
+        return max(puntajes, key=lambda puntaje: puntaje[0])[1]
+
+    def invalidar(self):
+        pass
+
+
+class EstrategiaAnticipacion(EstrategiaEntropia):
+    nombre = "anticipacion"
+
+    def __init__(self, ancho=8):
+        self.ancho = ancho # Cuántas características se exploran a 2 niveles
+
+    def elegir(self, matriz, candidatos, confirmadas=(), negadas=()):
+        excluidas = set(confirmadas) | set(negadas)
+        puntajes = self.puntajes(matriz, candidatos, excluidas)
+        if not puntajes:
+            return None
+        total = matriz.peso(candidatos)
+        mejor, mejor_valor = None, -1.0
+        for ganancia, id_car in heapq.nlargest(self.ancho, puntajes, key=lambda puntaje: puntaje[0]):
+            # Ganancia de esta pregunta más la esperada de la mejor pregunta siguiente
+            columna = matriz.columna(id_car)
+            valor = ganancia
+            for rama in (candidatos & columna, candidatos & ~columna):
+                siguientes = self.puntajes(matriz, rama, excluidas | {id_car})
+                if siguientes:
+                    valor += matriz.peso(rama) / total * max(siguientes)[0]
+            if valor > mejor_valor + 1e-12:
+                mejor, mejor_valor = id_car, valor
+        return mejor
+
+
+class EstrategiaArbol(EstrategiaEntropia):
+    # Misma elección que 'entropia', pero el motor precalcula el árbol completo
+    # al iniciar en lugar de expandirlo conforme se juega (ver arbol_decision.py).
+    # Sigue siendo voraz: minimiza la entropía pregunta a pregunta, no el
+    # número esperado de preguntas de todo el árbol
+    nombre = "arbol"
+    precalcular = True
+
+
+ESTRATEGIAS = {estrategia.nombre: estrategia for estrategia in
+               (EstrategiaMinMax, EstrategiaEntropia, EstrategiaAnticipacion, EstrategiaArbol)}
+
+
+def evaluar(matriz, estrategia):
+    """
+    Juega cada animal de la base con respuestas verídicas y cuenta las preguntas.
+
+    Las partidas comparten sus primeras preguntas, así que se recorre una sola
+    vez el árbol de decisiones que induce la estrategia.
+
+    Args:
+        matriz (MatrizConocimiento): Base de conocimientos.
+        estrategia: Estrategia a evaluar.
+
+    Returns:
+        dict: promedio y peor número de preguntas, promedio ponderado por los
+        pesos a priori y cuántos animales no se pudieron distinguir.
+    """
+    suma = suma_ponderada = 0.0
+    peor = sin_distinguir = 0
+    pila = [(matriz.todos, frozenset(), frozenset(), 0)]
+    while pila:
+        candidatos, confirmadas, negadas, preguntas = pila.pop()
+        id_car = estrategia.elegir(matriz, candidatos, confirmadas, negadas) if candidatos.bit_count() > 1 else None
+        if id_car is not None:
+            columna = matriz.columna(id_car)
+            con, sin = candidatos & columna, candidatos & ~columna
+            if con and sin:
+                pila.append((con, confirmadas | {id_car}, negadas, preguntas + 1))
+                pila.append((sin, confirmadas, negadas | {id_car}, preguntas + 1))
+                continue
+        ids = ids_de_mascara(candidatos)
+        suma += preguntas * len(ids)
+        suma_ponderada += preguntas * sum(matriz.pesos[i] for i in ids)
+        peor = max(peor, preguntas)
+        if len(ids) > 1:
+            sin_distinguir += len(ids)
+
+    n = len(matriz)
+    return {
+        "estrategia": estrategia.nombre,
+        "animales": n,
+        "promedio": suma / n if n else 0.0,
+        "promedio_ponderado": suma_ponderada / sum(matriz.pesos) if n else 0.0,
+        "peor": peor,
+        "sin_distinguir": sin_distinguir,
+    }
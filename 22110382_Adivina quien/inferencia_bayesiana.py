@@ -0,0 +1,124 @@
+import copy
+import numpy as np
+
+# Modo tolerante a errores del adivinador.
+# En lugar de descartar para siempre a los animales que contradicen una
+# respuesta, se lleva el logaritmo de la probabilidad de cada animal y se
+# actualiza con una tasa de error por respuesta: un clic equivocado baja la
+# probabilidad del animal correcto, pero no lo elimina. La partida termina
+# cuando un animal supera UMBRAL de probabilidad a posteriori.
+
+UMBRAL = 0.9
+MAX_PREGUNTAS = 30
+
+# Probabilidad de que el jugador conteste "no" a una característica que el
+# animal tiene registrada (error al contestar)
+ERROR = 0.05
+# Probabilidad de que conteste "sí" a una que no tiene registrada; es mayor
+# porque la base no anota todo lo que un animal tiene
+ERROR_AUSENTE = 0.15
+
+
+def _entropia(p):
+    p = np.clip(p, 1e-12, 1 - 1e-12)
+    return -(p * np.log2(p) + (1 - p) * np.log2(1 - p))
+
+
+class InferenciaBayesiana:
+    def __init__(self, matriz, error=ERROR, error_ausente=ERROR_AUSENTE, umbral=UMBRAL,
+                 max_preguntas=MAX_PREGUNTAS):
+        self.matriz = matriz
+        self.error = error
+        self.error_ausente = error_ausente
+        self.umbral = umbral
+        self.max_preguntas = max_preguntas
+        self._enlaces = -1
+        self.reiniciar()
+
+    def _preparar(self):
+        # Enlaces característica-animal en dos arreglos para sumar con bincount
+        miembros = self.matriz.miembros
+        self._animal_de_enlace = np.concatenate(
+            [np.frombuffer(ids, dtype=np.uint32) for ids in miembros] or [np.empty(0, np.uint32)])
+        self._car_de_enlace = np.repeat(np.arange(len(miembros)), [len(ids) for ids in miembros])
+        self._enlaces = len(self._animal_de_enlace)
+
+    def _ajustar(self):
+        # Otra sesión sobre la misma matriz pudo aprender animales desde reiniciar():
+        # se agregan con su probabilidad a priori y se rehacen los enlaces
+        if self._enlaces != self.matriz._total_enlaces:
+            self._preparar()
+        faltan = len(self.matriz) - len(self.log_prob)
+        if faltan > 0:
+            pesos = np.asarray(self.matriz.pesos, dtype=np.float64)
+            self.log_prob = np.concatenate([self.log_prob, np.log(pesos[-faltan:] / pesos.sum())])
+
+    def copia(self):
+        """Otra partida sobre la misma base: comparte los arreglos de enlaces."""
+        otra = copy.copy(self)
+        otra.reiniciar()
+        return otra
+
+    def reiniciar(self):
+        """Vuelve a las probabilidades a priori (pesos de cada animal)."""
+        if self._enlaces != self.matriz._total_enlaces:
+            self._preparar() # Se aprendió algo desde la última partida
+        pesos = np.asarray(self.matriz.pesos, dtype=np.float64)
+        self.log_prob = np.log(pesos / pesos.sum()) if len(pesos) else pesos
+        self.preguntas = 0
+
+    def actualizar(self, id_car, respuesta_si):
+        """
+        Aplica la verosimilitud de una respuesta.
+
+        Solo cambia la razón entre quienes tienen la característica y quienes
+        no, así que basta con sumar a los animales que la tienen.
+        """
+        if respuesta_si:
+            con, sin = 1 - self.error, self.error_ausente
+        else:
+            con, sin = self.error, 1 - self.error_ausente
+        self._ajustar()
+        miembros = np.frombuffer(self.matriz.miembros[id_car], dtype=np.uint32)
+        self.log_prob[miembros] += np.log(con) - np.log(sin)
+        self.preguntas += 1
+
+    def posterior(self):
+        """Probabilidad a posteriori normalizada de cada animal."""
+        self._ajustar()
+        prob = np.exp(self.log_prob - self.log_prob.max())
+        return prob / prob.sum()
+
+    def mas_probable(self):
+        """
+        Returns:
+            tuple: (id del animal más probable, su probabilidad a posteriori)
+        """
+        prob = self.posterior()
+        id_animal = int(prob.argmax())
+        return id_animal, float(prob[id_animal])
+
+    def mejor_pregunta(self, excluidas=()):
+        """
+        Característica con mayor ganancia de información esperada.
+
+        Args:
+            excluidas (iterable): Ids de características ya preguntadas.
+
+        Returns:
+            int: Id de la característica, o None si ninguna aporta información.
+        """
+        self._ajustar()
+        if not self._enlaces:
+            return None
+        prob = self.posterior()
+        # Probabilidad (a posteriori) de que el animal tenga cada característica
+        con = np.bincount(self._car_de_enlace, weights=prob[self._animal_de_enlace],
+                          minlength=len(self.matriz.miembros))
+        prob_si = (1 - self.error) * con + self.error_ausente * (1 - con)
+        ruido = con * _entropia(self.error) + (1 - con) * _entropia(self.error_ausente)
+        ganancia = _entropia(prob_si) - ruido
+        if excluidas:
+            ganancia[list(excluidas)] = -np.inf
+        mejor = int(ganancia.argmax())
+        return mejor if ganancia[mejor] > 1e-9 else None
@@ -0,0 +1,388 @@
+import hashlib
+from array import array
+from collections import Counter
+from collections.abc import Mapping
+from canonizacion import Canonizador
+
+# Matriz característica × animal codificada en bits.
+# Los candidatos de una partida son un entero de Python cuyo bit i indica si el
+# animal con id i sigue siendo posible. Cada característica guarda la lista de
+# ids de los animales que la tienen y, si es frecuente, también su columna de
+# bits, de modo que contar cuántos candidatos la tienen es
+# (columna & candidatos).bit_count() en lugar de recorrer los conjuntos de cada
+# animal. Las características raras (la mayoría) no guardan columna: con 100k
+# animales y 50k características la matriz completa ocuparía ~600 MB.
+# Las variantes de escritura de una característica ("es doméstico", "es
+# doméstica") comparten id (ver canonizacion.py) y cada animal guarda sus ids
+# en un array ordenado.
+
+# Una característica tiene columna de bits cuando al menos 1 de cada DENSIDAD
+# animales la tiene; a partir de ahí la columna ocupa menos que la lista de ids
+DENSIDAD = 32
+
+
+def ids_de_mascara(mascara):
+    """
+    Devuelve los índices de los bits encendidos de una máscara, en orden.
+
+    Args:
+        mascara (int): Entero no negativo.
+
+    Returns:
+        list: Índices (int) de los bits en 1.
+    """
+    # bin() es lineal; desplazar bit por bit sería cuadrático con enteros grandes.
+    # find() salta los ceros en C: con pocos candidatos no se recorre cada bit en Python
+    binario = bin(mascara)[:1:-1]
+    ids = []
+    i = binario.find("1")
+    while i >= 0:
+        ids.append(i)
+        i = binario.find("1", i + 1)
+    return ids
+
+
+def mascara_de_ids(ids, n):
+    """Máscara con los bits de ids encendidos, para n animales."""
+    datos = bytearray((n + 7) // 8)
+    for i in ids:
+        datos[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(datos, "little")
+
+
+def a_arreglos(animales, caracteristicas, caracteristicas_de):
+    """
+    Arreglos con los que MatrizConocimiento.desde_arreglos reconstruye la matriz.
+
+    Args:
+        animales (list): Nombres, en orden de id.
+        caracteristicas (list): Textos de las características, en orden de id.
+        caracteristicas_de (list): Ids de características de cada animal.
+
+    Returns:
+        tuple: (animales, caracteristicas, inicio_animal, ids_animal, inicio_car, ids_car)
+    """
+    inicio_animal, ids_animal = array("Q", [0]), array("I")
+    miembros = [array("I") for _ in caracteristicas]
+    for id_animal, ids in enumerate(caracteristicas_de):
+        ids_animal.extend(ids)
+        inicio_animal.append(len(ids_animal))
+        for id_car in ids:
+            miembros[id_car].append(id_animal)
+    inicio_car, ids_car = array("Q", [0]), array("I")
+    for ids in miembros:
+        ids_car.extend(ids)
+        inicio_car.append(len(ids_car))
+    return animales, caracteristicas, inicio_animal, ids_animal, inicio_car, ids_car
+
+
+class MatrizConocimiento:
+    def __init__(self, animales_caracteristicas=None, canonizar=True):
+        self.animales = []              # id -> nombre del animal
+        self.indice_animal = {}         # nombre -> id
+        self.caracteristicas = []       # id -> texto canónico de la característica
+        self.indice_caracteristica = {} # texto (canónico o variante) -> id
+        self.miembros = []              # id de característica -> ids de animales que la tienen
+        self.columnas = {}              # id de característica frecuente -> máscara de bits
+        self.caracteristicas_de = []    # id de animal -> ids de sus características
+        self.pesos = []                 # id de animal -> peso a priori (1 + veces jugado)
+        self.todos = 0                  # máscara con todos los animales
+        self.canonizar = canonizar
+        self._canonizador = None
+        self._total_enlaces = 0
+        self._huella = None # (número de animales, huella)
+
+        animales_caracteristicas = animales_caracteristicas or {}
+        # Las características se registran de la más corta a la más larga (y
+        # entre iguales, de la más usada a la menos), así la variante más
+        # neutra de cada una queda como texto canónico
+        usos = Counter(c for caracteristicas in animales_caracteristicas.values() for c in set(caracteristicas))
+        for caracteristica in sorted(usos, key=lambda c: (len(c), -usos[c], c)):
+            self.id_caracteristica(caracteristica, crear=True)
+        # Carga en bloque: las columnas se arman al final, no con un OR por animal
+        for animal, caracteristicas in animales_caracteristicas.items():
+            self._registrar(animal, caracteristicas)
+        self._armar_columnas()
+
+    @property
+    def canonizador(self):
+        # Al cargar la foto binaria se arma solo cuando llega una característica nueva
+        if self._canonizador is None:
+            self._canonizador = Canonizador()
+            for id_car, caracteristica in enumerate(self.caracteristicas):
+                self._canonizador.agregar(caracteristica, id_car)
+        return self._canonizador
+
+    def _armar_columnas(self):
+        n = len(self.animales)
+        self.todos = (1 << n) - 1
+        self.columnas = {}
+        for id_car, ids in enumerate(self.miembros):
+            if len(ids) * DENSIDAD >= n:
+                self.columnas[id_car] = mascara_de_ids(ids, n)
+
+    @classmethod
+    def desde_arreglos(cls, animales, caracteristicas, inicio_animal, ids_animal, inicio_car, ids_car):
+        """
+        Reconstruye la matriz a partir de sus arreglos (ver a_arreglos()), sin
+        volver a procesar cada texto; es lo que hace rápida la carga de la foto binaria.
+
+        Args:
+            animales (list): Nombres, en orden de id.
+            caracteristicas (list): Textos de las características, en orden de id.
+            inicio_animal (array): Desplazamientos (n + 1) de cada animal en ids_animal.
+            ids_animal (array): Ids de características de todos los animales, concatenados.
+            inicio_car (array): Desplazamientos (f + 1) de cada característica en ids_car.
+            ids_car (array): Ids de animales de todas las características, concatenados.
+
+        Returns:
+            MatrizConocimiento: La matriz.
+        """
+        matriz = cls()
+        matriz.animales = list(animales)
+        matriz.indice_animal = dict(zip(matriz.animales, range(len(matriz.animales))))
+        matriz.caracteristicas = list(caracteristicas)
+        matriz.indice_caracteristica = dict(zip(matriz.caracteristicas, range(len(matriz.caracteristicas))))
+        matriz.caracteristicas_de = [ids_animal[inicio_animal[i]:inicio_animal[i + 1]]
+                                     for i in range(len(matriz.animales))]
+        matriz.miembros = [ids_car[inicio_car[i]:inicio_car[i + 1]] for i in range(len(matriz.caracteristicas))]
+        matriz.pesos = [1.0] * len(matriz.animales)
+        matriz._total_enlaces = len(ids_animal)
+        matriz._armar_columnas()
+        return matriz
+
+    def listas(self):
+        """
+        Copia superficial de nombres, características y listas de ids por animal.
+
+        Las listas de ids de cada animal no cambian una vez creadas, así que
+        esta copia (barata) basta para escribir la foto desde otro hilo.
+        """
+        return list(self.animales), list(self.caracteristicas), list(self.caracteristicas_de)
+
+    def __len__(self):
+        return len(self.animales)
+
+    def id_caracteristica(self, caracteristica, crear=False):
+        """
+        Id de una característica o de una variante suya ya conocida.
+
+        Args:
+            caracteristica (str): Texto de la característica.
+            crear (bool): Si no existe ni tiene variante conocida, crearla.
+
+        Returns:
+            int: Id de la característica, o None si no existe y crear es False.
+        """
+        id_car = self.indice_caracteristica.get(caracteristica)
+        if id_car is None and self.canonizar:
+            id_car = self.canonizador.buscar(caracteristica)
+            if id_car is not None:
+                self.indice_caracteristica[caracteristica] = id_car # Variante de una ya conocida
+        if id_car is None and crear:
+            id_car = len(self.caracteristicas)
+            self.caracteristicas.append(caracteristica)
+            self.indice_caracteristica[caracteristica] = id_car
+            self.miembros.append(array("I"))
+            if self.canonizar:
+                self.canonizador.agregar(caracteristica, id_car)
+        return id_car
+
+    def canonica(self, caracteristica):
+        """Texto canónico de una característica (el mismo texto si es nueva)."""
+        id_car = self.id_caracteristica(caracteristica)
+        return caracteristica if id_car is None else self.caracteristicas[id_car]
+
+    def _registrar(self, animal, caracteristicas):
+        if animal in self.indice_animal:
+            raise ValueError(f"El animal '{animal}' ya está en la matriz")
+        id_animal = len(self.animales)
+        # Se recorren ordenadas para que los ids no dependan del orden de los conjuntos
+        ids = array("I", sorted({self.id_caracteristica(c, crear=True) for c in sorted(caracteristicas)}))
+        for id_car in ids:
+            self.miembros[id_car].append(id_animal)
+        self.animales.append(animal)
+        self.indice_animal[animal] = id_animal
+        self.caracteristicas_de.append(ids)
+        self.pesos.append(1.0)
+        self._total_enlaces += len(ids)
+        return id_animal, ids
+
+    def agregar_animal(self, animal, caracteristicas):
+        """
+        Añade un animal nuevo y enciende su bit en las columnas de sus características.
+
+        Args:
+            animal (str): Nombre del animal (no debe existir ya).
+            caracteristicas (iterable): Características del animal.
+
+        Returns:
+            int: Id asignado al animal.
+        """
+        id_animal, ids = self._registrar(animal, caracteristicas)
+        bit = 1 << id_animal
+        self.todos |= bit
+        n = len(self.animales)
+        for id_car in ids:
+            if id_car in self.columnas:
+                self.columnas[id_car] |= bit
+            elif len(self.miembros[id_car]) * DENSIDAD >= n:
+                self.columnas[id_car] = mascara_de_ids(self.miembros[id_car], n)
+        return id_animal
+
+    def columna(self, id_car):
+        """Máscara de animales que tienen la característica con ese id."""
+        if id_car in self.columnas:
+            return self.columnas[id_car]
+        return mascara_de_ids(self.miembros[id_car], len(self.animales))
+
+    def mascara(self, caracteristica):
+        """Máscara de animales que tienen la característica (0 si no se conoce)."""
+        id_car = self.id_caracteristica(caracteristica)
+        return 0 if id_car is None else self.columna(id_car)
+
+    def huella(self):
+        """
+        Resumen de la base (animales y número de características de cada uno)
+        para saber si un árbol guardado corresponde a ella.
+
+        Los animales solo se agregan, nunca se modifican: se recalcula solo
+        cuando cambia su número.
+        """
+        if self._huella is None or self._huella[0] != len(self.animales):
+            resumen = hashlib.sha1()
+            for animal in sorted(self.animales):
+                resumen.update(f"{animal}\t{len(self.caracteristicas_de[self.indice_animal[animal]])}\n".encode("utf-8"))
+            self._huella = (len(self.animales), resumen.hexdigest())
+        return self._huella[1]
+
+    def caracteristicas_de_animal(self, animal):
+        """Conjunto de textos de las características de un animal."""
+        return {self.caracteristicas[i] for i in self.caracteristicas_de[self.indice_animal[animal]]}
+
+    def nombres(self, mascara):
+        """Conjunto de nombres de los animales presentes en la máscara."""
+        return {self.animales[i] for i in ids_de_mascara(mascara)}
+
+    def conteos(self, candidatos):
+        """
+        Cuántos candidatos tiene cada característica relevante.
+
+        Con pocos candidatos es más barato recorrer sus listas de características;
+        con muchos, un AND por columna de bits y una consulta por enlace de las
+        características raras. Se elige el camino con menos trabajo.
+
+        Args:
+            candidatos (int): Máscara de animales restantes.
+
+        Returns:
+            list: Pares (id de característica, animales con ella) ordenados por id.
+        """
+        n = len(self.animales)
+        if candidatos == self.todos: # Primera pregunta: cada característica cuenta a todos sus animales
+            return [(id_car, len(ids)) for id_car, ids in enumerate(self.miembros) if ids]
+        restantes = candidatos.bit_count()
+        enlaces_candidatos = restantes * self._total_enlaces / n if n else 0
+        enlaces_raros = self._total_enlaces - sum(len(self.miembros[i]) for i in self.columnas)
+        # Un AND de 64 animales cuesta mucho menos que contar un enlace en Python
+        costo_columnas = enlaces_raros + len(self.columnas) * n / 256
+
+        if enlaces_candidatos * 4 < costo_columnas:
+            conteo = Counter()
+            for id_animal in ids_de_mascara(candidatos):
+                conteo.update(self.caracteristicas_de[id_animal])
+            return sorted(conteo.items())
+
+        # Un byte por animal (b"1" = 49 si es candidato) para contar los ids con map
+        es_candidato = bin(candidatos)[:1:-1].ljust(n, "0").encode("ascii")
+        conteo = []
+        for id_car, ids in enumerate(self.miembros):
+            if id_car in self.columnas:
+                con = (self.columnas[id_car] & candidatos).bit_count()
+            else:
+                con = sum(map(es_candidato.__getitem__, ids)) - 48 * len(ids)
+            if con:
+                conteo.append((id_car, con))
+        return conteo
+
+    def pesos_por_caracteristica(self, candidatos):
+        """
+        Suma de pesos a priori de los candidatos que tienen cada característica.
+
+        Args:
+            candidatos (int): Máscara de animales restantes.
+
+        Returns:
+            list: Pares (id de característica, peso de los animales con ella).
+        """
+        n = len(self.animales)
+        pesos = self.pesos
+        if candidatos != self.todos and candidatos.bit_count() * 4 < n:
+            suma = {}
+            for id_animal in ids_de_mascara(candidatos):
+                peso = pesos[id_animal]
+                for id_car in self.caracteristicas_de[id_animal]:
+                    suma[id_car] = suma.get(id_car, 0.0) + peso
+            return sorted(suma.items())
+
+        if candidatos == self.todos:
+            return [(id_car, sum(map(pesos.__getitem__, ids))) for id_car, ids in enumerate(self.miembros) if ids]
+        es_candidato = bin(candidatos)[:1:-1].ljust(n, "0").encode("ascii")
+        suma = []
+        for id_car, ids in enumerate(self.miembros):
+            peso = sum(pesos[i] for i in ids if es_candidato[i] == 49)
+            if peso:
+                suma.append((id_car, peso))
+        return suma
+
+    def peso(self, candidatos):
+        """Peso a priori total de los candidatos."""
+        if candidatos == self.todos:
+            return sum(self.pesos)
+        return sum(self.pesos[i] for i in ids_de_mascara(candidatos))
+
+    def mejor_division(self, candidatos, excluidas=()):
+        """
+        Característica que mejor parte a los candidatos, con el criterio
+        min(animales_con, animales_sin).
+
+        Args:
+            candidatos (int): Máscara de animales restantes.
+            excluidas (set): Ids de características que ya no se deben preguntar.
+
+        Returns:
+            int: Id de la característica, o None si ninguna los distingue.
+        """
+        total = candidatos.bit_count()
+        if total < 2:
+            return None
+        mitad = total // 2
+        mejor, mejor_score = None, 0
+        for id_car, con in self.conteos(candidatos):
+            score = min(con, total - con)
+            if score > mejor_score and id_car not in excluidas:
+                mejor, mejor_score = id_car, score
+                if score == mitad: # No hay división mejor que la mitad
+                    break
+        return mejor
+
+
+class VistaAnimales(Mapping):
+    # Vista de solo lectura animal -> conjunto de características sobre la
+    # matriz, para no mantener un diccionario de conjuntos paralelo
+    def __init__(self, matriz):
+        self.matriz = matriz
+
+    def __getitem__(self, animal):
+        if animal not in self.matriz.indice_animal:
+            raise KeyError(animal)
+        return self.matriz.caracteristicas_de_animal(animal)
+
+    def __contains__(self, animal):
+        return animal in self.matriz.indice_animal
+
+    def __iter__(self):
+        return iter(self.matriz.animales)
+
+    def __len__(self):
+        return len(self.matriz.animales)
@@ -0,0 +1,352 @@
+import copy
+import json
+import os
+import random
+from almacen_animales import AlmacenAnimales
+from arbol_decision import ArbolDecision
+from estrategias import ESTRATEGIAS, evaluar
+from matriz_conocimiento import MatrizConocimiento, VistaAnimales
+
+# Motor de inferencia del adivinador de animales, sin dependencias de la
+# interfaz: lo usan la ventana Tkinter (Adivina_quien.py) y el servidor
+# (servidor.py). Los mensajes para el usuario se entregan a la función avisar.
+
+# Nombre del archivo para la base de conocimientos (sin cambios)
+ARCHIVO_CONOCIMIENTO = "conocimiento_animales.json"
+
+# Estrategia para elegir preguntas (ver estrategias.py)
+ESTRATEGIA_POR_DEFECTO = "minmax"
+
+def avisar_en_consola(tipo, titulo, mensaje):
+    print(f"[{tipo}] {titulo}: {mensaje}")
+
+
+# --- Clase SistemaInferenciaAnimales (Lógica del Juego) ---
+class SistemaInferenciaAnimales:
+    def __init__(self, archivo_conocimiento=ARCHIVO_CONOCIMIENTO, estrategia=ESTRATEGIA_POR_DEFECTO, ruido=None,
+                 avisar=avisar_en_consola):
+        self.archivo_conocimiento = archivo_conocimiento
+        # avisar(tipo, titulo, mensaje) con tipo 'error', 'advertencia' o 'info'
+        self._avisar = avisar
+        self.ultimo_aviso = None
+        # Guardar el árbol al terminar cada partida; el servidor lo guarda periódicamente
+        self.autoguardar_arbol = True
+        # Veces que se ha jugado cada animal, para los pesos a priori de las estrategias
+        self.archivo_partidas = os.path.splitext(archivo_conocimiento)[0] + "_partidas.json"
+        # Bitácora + foto binaria; las escrituras ocurren en un hilo aparte
+        self.almacen = AlmacenAnimales(archivo_conocimiento)
+        # Base como matriz de bits: las divisiones se cuentan con popcounts
+        self.matriz = self._cargar_conocimiento()
+        # Vista animal -> conjunto de características (solo lectura)
+        self.animales_caracteristicas = VistaAnimales(self.matriz)
+        self.partidas = self._cargar_partidas()
+        for animal, veces in self.partidas.items():
+            if animal in self.matriz.indice_animal:
+                self.matriz.pesos[self.matriz.indice_animal[animal]] += veces
+        self.estrategia = ESTRATEGIAS[estrategia]() if isinstance(estrategia, str) else estrategia
+        # Árbol con las preguntas ya calculadas, guardado junto a la base
+        self.archivo_arbol = os.path.splitext(archivo_conocimiento)[0] + f"_arbol_{self.estrategia.nombre}.json"
+        usa_pesos = getattr(self.estrategia, "usa_pesos", False)
+        self.arbol = (ArbolDecision.cargar(self.archivo_arbol, self.matriz, usa_pesos)
+                      or ArbolDecision(self.matriz.peso(self.matriz.todos)))
+        if getattr(self.estrategia, "precalcular", False):
+            self.arbol.completar(self.matriz, self.estrategia)
+            self._guardar_arbol()
+        # Modo tolerante a errores: ruido es la probabilidad de que una respuesta sea equivocada
+        self.bayes = None
+        if ruido is not None:
+            from inferencia_bayesiana import InferenciaBayesiana
+            self.bayes = InferenciaBayesiana(self.matriz, error=ruido)
+        self.reset_game_state() # Inicializar estado
+
+    def avisar(self, tipo, titulo, mensaje):
+        self.ultimo_aviso = (tipo, titulo, mensaje)
+        self._avisar(tipo, titulo, mensaje)
+
+    def nueva_sesion(self):
+        """
+        Crea una partida independiente que comparte la base con esta instancia.
+
+        La matriz, el árbol de decisión y el almacén se comparten; la sesión
+        solo tiene su propio estado de juego (la máscara de candidatos y las
+        respuestas dadas), así que crear miles de sesiones es barato.
+
+        Returns:
+            SistemaInferenciaAnimales: La nueva sesión, lista para jugar.
+        """
+        sesion = copy.copy(self)
+        if self.bayes is not None:
+            sesion.bayes = self.bayes.copia()
+        sesion.ultimo_aviso = None
+        sesion.reset_game_state()
+        return sesion
+
+    def _cargar_conocimiento(self):
+        # Método privado para encapsular la carga
+        try:
+            return self.almacen.cargar()
+        except (json.JSONDecodeError, IOError) as e:
+            self.avisar("error", "Error de Carga", f"Error al cargar la base de conocimientos: {e}\nSe iniciará con una base vacía.")
+            self.almacen.matriz = MatrizConocimiento()
+            return self.almacen.matriz
+
+    def _guardar_conocimiento(self, animal, caracteristicas):
+        # Método privado para encapsular el guardado: solo encola el animal para
+        # la bitácora; el archivo se escribe en el hilo del almacén
+        self.almacen.registrar(animal, caracteristicas)
+
+    def cerrar(self):
+        """Espera a que se terminen de escribir los animales aprendidos y el árbol (al salir)."""
+        self._guardar_arbol()
+        self.almacen.esperar()
+
+    def _cargar_partidas(self):
+        if os.path.exists(self.archivo_partidas):
+            try:
+                with open(self.archivo_partidas, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except (json.JSONDecodeError, IOError) as e:
+                print(f"No se pudieron cargar las partidas: {e}") # Solo afecta a los pesos a priori
+        return {}
+
+    def registrar_partida(self, animal):
+        """
+        Cuenta una partida jugada con el animal; sube su peso a priori.
+
+        Args:
+            animal (str): Animal en el que pensaba el jugador.
+        """
+        animal = animal.lower().strip()
+        id_animal = self.matriz.indice_animal.get(animal)
+        if id_animal is None:
+            return
+        self.partidas[animal] = self.partidas.get(animal, 0) + 1
+        self.matriz.pesos[id_animal] += 1
+        if getattr(self.estrategia, "usa_pesos", False):
+            peso_total = self.matriz.peso(self.matriz.todos)
+            if not self.arbol.pesos_vigentes(peso_total):
+                # Las preguntas guardadas se eligieron con pesos que ya cambiaron demasiado
+                self.arbol.reiniciar(peso_total)
+        # Solo se encola: el hilo del almacén reescribe el archivo de forma atómica
+        self.almacen.guardar_partidas(self.archivo_partidas, self.partidas)
+
+    def evaluar_estrategia(self, estrategia=None):
+        """
+        Promedio y peor número de preguntas de una estrategia sobre toda la base.
+
+        Args:
+            estrategia (str): Nombre de la estrategia; por defecto la actual.
+
+        Returns:
+            dict: Resultado de estrategias.evaluar.
+        """
+        if estrategia is None:
+            return evaluar(self.matriz, self.estrategia)
+        return evaluar(self.matriz, ESTRATEGIAS[estrategia]())
+
+    def _guardar_arbol(self):
+        # Solo se copia el árbol; el hilo del almacén lo serializa y lo escribe
+        if not self.arbol.modificado:
+            return
+        self.almacen.guardar_arbol(self.archivo_arbol, self.arbol.instantanea(self.matriz))
+        self.arbol.modificado = False
+
+    def reset_game_state(self):
+        """Reinicia las variables para un nuevo juego."""
+        self.candidatos = self.matriz.todos # Máscara de bits de los animales posibles
+        self.caracteristicas_preguntadas = set()
+        self.caracteristicas_confirmadas = set()
+        self.caracteristicas_negadas = set()
+        self.current_question = None
+        self.last_guess = None # Para saber qué se adivinó incorrectamente
+        self.nodo = 0 # Posición en el árbol de decisión (None si la partida salió de él)
+        self._animales_al_iniciar = len(self.matriz) # Si no cambia, candidatos es el estado del nodo
+        self._generacion_arbol = self.arbol.generacion
+        if self.bayes is not None:
+            self.bayes.reiniciar()
+            self.nodo = None
+
+    @property
+    def posibles_animales(self):
+        """Nombres de los animales que siguen siendo posibles."""
+        return self.matriz.nombres(self.candidatos)
+
+    def is_knowledge_base_empty(self):
+        """Verifica si hay animales en la base de datos."""
+        return not bool(self.animales_caracteristicas)
+
+    def get_next_question(self):
+        """
+        Determina y devuelve la siguiente mejor pregunta o un estado final.
+
+        Returns:
+            tuple: (estado, data) donde estado puede ser:
+                'QUESTION', 'GUESS', 'NO_OPTIONS', 'LEARN_NO_QUESTIONS'
+                y data es la pregunta (str), el animal/es a adivinar (str/set), o None.
+        """
+        if self.bayes is not None:
+            return self._siguiente_bayesiana()
+
+        restantes = self.candidatos.bit_count()
+        if restantes <= 1 and self.autoguardar_arbol:
+            self._guardar_arbol() # Fin de la partida: se guardan los nodos que se expandieron
+
+        if not restantes:
+            return ('NO_OPTIONS', None)
+
+        if restantes == 1:
+            self.last_guess = self.matriz.animales[self.candidatos.bit_length() - 1]
+            return ('GUESS', self.last_guess)
+
+        mejor_caracteristica = self._seleccionar_mejor_pregunta()
+
+        if mejor_caracteristica is None and self.autoguardar_arbol:
+            self._guardar_arbol()
+        if mejor_caracteristica is None:
+            # No hay más preguntas que distingan, pero hay varios animales
+            if restantes > 1:
+                posibles = self.posibles_animales
+                # Elegir uno al azar o el primero para intentar adivinar
+                self.last_guess = random.choice(sorted(posibles))
+                # Devolver todos los posibles por si falla y necesita aprender
+                return ('LEARN_NO_QUESTIONS', posibles)
+            else: # Esto no debería pasar si la lógica es correcta, pero por si acaso
+                return ('NO_OPTIONS', None)
+
+
+        self.current_question = mejor_caracteristica
+        return ('QUESTION', f"¿Tu animal {mejor_caracteristica}?")
+
+
+    def _siguiente_bayesiana(self):
+        """Como get_next_question, en el modo tolerante a errores: nunca se queda sin opciones."""
+        if self.is_knowledge_base_empty():
+            return ('NO_OPTIONS', None)
+
+        id_animal, probabilidad = self.bayes.mas_probable()
+        mejor = None
+        if probabilidad < self.bayes.umbral and self.bayes.preguntas < self.bayes.max_preguntas:
+            indice = self.matriz.indice_caracteristica
+            preguntadas = {indice[c] for c in self.caracteristicas_preguntadas if c in indice}
+            mejor = self.bayes.mejor_pregunta(preguntadas)
+
+        if mejor is None:
+            # Suficientemente seguro (o sin preguntas útiles): se adivina el más probable
+            self.last_guess = self.matriz.animales[id_animal]
+            return ('GUESS', self.last_guess)
+
+        self.current_question = self.matriz.caracteristicas[mejor]
+        return ('QUESTION', f"¿Tu animal {self.current_question}?")
+
+    def _seleccionar_mejor_pregunta(self):
+        """Lógica interna para seleccionar la mejor pregunta."""
+        indice = self.matriz.indice_caracteristica
+        confirmadas = {indice[c] for c in self.caracteristicas_confirmadas if c in indice}
+        negadas = {indice[c] for c in self.caracteristicas_negadas if c in indice}
+        if self.nodo is not None and self.arbol.generacion != self._generacion_arbol:
+            self.nodo = None # El árbol se reinició a mitad de la partida
+        if self.nodo is not None:
+            # Con la base sin cambios, el árbol no tiene que recalcular los
+            # candidatos del nodo desde la raíz (una columna por nivel)
+            estado = None
+            if len(self.matriz) == self._animales_al_iniciar:
+                estado = (self.candidatos, confirmadas, negadas)
+            mejor = self.arbol.pregunta_en(self.nodo, self.matriz, self.estrategia, estado)
+            if mejor is None:
+                return None
+            con = (self.matriz.columna(mejor) & self.candidatos).bit_count()
+            if 0 < con < self.candidatos.bit_count():
+                return self.matriz.caracteristicas[mejor]
+            # La base cambió a mitad de la partida; se sigue sin el árbol
+            self.nodo = None
+
+        mejor = self.estrategia.elegir(self.matriz, self.candidatos, confirmadas, negadas)
+        return None if mejor is None else self.matriz.caracteristicas[mejor]
+
+    def process_answer(self, respuesta_si):
+        """
+        Actualiza el estado basado en la respuesta ('si' o 'no') a self.current_question.
+
+        Args:
+            respuesta_si (bool): True si la respuesta fue 'si', False si fue 'no'.
+        """
+        if self.current_question is None:
+            return # No debería pasar si el flujo es correcto
+
+        question_feature = self.current_question # La característica actual
+        self.caracteristicas_preguntadas.add(question_feature)
+
+        if self.bayes is not None:
+            if respuesta_si:
+                self.caracteristicas_confirmadas.add(question_feature)
+            else:
+                self.caracteristicas_negadas.add(question_feature)
+            self.bayes.actualizar(self.matriz.indice_caracteristica[question_feature], respuesta_si)
+            self.current_question = None
+            return
+
+        mascara = self.matriz.mascara(question_feature)
+        if respuesta_si:
+            self.caracteristicas_confirmadas.add(question_feature)
+            self.candidatos &= mascara # Quedan solo los que la tienen
+        else: # Respuesta fue 'no'
+            self.caracteristicas_negadas.add(question_feature)
+            self.candidatos &= ~mascara # Quedan solo los que no la tienen
+
+        if self.nodo is not None and self.arbol.generacion == self._generacion_arbol:
+            self.nodo = self.arbol.hijo(self.nodo, respuesta_si)
+        else:
+            self.nodo = None
+        self.current_question = None # Resetear pregunta actual después de procesar
+
+    def aprender_nuevo_animal(self, nombre_animal_correcto, caracteristica_distintiva):
+        """
+        Añade un nuevo animal a la base de conocimientos. Usa el estado interno
+        (confirmadas, negadas) del juego actual.
+
+        Args:
+            nombre_animal_correcto (str): El nombre del animal a aprender.
+            caracteristica_distintiva (str): La característica clave proporcionada por el usuario.
+
+        Returns:
+            bool: True si el aprendizaje fue exitoso, False en caso contrario.
+        """
+        nombre_animal_correcto = nombre_animal_correcto.lower().strip()
+        caracteristica_distintiva = caracteristica_distintiva.lower().strip()
+        if caracteristica_distintiva:
+            # "nada muy bien" se guarda como la característica ya conocida "nada"
+            caracteristica_distintiva = self.matriz.canonica(caracteristica_distintiva)
+
+        if not nombre_animal_correcto or not caracteristica_distintiva:
+            self.avisar("advertencia", "Aprendizaje Fallido", "Debe proporcionar un nombre y una característica distintiva.")
+            return False
+
+        if nombre_animal_correcto in self.animales_caracteristicas:
+            # Lógica para manejar animales existentes (informar, no sobrescribir por simplicidad)
+            conocimiento_existente = self.animales_caracteristicas[nombre_animal_correcto]
+            conflictos_si = self.caracteristicas_confirmadas - conocimiento_existente
+            conflictos_no = self.caracteristicas_negadas.intersection(conocimiento_existente)
+            if conflictos_si or conflictos_no:
+                msg = f"Ya conozco al '{nombre_animal_correcto}', pero tus respuestas contradicen mi información:\n"
+                if conflictos_si: msg += f"- Confirmaste: {conflictos_si}\n"
+                if conflictos_no: msg += f"- Negaste características que tenía: {conflictos_no}\n"
+                msg += "No modificaré la entrada existente."
+                self.avisar("info", "Conflicto de Conocimiento", msg)
+            else:
+                self.avisar("info", "Animal Conocido", f"Ya conozco al '{nombre_animal_correcto}' y tus respuestas coinciden. ¡Quizás fallé en adivinar antes!")
+            return False # No se aprendió nada nuevo en este caso
+
+        # Crear nuevo animal
+        nuevas_caracteristicas = set(self.caracteristicas_confirmadas) # Copia
+        nuevas_caracteristicas.add(caracteristica_distintiva)
+        nuevas_caracteristicas -= self.caracteristicas_negadas # Asegurar consistencia
+
+        with self.almacen.bloqueo: # El hilo del almacén puede estar copiando la matriz
+            id_animal = self.matriz.agregar_animal(nombre_animal_correcto, nuevas_caracteristicas)
+        self.estrategia.invalidar()
+        self.arbol.agregar_animal(self.matriz, id_animal) # Solo la hoja afectada vuelve a calcularse
+        self._guardar_conocimiento(nombre_animal_correcto, nuevas_caracteristicas) # Guardar sin bloquear
+        if self.autoguardar_arbol:
+            self._guardar_arbol()
+        self.avisar("info", "¡Aprendizaje Exitoso!", f"¡He aprendido sobre el '{nombre_animal_correcto}'!")
+        return True
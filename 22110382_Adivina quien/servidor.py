@@ -0,0 +1,204 @@
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from estrategias import ESTRATEGIAS
+from motor import ARCHIVO_CONOCIMIENTO, ESTRATEGIA_POR_DEFECTO, SistemaInferenciaAnimales
+
+# Servidor HTTP asíncrono del adivinador, sin interfaz gráfica.
+# La base (matriz, árbol de decisión y almacén) se carga una sola vez; cada
+# sesión es una partida de SistemaInferenciaAnimales.nueva_sesion(), que solo
+# guarda su máscara de candidatos y las respuestas dadas. Las preguntas se
+# responden directamente en el bucle de eventos; el aprendizaje se encola y lo
+# aplica una sola tarea escritora, así dos jugadores nunca modifican la base a la vez.
+#
+# Endpoints (JSON):
+#   POST /partida    {}                                  -> {"sesion", "estado", "dato"}
+#   POST /respuesta  {"sesion", "si": true/false}        -> {"sesion", "estado", "dato"}
+#   POST /confirmar  {"sesion", "correcto": true/false}  -> {"sesion", "fin": true} o {"sesion", "aprender": true, ...}
+#   POST /aprender   {"sesion", "animal", "caracteristica"} -> {"sesion", "aprendido", "aviso"}
+#   GET  /salud      -> {"sesiones", "animales", "nodos_arbol"}
+# "estado" es el de get_next_question: QUESTION, GUESS, NO_OPTIONS o LEARN_NO_QUESTIONS.
+
+ESTADOS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           500: "Internal Server Error"}
+
+# Las sesiones sin actividad por más de este tiempo (segundos) se descartan
+TIEMPO_SESION = 1800
+INTERVALO_LIMPIEZA = 60
+
+
+class ServidorAdivinador:
+    def __init__(self, sistema):
+        self.sistema = sistema # Base compartida por todas las sesiones
+        self.sistema.autoguardar_arbol = False # Se guarda en mantenimiento(), no en cada partida
+        self.sesiones = {}      # sesion -> [partida, último acceso]
+        self.cola_escritura = asyncio.Queue()
+
+    async def escritor(self):
+        # Única tarea que modifica la base; cada petición espera su resultado
+        while True:
+            partida, animal, caracteristica, futuro = await self.cola_escritura.get()
+            try:
+                # El almacén escribe en su propio hilo: aprender no bloquea el bucle
+                aprendido = partida.aprender_nuevo_animal(animal, caracteristica)
+                if aprendido:
+                    partida.registrar_partida(animal)
+                futuro.set_result(aprendido)
+            except Exception as e:
+                futuro.set_exception(e)
+            finally:
+                self.cola_escritura.task_done()
+
+    async def mantenimiento(self):
+        # Descarta sesiones abandonadas y encola lo que se expandió del árbol
+        # (aquí solo se copia; la escritura ocurre en el hilo del almacén)
+        while True:
+            await asyncio.sleep(INTERVALO_LIMPIEZA)
+            limite = time.monotonic() - TIEMPO_SESION
+            for sesion in [s for s, (_, acceso) in self.sesiones.items() if acceso < limite]:
+                del self.sesiones[sesion]
+            self.sistema._guardar_arbol()
+
+    def _partida(self, datos):
+        entrada = self.sesiones.get(datos.get("sesion"))
+        if entrada is None:
+            return None
+        entrada[1] = time.monotonic()
+        return entrada[0]
+
+    @staticmethod
+    def _estado(sesion, partida):
+        estado, dato = partida.get_next_question()
+        if isinstance(dato, (set, frozenset)):
+            dato = sorted(dato)
+        return 200, {"sesion": sesion, "estado": estado, "dato": dato}
+
+    async def partida(self, datos):
+        if self.sistema.is_knowledge_base_empty():
+            return 400, {"error": "La base de conocimientos está vacía"}
+        sesion = uuid.uuid4().hex
+        partida = self.sistema.nueva_sesion()
+        self.sesiones[sesion] = [partida, time.monotonic()]
+        return self._estado(sesion, partida)
+
+    async def respuesta(self, datos):
+        partida = self._partida(datos)
+        if partida is None:
+            return 404, {"error": "Sesión desconocida"}
+        if partida.current_question is None or not isinstance(datos.get("si"), bool):
+            return 400, {"error": "Falta 'si' o no hay pregunta pendiente"}
+        partida.process_answer(datos["si"])
+        return self._estado(datos["sesion"], partida)
+
+    async def confirmar(self, datos):
+        partida = self._partida(datos)
+        if partida is None:
+            return 404, {"error": "Sesión desconocida"}
+        if partida.last_guess is None or not isinstance(datos.get("correcto"), bool):
+            return 400, {"error": "Falta 'correcto' o no se ha adivinado nada"}
+        if datos["correcto"]:
+            partida.registrar_partida(partida.last_guess)
+            del self.sesiones[datos["sesion"]]
+            return 200, {"sesion": datos["sesion"], "fin": True}
+        return 200, {"sesion": datos["sesion"], "aprender": True, "adivinanza": partida.last_guess}
+
+    async def aprender(self, datos):
+        partida = self._partida(datos)
+        if partida is None:
+            return 404, {"error": "Sesión desconocida"}
+        animal, caracteristica = datos.get("animal"), datos.get("caracteristica")
+        if not isinstance(animal, str) or not isinstance(caracteristica, str):
+            return 400, {"error": "Faltan 'animal' o 'caracteristica'"}
+        futuro = asyncio.get_running_loop().create_future()
+        await self.cola_escritura.put((partida, animal, caracteristica, futuro))
+        aprendido = await futuro
+        del self.sesiones[datos["sesion"]]
+        aviso = partida.ultimo_aviso[2] if partida.ultimo_aviso else None
+        return 200, {"sesion": datos["sesion"], "aprendido": aprendido, "aviso": aviso}
+
+    async def despachar(self, metodo, ruta, cuerpo):
+        if ruta == "/salud":
+            return 200, {"sesiones": len(self.sesiones), "animales": len(self.sistema.matriz),
+                         "nodos_arbol": len(self.sistema.arbol)}
+        rutas = {"/partida": self.partida, "/respuesta": self.respuesta,
+                 "/confirmar": self.confirmar, "/aprender": self.aprender}
+        if ruta not in rutas:
+            return 404, {"error": "Ruta desconocida"}
+        if metodo != "POST":
+            return 405, {"error": "Use POST"}
+        try:
+            datos = json.loads(cuerpo or b"{}")
+        except json.JSONDecodeError:
+            return 400, {"error": "JSON inválido"}
+        if not isinstance(datos, dict):
+            return 400, {"error": "Se esperaba un objeto JSON"}
+        return await rutas[ruta](datos)
+
+    async def atender(self, reader, writer):
+        # Una conexión puede enviar varias peticiones (keep-alive)
+        try:
+            while True:
+                linea = await reader.readline()
+                if not linea:
+                    break
+                metodo, ruta, _ = linea.decode("latin-1").split(" ", 2)
+                encabezados = {}
+                while True:
+                    encabezado = await reader.readline()
+                    if encabezado in (b"\r\n", b"\n", b""):
+                        break
+                    nombre, _, valor = encabezado.decode("latin-1").partition(":")
+                    encabezados[nombre.strip().lower()] = valor.strip()
+                longitud = int(encabezados.get("content-length", 0))
+                cuerpo = await reader.readexactly(longitud) if longitud else b""
+
+                try:
+                    estado, respuesta = await self.despachar(metodo, ruta, cuerpo)
+                except Exception as e:
+                    # Un error en una partida no debe cerrar la conexión sin respuesta
+                    print(f"Error al atender {metodo} {ruta}: {e!r}")
+                    estado, respuesta = 500, {"error": "Error interno del servidor"}
+                contenido = json.dumps(respuesta, ensure_ascii=False).encode("utf-8")
+                cerrar = encabezados.get("connection", "").lower() == "close"
+                writer.write(
+                    f"HTTP/1.1 {estado} {ESTADOS[estado]}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(contenido)}\r\n"
+                    f"Connection: {'close' if cerrar else 'keep-alive'}\r\n\r\n".encode("latin-1") + contenido)
+                await writer.drain()
+                if cerrar:
+                    break
+        except (ValueError, asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+
+async def main(host, puerto, sistema):
+    servidor_adivinador = ServidorAdivinador(sistema)
+    tareas = [asyncio.create_task(servidor_adivinador.escritor()),
+              asyncio.create_task(servidor_adivinador.mantenimiento())]
+    servidor = await asyncio.start_server(servidor_adivinador.atender, host, puerto)
+    print(f"Adivinador escuchando en http://{host}:{puerto}")
+    try:
+        async with servidor:
+            await servidor.serve_forever()
+    finally:
+        for tarea in tareas:
+            tarea.cancel()
+        sistema.cerrar()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servidor HTTP del adivinador de animales")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8081)
+    parser.add_argument("--base", default=ARCHIVO_CONOCIMIENTO)
+    parser.add_argument("--estrategia", choices=sorted(ESTRATEGIAS), default=ESTRATEGIA_POR_DEFECTO)
+    parser.add_argument("--ruido", type=float, default=None,
+                        help="Modo tolerante a errores con esta probabilidad de respuesta equivocada")
+    args = parser.parse_args()
+    sistema = SistemaInferenciaAnimales(args.base, estrategia=args.estrategia, ruido=args.ruido)
+    asyncio.run(main(args.host, args.puerto, sistema))
@@ -0,0 +1,262 @@
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import shutil
+import tempfile
+import time
+from array import array
+from estrategias import ESTRATEGIAS
+from inferencia_bayesiana import ERROR
+from motor import ARCHIVO_CONOCIMIENTO, SistemaInferenciaAnimales
+
+# Simulador de partidas del adivinador.
+# Juega cada animal de la base (o una muestra) con un oráculo que contesta según
+# las características registradas, opcionalmente con una probabilidad de
+# equivocarse en cada respuesta, a través de get_next_question/process_answer,
+# igual que la interfaz. Reporta preguntas por partida, percentiles de latencia
+# de get_next_question y tasa de fallos, para la base incluida y para bases
+# sintéticas de hasta 1M animales, y así comparar estrategias y detectar regresiones.
+#
+# Las partidas se reparten entre procesos. Con fork (Linux) los procesos
+# heredan el motor ya cargado; con spawn cada uno carga la base desde el archivo.
+# Todo se ejecuta sobre una copia en un directorio temporal: la simulación no
+# escribe árboles, fotos ni bitácoras junto a la base original.
+#
+# Uso:
+#   python simulacion.py --estrategias minmax entropia --ruido-oraculo 0 0.05 --bayes
+#   python simulacion.py --animales 1e4 1e5 1e6 --partidas 2000 --json resultados.json
+
+MAX_PASOS = 200 # Una partida nunca debería necesitar tantas preguntas
+
+_SISTEMA = None # Motor del proceso actual (heredado con fork o cargado en _iniciar)
+
+
+def percentil(valores_ordenados, p):
+    # Percentil por el método del rango más cercano sobre una lista ya ordenada
+    if not valores_ordenados:
+        return 0.0
+    k = max(0, min(len(valores_ordenados) - 1, round(p / 100 * len(valores_ordenados)) - 1))
+    return valores_ordenados[k]
+
+
+def generar_base(n, rng, raras_por_animal=4):
+    """
+    Base sintética con n animales.
+
+    Como en la base real, hay unas pocas características frecuentes (~log2(n),
+    cada una en la mitad de los animales: "es mamífero", "vuela") y muchas raras
+    con popularidad log-uniforme que distinguen a los parecidos.
+
+    Args:
+        n (int): Número de animales.
+        rng (random.Random): Generador de números aleatorios.
+        raras_por_animal (int): Características raras por animal (aproximado).
+
+    Returns:
+        dict: animal -> lista de características.
+    """
+    comunes = [f"rasgo comun {i}" for i in range(max(6, n.bit_length()))]
+    total = max(64, n // 2)
+    raras = [f"rasgo {i}" for i in range(total)] # Compartidos: no se crea un texto por enlace
+    base = {}
+    for i in range(n):
+        caracteristicas = [c for c in comunes if rng.random() < 0.5]
+        caracteristicas += {raras[int(total ** rng.random()) - 1] for _ in range(raras_por_animal)}
+        base[f"animal {i}"] = caracteristicas
+    return base
+
+
+def _sin_avisos(tipo, titulo, mensaje):
+    pass
+
+
+def _crear_sistema(archivo, estrategia, bayes):
+    sistema = SistemaInferenciaAnimales(archivo, estrategia=estrategia, ruido=ERROR if bayes else None,
+                                        avisar=_sin_avisos)
+    sistema.autoguardar_arbol = False
+    sistema.almacen.esperar() # Que el hilo del almacén no quede a medias al hacer fork
+    return sistema
+
+
+def _iniciar(archivo, estrategia, bayes):
+    global _SISTEMA
+    if _SISTEMA is None: # Con spawn el proceso no hereda el motor del padre
+        _SISTEMA = _crear_sistema(archivo, estrategia, bayes)
+
+
+def jugar(sistema, id_animal, ruido_oraculo, semilla):
+    """
+    Juega una partida pensando en el animal con ese id.
+
+    Args:
+        sistema (SistemaInferenciaAnimales): Motor (se usa una sesión nueva).
+        id_animal (int): Animal en el que piensa el oráculo.
+        ruido_oraculo (float): Probabilidad de que el oráculo conteste al revés.
+        semilla (int): Semilla del oráculo; la partida no depende del proceso que la juegue.
+
+    Returns:
+        tuple: (resultado, preguntas, latencias en segundos de get_next_question), con
+        resultado 'acierto', 'fallo', 'sin_opciones', 'sin_preguntas' o 'limite'.
+    """
+    matriz = sistema.matriz
+    animal = matriz.animales[id_animal]
+    verdad = set(matriz.caracteristicas_de[id_animal])
+    rng = random.Random(semilla * 1000003 + id_animal)
+    sesion = sistema.nueva_sesion()
+    latencias, preguntas = [], 0
+    for _ in range(MAX_PASOS):
+        inicio = time.perf_counter()
+        estado, dato = sesion.get_next_question()
+        latencias.append(time.perf_counter() - inicio)
+        if estado != 'QUESTION':
+            break
+        respuesta = matriz.indice_caracteristica[sesion.current_question] in verdad
+        if ruido_oraculo and rng.random() < ruido_oraculo:
+            respuesta = not respuesta
+        sesion.process_answer(respuesta)
+        preguntas += 1
+    else:
+        return 'limite', preguntas, latencias
+
+    if estado == 'NO_OPTIONS':
+        return 'sin_opciones', preguntas, latencias
+    if estado == 'LEARN_NO_QUESTIONS':
+        # Quedaron varios animales sin pregunta que los distinga; el motor adivina uno al azar
+        return ('acierto' if sesion.last_guess == animal else 'sin_preguntas'), preguntas, latencias
+    return ('acierto' if dato == animal else 'fallo'), preguntas, latencias
+
+
+def _jugar_lote(tarea):
+    ids, ruido_oraculo, semilla = tarea
+    resultados, preguntas, latencias = [], array("H"), array("f")
+    for id_animal in ids:
+        resultado, n, tiempos = jugar(_SISTEMA, id_animal, ruido_oraculo, semilla)
+        resultados.append(resultado)
+        preguntas.append(n)
+        latencias.extend(tiempos)
+    return resultados, preguntas, latencias
+
+
+def simular(archivo, estrategia, bayes, ruido_oraculo, ids, procesos, semilla):
+    """
+    Juega los animales indicados repartidos entre procesos.
+
+    Returns:
+        dict: Preguntas por partida, latencias de get_next_question (ms) y tasas de fallo.
+    """
+    global _SISTEMA
+    inicio = time.perf_counter()
+    _SISTEMA = _crear_sistema(archivo, estrategia, bayes)
+    carga = time.perf_counter() - inicio
+
+    tamano_lote = max(1, min(500, len(ids) // (procesos * 4) or 1))
+    tareas = [(ids[i:i + tamano_lote], ruido_oraculo, semilla) for i in range(0, len(ids), tamano_lote)]
+    conteo = {'acierto': 0, 'fallo': 0, 'sin_opciones': 0, 'sin_preguntas': 0, 'limite': 0}
+    preguntas, latencias = array("H"), array("f")
+    inicio = time.perf_counter()
+    pool = None
+    if procesos > 1:
+        metodo = "fork" if "fork" in multiprocessing.get_all_start_methods() else None
+        pool = multiprocessing.get_context(metodo).Pool(procesos, _iniciar, (archivo, estrategia, bayes))
+    try:
+        lotes = pool.imap_unordered(_jugar_lote, tareas) if pool else map(_jugar_lote, tareas)
+        for resultados, n, tiempos in lotes:
+            for resultado in resultados:
+                conteo[resultado] += 1
+            preguntas.extend(n)
+            latencias.extend(tiempos)
+    finally:
+        if pool:
+            pool.terminate()
+    duracion = time.perf_counter() - inicio
+    _SISTEMA = None
+
+    partidas = len(preguntas)
+    preguntas = sorted(preguntas)
+    latencias = sorted(latencias)
+    return {
+        "estrategia": estrategia,
+        "modo": "bayes" if bayes else "estricto",
+        "ruido_oraculo": ruido_oraculo,
+        "partidas": partidas,
+        "preguntas_promedio": sum(preguntas) / partidas if partidas else 0.0,
+        "preguntas_p95": percentil(preguntas, 95),
+        "preguntas_max": preguntas[-1] if preguntas else 0,
+        "p50_ms": 1000 * percentil(latencias, 50),
+        "p95_ms": 1000 * percentil(latencias, 95),
+        "p99_ms": 1000 * percentil(latencias, 99),
+        "max_ms": 1000 * latencias[-1] if latencias else 0.0,
+        "tasa_fallos": 1 - conteo['acierto'] / partidas if partidas else 0.0,
+        **{k: v for k, v in conteo.items() if k != 'acierto'},
+        "carga_s": carga,
+        "partidas_por_s": partidas / duracion if duracion else 0.0,
+    }
+
+
+def imprimir_encabezado():
+    print(f"{'base':>26} {'estrategia':>12} {'modo':>8} {'ruido':>5} {'partidas':>8} {'preg':>6} "
+          f"{'p95':>4} {'max':>4} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'fallos':>7} {'carga s':>7}")
+
+
+def imprimir_fila(f):
+    print(f"{f['base']:>26} {f['estrategia']:>12} {f['modo']:>8} {f['ruido_oraculo']:>5.2f} {f['partidas']:>8} "
+          f"{f['preguntas_promedio']:>6.2f} {f['preguntas_p95']:>4} {f['preguntas_max']:>4} "
+          f"{f['p50_ms']:>8.3f} {f['p95_ms']:>8.3f} {f['p99_ms']:>8.3f} {100 * f['tasa_fallos']:>6.2f}% "
+          f"{f['carga_s']:>7.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulación de partidas del adivinador de animales")
+    parser.add_argument("--base", default=ARCHIVO_CONOCIMIENTO, help="Base a simular (se copia a un directorio temporal)")
+    parser.add_argument("--animales", nargs="+", type=lambda x: int(float(x)), default=[],
+                        help="Simular bases sintéticas de estos tamaños en lugar de --base")
+    parser.add_argument("--estrategias", nargs="+", choices=sorted(ESTRATEGIAS), default=["minmax", "entropia"])
+    parser.add_argument("--ruido-oraculo", nargs="+", type=float, default=[0.0],
+                        help="Probabilidades de que el oráculo conteste al revés")
+    parser.add_argument("--bayes", action="store_true", help="Simular también el modo tolerante a errores")
+    parser.add_argument("--partidas", type=lambda x: int(float(x)), default=None,
+                        help="Jugar solo una muestra de animales (por defecto, todos)")
+    parser.add_argument("--procesos", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--json", help="Archivo donde guardar los resultados")
+    args = parser.parse_args()
+
+    rng = random.Random(args.semilla)
+    filas = []
+    with tempfile.TemporaryDirectory() as directorio:
+        bases = []
+        if args.animales:
+            for n in args.animales:
+                archivo = os.path.join(directorio, f"sintetica_{n}.json")
+                with open(archivo, 'w', encoding='utf-8') as f:
+                    json.dump(generar_base(n, rng), f, ensure_ascii=False)
+                bases.append((f"sintética {n}", archivo, n))
+        else:
+            archivo = os.path.join(directorio, os.path.basename(args.base))
+            shutil.copyfile(args.base, archivo)
+            with open(archivo, 'r', encoding='utf-8') as f:
+                bases.append((os.path.basename(args.base), archivo, len(json.load(f))))
+
+        imprimir_encabezado()
+        for nombre, archivo, n in bases:
+            ids = list(range(n))
+            if args.partidas is not None and args.partidas < n:
+                ids = sorted(rng.sample(ids, args.partidas))
+            for estrategia in args.estrategias:
+                for bayes in ([False, True] if args.bayes else [False]):
+                    for ruido_oraculo in args.ruido_oraculo:
+                        fila = simular(archivo, estrategia, bayes, ruido_oraculo, ids, args.procesos, args.semilla)
+                        fila["base"] = nombre
+                        fila["animales"] = n
+                        filas.append(fila)
+                        imprimir_fila(fila)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(filas, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
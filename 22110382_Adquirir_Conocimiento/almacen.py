@@ -0,0 +1,110 @@
+import json
+import os
+import threading
+
+# Persistencia del conocimiento del chatbot con bitácora (journal) de solo anexado.
+# - Cada intención aprendida se agrega como una línea JSON al final de
+#   <archivo>.journal.jsonl y se hace fsync: costo O(1) por mensaje.
+# - La foto completa (snapshot) sigue siendo el chatbot_data.json de siempre.
+#   Se reescribe solo al compactar, en un hilo aparte, escribiendo a un archivo
+#   temporal y reemplazando con os.replace (atómico): un fallo a mitad de la
+#   escritura nunca deja el JSON corrupto.
+# - Al compactar, la bitácora actual se renombra a .compactando y se abre una
+#   nueva. Si el proceso muere a medias, al cargar se reaplican ambas.
+
+UMBRAL_COMPACTAR = 1000
+
+
+class AlmacenConocimiento:
+    def __init__(self, archivo, umbral_compactar=UMBRAL_COMPACTAR):
+        self.archivo = archivo
+        self.journal = archivo + ".journal.jsonl"
+        self.journal_compactando = archivo + ".journal.compactando.jsonl"
+        self.umbral_compactar = umbral_compactar
+        self.knowledge_base = None
+        self._lock = threading.Lock()
+        self._pendientes = 0
+        self._hilo_compactacion = None
+
+    def existe(self):
+        return any(os.path.exists(f) for f in (self.archivo, self.journal, self.journal_compactando))
+
+    def cargar(self, por_defecto=None):
+        # Foto + bitácoras pendientes. Devuelve el diccionario {"intents": [...]}
+        if os.path.exists(self.archivo):
+            with open(self.archivo, "r", encoding="utf-8") as file:
+                knowledge_base = json.load(file)
+        else:
+            knowledge_base = por_defecto if por_defecto is not None else {"intents": []}
+
+        etiquetas = {intent["tag"] for intent in knowledge_base["intents"]}
+        for journal in (self.journal_compactando, self.journal):
+            for intent in self._leer_journal(journal):
+                # Una bitácora ya incluida en la foto puede reaplicarse tras un fallo
+                if intent["tag"] not in etiquetas:
+                    etiquetas.add(intent["tag"])
+                    knowledge_base["intents"].append(intent)
+                    self._pendientes += 1
+
+        self.knowledge_base = knowledge_base
+        return knowledge_base
+
+    @staticmethod
+    def _leer_journal(journal):
+        if not os.path.exists(journal):
+            return
+        with open(journal, "r", encoding="utf-8") as file:
+            for linea in file:
+                try:
+                    yield json.loads(linea)
+                except json.JSONDecodeError:
+                    # Última línea truncada por una caída: se descarta
+                    break
+
+    def registrar(self, intent):
+        # Agrega una intención aprendida a la bitácora (la base en memoria la
+        # actualiza quien llama)
+        linea = json.dumps(intent, ensure_ascii=False) + "\n"
+        with self._lock:
+            with open(self.journal, "a", encoding="utf-8") as file:
+                file.write(linea)
+                file.flush()
+                os.fsync(file.fileno())
+            self._pendientes += 1
+            if self._pendientes >= self.umbral_compactar:
+                self.compactar_en_segundo_plano()
+
+    def compactar_en_segundo_plano(self):
+        if self._hilo_compactacion is not None and self._hilo_compactacion.is_alive():
+            return
+        self._hilo_compactacion = threading.Thread(target=self.compactar, daemon=True)
+        self._hilo_compactacion.start()
+
+    def compactar(self):
+        # Escribe la foto completa de forma atómica y descarta la bitácora aplicada
+        with self._lock:
+            if os.path.exists(self.journal):
+                if os.path.exists(self.journal_compactando):
+                    # Restos de una compactación interrumpida: se anexan primero
+                    with open(self.journal_compactando, "a", encoding="utf-8") as destino, \
+                            open(self.journal, "r", encoding="utf-8") as origen:
+                        destino.write(origen.read())
+                    os.remove(self.journal)
+                else:
+                    os.replace(self.journal, self.journal_compactando)
+            intents = list(self.knowledge_base["intents"])
+            self._pendientes = 0
+
+        temporal = self.archivo + ".tmp"
+        with open(temporal, "w", encoding="utf-8") as file:
+            json.dump({"intents": intents}, file, indent=4)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporal, self.archivo)
+        if os.path.exists(self.journal_compactando):
+            os.remove(self.journal_compactando)
+
+    def esperar(self):
+        # Espera a que termine una compactación en curso (p. ej. al salir)
+        if self._hilo_compactacion is not None:
+            self._hilo_compactacion.join()
@@ -0,0 +1,159 @@
+import argparse
+import difflib
+import json
+import random
+import time
+import tracemalloc
+from cache_respuestas import CacheLRU, normalizar
+from indice_intenciones import IndiceIntenciones
+from metricas import resumir
+
+# Benchmark de búsqueda del chatbot con bases sintéticas.
+# Genera bases de 1k a 1M intenciones, reproduce un registro de consultas
+# (un archivo con una consulta por línea, o uno sintético con preguntas
+# exactas, con errores de tipeo y desconocidas) y reporta percentiles de
+# latencia, memoria del índice y tasas de coincidencia y de aciertos de caché
+# para:
+#   lineal        difflib.get_close_matches sobre todas las etiquetas (original)
+#   indice        IndiceIntenciones (trigramas + SequenceMatcher)
+#   indice+cache  lo mismo detrás de la caché LRU
+#
+# Uso:
+#   python benchmark.py --intenciones 1e3 1e4 1e5 --consultas 2000 --json resultados.json
+
+PALABRAS = ("que como cual donde cuando quien por para eres tienes puedes sabes hacer "
+            "dia hora clima comida musica color nombre capital pais ciudad numero juego "
+            "libro pelicula deporte animal planta agua fuego tierra aire casa escuela "
+            "trabajo amigo familia mañana noche tarde favorito mejor peor grande pequeño").split()
+
+
+def generar_base(n, rng):
+    etiquetas = set()
+    while len(etiquetas) < n:
+        palabras = rng.sample(PALABRAS, rng.randint(2, 5))
+        etiquetas.add(" ".join(palabras) + f" {rng.randrange(n)}" + rng.choice(["?", ""]))
+    return [{"tag": etiqueta, "responses": [f"respuesta a {etiqueta}"]} for etiqueta in etiquetas]
+
+
+def con_errores(texto, rng):
+    # Cambia una letra, como un error de tipeo
+    letras = list(texto)
+    if len(letras) > 3:
+        letras[rng.randrange(len(letras))] = rng.choice("abcdefghijklmnopqrstuvwxyz")
+    return "".join(letras)
+
+
+def con_variantes(texto, rng):
+    # Mayúsculas y signos distintos; tras normalizar todas comparten clave de caché
+    return rng.choice([texto, texto.upper(), "¿" + texto.capitalize(), texto + "!!"])
+
+
+def generar_consultas(intents, cantidad, rng, populares=50):
+    # Tráfico sesgado: la mitad de las consultas son unas pocas preguntas populares
+    etiquetas = [intent["tag"] for intent in intents]
+    frecuentes = [con_errores(etiqueta, rng) for etiqueta in rng.sample(etiquetas, min(populares, len(etiquetas)))]
+    consultas = []
+    for _ in range(cantidad):
+        r = rng.random()
+        if r < 0.5:
+            consultas.append(con_variantes(rng.choice(frecuentes), rng))
+        elif r < 0.8:
+            consultas.append(rng.choice(etiquetas))
+        elif r < 0.95:
+            consultas.append(con_variantes(con_errores(rng.choice(etiquetas), rng), rng))
+        else:
+            consultas.append("xq " + " ".join(rng.sample(PALABRAS, 2)) + " zz")
+    return consultas
+
+
+def reproducir(nombre, consultas, buscar):
+    latencias, encontradas = [], 0
+    for consulta in consultas:
+        inicio = time.perf_counter()
+        etiqueta = buscar(consulta)
+        latencias.append(time.perf_counter() - inicio)
+        encontradas += etiqueta is not None
+    resultado = resumir(latencias)
+    resultado.update(metodo=nombre, consultas=len(consultas), tasa_coincidencia=encontradas / len(consultas))
+    return resultado
+
+
+def correr(n, consultas_log, cantidad, max_lineal, rng, consultas_lineal=100):
+    intents = generar_base(n, rng)
+    consultas = consultas_log or generar_consultas(intents, cantidad, rng)
+    etiquetas = [intent["tag"] for intent in intents]
+    filas = []
+
+    if n <= max_lineal:
+        # La búsqueda lineal tarda decenas de ms por consulta; basta con una muestra
+        filas.append(reproducir("lineal", consultas[:consultas_lineal], lambda texto: next(
+            iter(difflib.get_close_matches(texto.lower(), etiquetas, n=1, cutoff=0.5)), None)))
+
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    indice = IndiceIntenciones(intents)
+    construccion = time.perf_counter() - inicio
+    memoria = tracemalloc.get_traced_memory()[0] / 2 ** 20
+    tracemalloc.stop()
+    filas.append(reproducir("indice", consultas, lambda texto: indice.buscar(normalizar(texto), cutoff=0.5)))
+
+    cache = CacheLRU()
+    sin_cache = object()
+
+    def con_cache(texto):
+        # Misma secuencia que chatbot.buscar_respuesta
+        clave = normalizar(texto)
+        etiqueta = cache.obtener(clave, sin_cache)
+        if etiqueta is sin_cache:
+            etiqueta = indice.buscar(clave, cutoff=0.5)
+            if etiqueta is not None:
+                cache.guardar(clave, etiqueta)
+        return etiqueta
+
+    filas.append(reproducir("indice+cache", consultas, con_cache))
+    filas[-1]["tasa_aciertos_cache"] = cache.tasa_aciertos()
+
+    for fila in filas:
+        fila.update(intenciones=n)
+        if fila["metodo"] != "lineal":
+            fila.update(construccion_s=construccion, memoria_indice_mb=memoria)
+    return filas
+
+
+def imprimir_tabla(filas):
+    print(f"{'intenciones':>11} {'metodo':>13} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'coincid.':>8} {'cache':>6} {'indice MB':>9} {'constr. s':>9}")
+    for f in filas:
+        print(f"{f['intenciones']:>11} {f['metodo']:>13} {f['p50_ms']:>8.3f} {f['p95_ms']:>8.3f} "
+              f"{f['p99_ms']:>8.3f} {f['tasa_coincidencia']:>8.2f} {f.get('tasa_aciertos_cache', 0):>6.2f} "
+              f"{f.get('memoria_indice_mb', 0):>9.1f} {f.get('construccion_s', 0):>9.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de búsqueda de intenciones del chatbot")
+    parser.add_argument("--intenciones", nargs="+", type=lambda x: int(float(x)), default=[1000, 10000, 100000])
+    parser.add_argument("--consultas", type=int, default=2000)
+    parser.add_argument("--log", help="Archivo con una consulta por línea para reproducir")
+    parser.add_argument("--max-lineal", type=lambda x: int(float(x)), default=10000,
+                        help="Tamaño máximo de base para medir la búsqueda lineal original")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--json", help="Archivo donde guardar los resultados")
+    args = parser.parse_args()
+
+    consultas_log = None
+    if args.log:
+        with open(args.log, encoding="utf-8") as file:
+            consultas_log = [linea.rstrip("\n") for linea in file if linea.strip()]
+
+    rng = random.Random(args.semilla)
+    filas = []
+    for n in args.intenciones:
+        filas += correr(n, consultas_log, args.consultas, args.max_lineal, rng)
+    imprimir_tabla(filas)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(filas, file, indent=4)
+
+
+if __name__ == "__main__":
+    main()
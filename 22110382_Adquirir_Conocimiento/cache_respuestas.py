@@ -0,0 +1,68 @@
+import re
+import unicodedata
+from collections import OrderedDict
+
+# Caché de coincidencias para el chatbot.
+# La mayoría de los mensajes reales son unos pocos saludos repetidos.
+# CacheLRU guarda la etiqueta que le corresponde a cada entrada normalizada
+# (sin acentos ni signos: el mismo texto que recibe el buscador), de modo que
+# "¡Hola!", "hola!!" y "hóla" comparten una entrada y solo la primera paga la
+# búsqueda completa. El índice y el importador usan la misma normalizar().
+
+_NO_ALFANUMERICO = re.compile(r"[^0-9a-z]+")
+TAMANO_CACHE = 4096
+
+
+def normalizar(texto):
+    # Minúsculas, sin acentos ni signos de puntuación y con espacios colapsados
+    texto = unicodedata.normalize("NFKD", texto.lower())
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    return _NO_ALFANUMERICO.sub(" ", texto).strip()
+
+
+class CacheLRU:
+    def __init__(self, capacidad=TAMANO_CACHE):
+        self.capacidad = capacidad
+        self.datos = OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+        self.invalidaciones = 0
+
+    def __len__(self):
+        return len(self.datos)
+
+    def __contains__(self, clave):
+        return clave in self.datos
+
+    def obtener(self, clave, por_defecto=None):
+        if clave in self.datos:
+            self.datos.move_to_end(clave)
+            self.aciertos += 1
+            return self.datos[clave]
+        self.fallos += 1
+        return por_defecto
+
+    def guardar(self, clave, valor):
+        self.datos[clave] = valor
+        self.datos.move_to_end(clave)
+        if len(self.datos) > self.capacidad:
+            self.datos.popitem(last=False)
+
+    def invalidar(self):
+        # Una etiqueta nueva puede ser mejor coincidencia para cualquier entrada
+        self.datos.clear()
+        self.invalidaciones += 1
+
+    def tasa_aciertos(self):
+        consultas = self.aciertos + self.fallos
+        return self.aciertos / consultas if consultas else 0.0
+
+    def estadisticas(self):
+        return {
+            "tamano": len(self.datos),
+            "capacidad": self.capacidad,
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "tasa_aciertos": self.tasa_aciertos(),
+            "invalidaciones": self.invalidaciones,
+        }
@@ -1,46 +1,119 @@
-import json
-import os
 import random
-import difflib
+import sys
+import time
+from almacen import AlmacenConocimiento
+from cache_respuestas import CacheLRU, normalizar
+from indice_intenciones import IndiceIntenciones
 
-# Cargar la base de datos desde un archivo JSON si existe, o crear una nueva
+# Cargar la base de datos desde el archivo JSON y su bitácora si existen, o crear una nueva
 DB_FILE = "chatbot_data.json"
 
-if os.path.exists(DB_FILE):
-    with open(DB_FILE, "r") as file:
-        knowledge_base = json.load(file)
-else:
-    knowledge_base = {
-        "intents": [
-            {
-                "tag": "hola",
-                "responses": ["¡Hola!", "Buenos días!", "¿Cómo estás?"]
-            },
-            {
-                "tag": "nombre",
-                "responses": ["Soy un chatbot en desarrollo."]
-            }
-        ]
-    }
+almacen = AlmacenConocimiento(DB_FILE)
+knowledge_base = almacen.cargar(por_defecto={
+    "intents": [
+        {
+            "tag": "hola",
+            "responses": ["¡Hola!", "Buenos días!", "¿Cómo estás?"]
+        },
+        {
+            "tag": "nombre",
+            "responses": ["Soy un chatbot en desarrollo."]
+        }
+    ]
+})
 
+# Índice construido una sola vez: etiqueta -> respuestas y trigramas -> etiquetas
+indice = IndiceIntenciones(knowledge_base["intents"])
 
-def get_response(user_input):
-    tags = [intent["tag"] for intent in knowledge_base["intents"]]
-    closest_match = difflib.get_close_matches(user_input.lower(), tags, n=1, cutoff=0.5)
+# Entrada normalizada (el mismo texto que recibe el buscador) -> etiqueta
+# encontrada; las entradas sin coincidencia no se guardan. Se vacía al aprender
+cache = CacheLRU()
+_SIN_CACHE = object()
+
+# Medición opcional de latencias por fase (ver metricas.py)
+metricas = None
+
+
+def activar_metricas():
+    global metricas
+    from metricas import MetricasLatencia
+    metricas = MetricasLatencia()
+    return metricas
+
+# Búsqueda semántica opcional (python chatbot.py --semantico)
+semantico = None
+
+
+def activar_semantico():
+    global semantico
+    from semantico import MatcherSemantico
+    semantico = MatcherSemantico(indice.etiquetas)
+
+
+def buscar_respuesta(user_input):
+    # Solo la parte de búsqueda: devuelve una respuesta o None si no se conoce
+    inicio = time.perf_counter() if metricas is not None else None
+    # Se normaliza una sola vez: la caché y el buscador ven exactamente el mismo texto
+    clave = normalizar(user_input)
+    closest_match = cache.obtener(clave, _SIN_CACHE)
+    if closest_match is _SIN_CACHE:
+        if semantico is not None:
+            closest_match = semantico.buscar(clave)
+        else:
+            closest_match = indice.buscar(clave, cutoff=0.5)
+        if closest_match is not None:
+            # Un fallo no se guarda: lo que se enseñe después debe encontrarse
+            cache.guardar(clave, closest_match)
+    if metricas is not None:
+        metricas.registrar("busqueda", time.perf_counter() - inicio)
+        metricas.contar(closest_match is not None)
 
     if closest_match:
-        for intent in knowledge_base["intents"]:
-            if intent["tag"] == closest_match[0]:
-                return random.choice(intent["responses"])
+        return random.choice(indice.respuestas[closest_match])
+    return None
 
-    new_response = input("No sé la respuesta. ¿Qué debería responder? ")
-    knowledge_base["intents"].append({
+
+def agregar_intencion(user_input, new_response):
+    # Actualiza la base en memoria (lista, índice, caché y matcher semántico);
+    # devuelve la intención nueva, o None si la etiqueta ya existía
+    intent = {
         "tag": user_input.lower(),
         "responses": [new_response]
-    })
+    }
+    # Se vacía aunque la etiqueta ya exista, por si había una coincidencia vieja guardada
+    cache.invalidar()
+    if intent["tag"] in indice:
+        return None
+    knowledge_base["intents"].append(intent)
+    indice.agregar(intent["tag"], intent["responses"])
+    if semantico is not None:
+        semantico.agregar(intent["tag"])
+    return intent
+
+
+def aprender(user_input, new_response):
+    # Solo la parte de aprendizaje; devuelve False si la etiqueta ya existía
+    intent = agregar_intencion(user_input, new_response)
+    if intent is None:
+        return False
 
-    with open(DB_FILE, "w") as file:
-        json.dump(knowledge_base, file, indent=4)
+    # Solo se anexa una línea a la bitácora; la foto se compacta en segundo plano
+    if metricas is not None:
+        with metricas.medir("persistencia"):
+            almacen.registrar(intent)
+    else:
+        almacen.registrar(intent)
+    return True
+
+
+def get_response(user_input):
+    response = buscar_respuesta(user_input)
+    if response is not None:
+        return response
+
+    new_response = input("No sé la respuesta. ¿Qué debería responder? ")
+    if not aprender(user_input, new_response):
+        return "Ya tenía esa pregunta registrada; no cambié su respuesta."
 
     return "Gracias por enseñarme. Ahora lo recordaré."
 
@@ -51,10 +124,19 @@ def run_chatbot():
         user_input = input("Tú: ")
         if user_input.lower() == "salir":
             print("Proceso finalizado")
+            almacen.esperar()
+            if semantico is not None:
+                semantico.guardar()
+            if metricas is not None:
+                print("Latencias:", metricas.resumen())
             break
         response = get_response(user_input)
         print("Chatbot:", response)
 
 
 if __name__ == "__main__":
+    if "--semantico" in sys.argv:
+        activar_semantico()
+    if "--metricas" in sys.argv:
+        activar_metricas()
     run_chatbot()
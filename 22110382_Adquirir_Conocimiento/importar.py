@@ -0,0 +1,199 @@
+import argparse
+import csv
+import difflib
+import json
+import os
+import re
+import time
+from almacen import AlmacenConocimiento
+from cache_respuestas import normalizar
+
+# Importación masiva y limpieza de la base del chatbot.
+# Lee archivos CSV (pregunta,respuesta) o JSONL sin cargarlos completos en
+# memoria, repara texto con doble codificación (p. ej. "cÃ³digo" -> "código"),
+# agrupa preguntas casi iguales, une sus respuestas y escribe una base compacta
+# (foto atómica, sin bitácora). Los duplicados se buscan en dos etapas:
+#   - al leer, solo coincidencias exactas en O(1): el texto normalizado como en
+#     la caché ("Que eres?" / "que eres") o sus palabras ordenadas ("eres tu" / "tu eres");
+#   - al final, una sola pasada difusa por vecindad ordenada: las claves se
+#     ordenan al derecho y al revés (un error de tipeo al inicio no las separa en
+#     el segundo orden) y cada una se compara solo con las VENTANA_DIFUSA siguientes.
+# Así el costo es O(n log n) y no una búsqueda difusa por fila contra un índice
+# que crece; --sin-difuso omite la segunda etapa.
+#
+# Uso:
+#   python importar.py faq.csv otro.jsonl --base chatbot_data.json --salida chatbot_data.json
+
+UMBRAL_SIMILITUD = 0.9
+VENTANA_DIFUSA = 4
+_NUMEROS = re.compile(r"\d+")
+
+
+def reparar_codificacion(texto):
+    # UTF-8 leído como latin-1/cp1252: se deshace la conversión si es posible
+    if not any(c in texto for c in "ÃÂâ"):
+        return texto
+    for codificacion in ("cp1252", "latin-1"):
+        try:
+            return texto.encode(codificacion).decode("utf-8")
+        except (UnicodeEncodeError, UnicodeDecodeError):
+            continue
+    return texto
+
+
+def leer_csv(archivo):
+    with open(archivo, newline="", encoding="utf-8-sig", errors="replace") as file:
+        for i, fila in enumerate(csv.reader(file)):
+            if len(fila) < 2:
+                continue
+            if i == 0 and fila[0].strip().lower() in ("pregunta", "tag", "question"):
+                continue  # Encabezado
+            yield fila[0], [fila[1]]
+
+
+def leer_jsonl(archivo):
+    with open(archivo, encoding="utf-8", errors="replace") as file:
+        for linea in file:
+            if not linea.strip():
+                continue
+            datos = json.loads(linea)
+            pregunta = datos.get("tag") or datos.get("pregunta") or datos.get("question")
+            respuestas = datos.get("responses") or datos.get("respuesta") or datos.get("answer")
+            if isinstance(respuestas, str):
+                respuestas = [respuestas]
+            if pregunta and respuestas:
+                yield pregunta, respuestas
+
+
+def leer(archivo):
+    if archivo.endswith((".jsonl", ".ndjson")):
+        return leer_jsonl(archivo)
+    return leer_csv(archivo)
+
+
+def _unir_respuestas(intent, respuestas):
+    for respuesta in respuestas:
+        if respuesta not in intent["responses"]:
+            intent["responses"].append(respuesta)
+
+
+class Deduplicador:
+    def __init__(self, umbral=UMBRAL_SIMILITUD, difuso=True, ventana=VENTANA_DIFUSA):
+        self.umbral = umbral
+        self.difuso = difuso
+        self.ventana = ventana
+        self.intents = []
+        self.claves = []               # Texto normalizado de cada intent, por posición
+        self.por_clave = {}            # texto normalizado o palabras ordenadas -> posición
+        self.agregadas = 0
+        self.fusionadas = 0
+
+    def agregar(self, pregunta, respuestas):
+        etiqueta = reparar_codificacion(pregunta).strip().lower()
+        respuestas = [reparar_codificacion(r).strip() for r in respuestas if r and r.strip()]
+        clave = normalizar(etiqueta)
+        if not clave or not respuestas:
+            return
+
+        palabras = " ".join(sorted(clave.split()))
+        posicion = self.por_clave.get(clave)
+        if posicion is None:
+            posicion = self.por_clave.get(palabras)
+        if posicion is None:
+            posicion = len(self.intents)
+            self.intents.append({"tag": etiqueta, "responses": []})
+            self.claves.append(clave)
+            self.por_clave[clave] = posicion
+            self.por_clave.setdefault(palabras, posicion)
+            self.agregadas += 1
+        else:
+            self.fusionadas += 1
+        _unir_respuestas(self.intents[posicion], respuestas)
+
+    def _parecidas(self, comparador, a, b):
+        comparador.set_seq1(a)
+        if (comparador.real_quick_ratio() < self.umbral or comparador.quick_ratio() < self.umbral
+                or comparador.ratio() < self.umbral):
+            return False
+        # "pregunta 12" y "pregunta 13" se parecen mucho pero no son la misma
+        return _NUMEROS.findall(a) == _NUMEROS.findall(b)
+
+    def fusionar_parecidas(self):
+        """
+        Une las preguntas casi iguales con una pasada por vecindad ordenada.
+
+        Cada grupo se une en la primera pregunta leída del grupo, que conserva
+        su posición; las respuestas de las demás se anexan en orden de lectura.
+
+        Returns:
+            int: Intenciones fusionadas en esta pasada.
+        """
+        n = len(self.intents)
+        padre = list(range(n))
+
+        def raiz(i):
+            while padre[i] != i:
+                padre[i] = padre[padre[i]]
+                i = padre[i]
+            return i
+
+        comparador = difflib.SequenceMatcher()
+        for orden_clave in (self.claves.__getitem__, lambda i: self.claves[i][::-1]):
+            orden = sorted(range(n), key=orden_clave)
+            for k, i in enumerate(orden):
+                comparador.set_seq2(self.claves[i])
+                for j in orden[k + 1:k + 1 + self.ventana]:
+                    if self._parecidas(comparador, self.claves[j], self.claves[i]):
+                        a, b = raiz(i), raiz(j)
+                        if a != b:
+                            padre[max(a, b)] = min(a, b)
+
+        fusionadas = 0
+        for i in range(n):
+            r = raiz(i)
+            if r != i:
+                _unir_respuestas(self.intents[r], self.intents[i]["responses"])
+                fusionadas += 1
+        if fusionadas:
+            self.intents = [intent for i, intent in enumerate(self.intents) if raiz(i) == i]
+            self.claves = [clave for i, clave in enumerate(self.claves) if raiz(i) == i]
+            self.por_clave = {}  # Ya no se usa: las posiciones cambiaron
+        self.agregadas -= fusionadas
+        self.fusionadas += fusionadas
+        return fusionadas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Importa y deduplica preguntas y respuestas del chatbot")
+    parser.add_argument("archivos", nargs="*", help="Archivos CSV (pregunta,respuesta) o JSONL")
+    parser.add_argument("--base", help="Base existente a limpiar e incluir (se lee también su bitácora)")
+    parser.add_argument("--salida", default="chatbot_data.json")
+    parser.add_argument("--umbral", type=float, default=UMBRAL_SIMILITUD,
+                        help="Similitud mínima para considerar dos preguntas duplicadas")
+    parser.add_argument("--sin-difuso", action="store_true",
+                        help="Solo unir preguntas idénticas tras normalizar o con las mismas palabras")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    deduplicador = Deduplicador(args.umbral, difuso=not args.sin_difuso)
+    if args.base and os.path.exists(args.base):
+        for intent in AlmacenConocimiento(args.base).cargar()["intents"]:
+            deduplicador.agregar(intent["tag"], intent["responses"])
+    for archivo in args.archivos:
+        for n, (pregunta, respuestas) in enumerate(leer(archivo), 1):
+            deduplicador.agregar(pregunta, respuestas)
+            if n % 100000 == 0:
+                print(f"{archivo}: {n} filas, {len(deduplicador.intents)} intenciones")
+    if deduplicador.difuso:
+        deduplicador.fusionar_parecidas()
+
+    # compactar() escribe la foto de forma atómica y descarta la bitácora de la salida
+    almacen = AlmacenConocimiento(args.salida)
+    almacen.knowledge_base = {"intents": deduplicador.intents}
+    almacen.compactar()
+    print(f"{len(deduplicador.intents)} intenciones ({deduplicador.fusionadas} duplicados fusionados) "
+          f"guardadas en {args.salida} en {time.perf_counter() - inicio:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import difflib
+from collections import Counter
+from cache_respuestas import normalizar
+
+# Índice de intenciones para el chatbot.
+# En lugar de comparar el mensaje con todas las etiquetas usando difflib en
+# cada respuesta, se construye una sola vez:
+#   - un diccionario etiqueta -> respuestas (búsqueda exacta en O(1))
+#   - un índice invertido de trigramas de caracteres -> etiquetas
+# Los trigramas reducen la búsqueda difusa a unos pocos candidatos, que luego
+# se califican con la misma medida de difflib que usaba get_close_matches.
+# Las etiquetas se indexan normalizadas (ver cache_respuestas.normalizar) y
+# buscar() recibe el texto ya normalizado: "¡Hola!", "hola!!" y "hóla" son la
+# misma consulta, para el índice y para la caché.
+
+MAX_CANDIDATOS = 50
+# Entradas de postings que se cuentan por consulta, sin importar el tamaño de la base
+PRESUPUESTO_POSTINGS = 4000
+
+
+def trigramas(texto):
+    # Se rellena con espacios para que las palabras cortas también tengan trigramas
+    texto = f"  {texto.lower()} "
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+class IndiceIntenciones:
+    def __init__(self, intents=()):
+        self.etiquetas = []
+        self.claves = []      # Etiqueta normalizada, por id
+        self.por_clave = {}   # Etiqueta normalizada -> etiqueta original
+        self.respuestas = {}
+        self.postings = {}
+        for intent in intents:
+            self.agregar(intent["tag"], intent["responses"])
+
+    def __len__(self):
+        return len(self.etiquetas)
+
+    def __contains__(self, etiqueta):
+        return normalizar(etiqueta) in self.por_clave
+
+    def agregar(self, etiqueta, respuestas):
+        # Con etiquetas repetidas (tras normalizar) gana la primera, igual que el recorrido original
+        clave = normalizar(etiqueta)
+        if clave in self.por_clave:
+            return
+        self.respuestas[etiqueta] = respuestas
+        id_etiqueta = len(self.etiquetas)
+        self.etiquetas.append(etiqueta)
+        self.claves.append(clave)
+        self.por_clave[clave] = etiqueta
+        for trigrama in trigramas(clave):
+            self.postings.setdefault(trigrama, []).append(id_etiqueta)
+
+    def _candidatos(self, texto, max_candidatos):
+        # Ids de las etiquetas que comparten más trigramas con texto.
+        # Se cuentan primero los trigramas más raros (los que más distinguen) y
+        # solo hasta PRESUPUESTO_POSTINGS entradas: los muy comunes (p. ej. " qu")
+        # aportan poco y su costo crecería con la base. Si hasta el más raro
+        # excede el presupuesto, se usan sus entradas más recientes.
+        listas = sorted((self.postings[t] for t in trigramas(texto) if t in self.postings), key=len)
+        conteo = Counter()
+        restante = PRESUPUESTO_POSTINGS
+        for lista in listas:
+            if len(lista) > restante:
+                if conteo:
+                    break
+                lista = lista[-restante:]
+            conteo.update(lista)
+            restante -= len(lista)
+        return [i for i, _ in conteo.most_common(max_candidatos)]
+
+    def candidatos(self, texto, max_candidatos=MAX_CANDIDATOS):
+        return [self.etiquetas[i] for i in self._candidatos(texto, max_candidatos)]
+
+    def buscar(self, texto, cutoff=0.5, max_candidatos=MAX_CANDIDATOS):
+        # Devuelve la etiqueta más parecida a texto (o None), como
+        # difflib.get_close_matches(texto, claves, n=1, cutoff=cutoff).
+        # texto debe venir normalizado; se compara contra las etiquetas normalizadas
+        if texto in self.por_clave:
+            return self.por_clave[texto]
+        comparador = difflib.SequenceMatcher()
+        comparador.set_seq2(texto)
+        mejor, mejor_puntaje = None, cutoff
+        for i in self._candidatos(texto, max_candidatos):
+            comparador.set_seq1(self.claves[i])
+            if (comparador.real_quick_ratio() >= mejor_puntaje and
+                    comparador.quick_ratio() >= mejor_puntaje):
+                puntaje = comparador.ratio()
+                if puntaje > mejor_puntaje or (puntaje == mejor_puntaje and mejor is None):
+                    mejor, mejor_puntaje = self.etiquetas[i], puntaje
+        return mejor
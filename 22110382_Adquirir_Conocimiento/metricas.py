@@ -0,0 +1,62 @@
+import time
+from contextlib import contextmanager
+
+# Registro de latencias por fase para el chatbot.
+# chatbot.activar_metricas() instala un MetricasLatencia que mide cada llamada
+# a la búsqueda ("busqueda") y a la persistencia ("persistencia"), además de
+# contar coincidencias y fallos. Sin activarlo no se agrega ningún costo.
+
+
+def percentil(valores_ordenados, p):
+    # Percentil por el método del rango más cercano sobre una lista ya ordenada
+    if not valores_ordenados:
+        return 0.0
+    k = max(0, min(len(valores_ordenados) - 1, round(p / 100 * len(valores_ordenados)) - 1))
+    return valores_ordenados[k]
+
+
+def resumir(segundos):
+    # p50/p95/p99/máximo en milisegundos de una lista de duraciones en segundos
+    ordenados = sorted(segundos)
+    return {
+        "llamadas": len(ordenados),
+        "p50_ms": 1000 * percentil(ordenados, 50),
+        "p95_ms": 1000 * percentil(ordenados, 95),
+        "p99_ms": 1000 * percentil(ordenados, 99),
+        "max_ms": 1000 * ordenados[-1] if ordenados else 0.0,
+    }
+
+
+class MetricasLatencia:
+    def __init__(self, max_muestras=100000):
+        self.max_muestras = max_muestras
+        self.muestras = {}
+        self.coincidencias = 0
+        self.sin_coincidencia = 0
+
+    def registrar(self, fase, segundos):
+        muestras = self.muestras.setdefault(fase, [])
+        if len(muestras) >= self.max_muestras:
+            # Se conservan las más recientes
+            del muestras[:len(muestras) // 2]
+        muestras.append(segundos)
+
+    @contextmanager
+    def medir(self, fase):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar(fase, time.perf_counter() - inicio)
+
+    def contar(self, encontrado):
+        if encontrado:
+            self.coincidencias += 1
+        else:
+            self.sin_coincidencia += 1
+
+    def resumen(self):
+        total = self.coincidencias + self.sin_coincidencia
+        datos = {fase: resumir(muestras) for fase, muestras in self.muestras.items()}
+        datos["tasa_coincidencia"] = self.coincidencias / total if total else 0.0
+        return datos
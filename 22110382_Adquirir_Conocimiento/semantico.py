@@ -0,0 +1,108 @@
+import hashlib
+import os
+import numpy as np
+
+# Búsqueda semántica de intenciones con embeddings de oraciones.
+# Cada etiqueta se codifica una sola vez con el mismo modelo que usa el
+# Orientador Vocacional (all-MiniLM-L6-v2). Los vectores se guardan en un .npy
+# junto con otro .npy de hashes de las etiquetas, de modo que al arrancar solo
+# se codifican las etiquetas nuevas o modificadas. Cada mensaje se responde con
+# un producto matriz-vector (similitud coseno) y una selección top-k.
+
+MODELO = 'all-MiniLM-L6-v2'
+ARCHIVO_EMBEDDINGS = "chatbot_embeddings.npy"
+UMBRAL = 0.6
+
+
+def hash_etiqueta(etiqueta):
+    return int.from_bytes(hashlib.sha1(etiqueta.encode("utf-8")).digest()[:8], "little")
+
+
+class MatcherSemantico:
+    def __init__(self, etiquetas, archivo=ARCHIVO_EMBEDDINGS, modelo=None):
+        self.archivo = archivo
+        self.archivo_hashes = os.path.splitext(archivo)[0] + ".hashes.npy"
+        self._modelo = modelo
+        self.etiquetas = []
+        self.posicion = {}
+        self.vectores = None
+        self.n = 0
+        self._cargar(list(dict.fromkeys(etiquetas)))
+
+    @property
+    def modelo(self):
+        # sentence_transformers es pesado: solo se importa si hace falta codificar
+        if self._modelo is None:
+            from sentence_transformers import SentenceTransformer
+            self._modelo = SentenceTransformer(MODELO)
+        return self._modelo
+
+    def _codificar(self, textos):
+        vectores = self.modelo.encode(textos, convert_to_numpy=True, normalize_embeddings=True)
+        return np.asarray(vectores, dtype=np.float32).reshape(len(textos), -1)
+
+    def _cargar(self, etiquetas):
+        en_cache = {}
+        if os.path.exists(self.archivo) and os.path.exists(self.archivo_hashes):
+            vectores = np.load(self.archivo)
+            for fila, h in enumerate(np.load(self.archivo_hashes).tolist()):
+                en_cache[h] = vectores[fila]
+
+        hashes = [hash_etiqueta(etiqueta) for etiqueta in etiquetas]
+        faltantes = [etiqueta for etiqueta, h in zip(etiquetas, hashes) if h not in en_cache]
+        if faltantes:
+            for etiqueta, vector in zip(faltantes, self._codificar(faltantes)):
+                en_cache[hash_etiqueta(etiqueta)] = vector
+
+        if etiquetas:
+            self.vectores = np.stack([en_cache[h] for h in hashes])
+        self.etiquetas = etiquetas
+        self.posicion = {etiqueta: i for i, etiqueta in enumerate(etiquetas)}
+        self.n = len(etiquetas)
+        if faltantes:
+            self.guardar()
+
+    def agregar(self, etiqueta):
+        # Codifica solo la etiqueta nueva; la matriz crece duplicando su capacidad
+        if etiqueta in self.posicion:
+            return
+        vector = self._codificar([etiqueta])[0]
+        if self.vectores is None:
+            self.vectores = np.empty((16, len(vector)), dtype=np.float32)
+        elif self.n == len(self.vectores):
+            self.vectores = np.concatenate([self.vectores, np.empty_like(self.vectores)])
+        self.vectores[self.n] = vector
+        self.posicion[etiqueta] = self.n
+        self.etiquetas.append(etiqueta)
+        self.n += 1
+
+    def guardar(self):
+        # Escritura atómica de vectores y hashes (archivo temporal + os.replace)
+        if self.vectores is None:
+            return
+        for destino, datos in ((self.archivo, self.vectores[:self.n]),
+                               (self.archivo_hashes, np.array([hash_etiqueta(e) for e in self.etiquetas],
+                                                              dtype=np.uint64))):
+            temporal = destino + ".tmp.npy"
+            np.save(temporal, datos)
+            os.replace(temporal, destino)
+
+    def top_k(self, texto, k=5):
+        # Lista [(etiqueta, similitud)] de las k etiquetas más parecidas
+        if self.n == 0:
+            return []
+        consulta = self._codificar([texto])[0]
+        similitudes = self.vectores[:self.n] @ consulta
+        k = min(k, self.n)
+        mejores = np.argpartition(-similitudes, k - 1)[:k]
+        mejores = mejores[np.argsort(-similitudes[mejores])]
+        return [(self.etiquetas[i], float(similitudes[i])) for i in mejores]
+
+    def buscar(self, texto, umbral=UMBRAL):
+        # Etiqueta más parecida a texto si supera el umbral, o None
+        if texto in self.posicion:
+            return texto
+        mejores = self.top_k(texto, k=1)
+        if mejores and mejores[0][1] >= umbral:
+            return mejores[0][0]
+        return None
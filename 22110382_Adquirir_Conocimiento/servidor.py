@@ -0,0 +1,192 @@
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+import chatbot
+
+# Servidor HTTP asíncrono para atender muchas sesiones del chatbot a la vez.
+# Todas las sesiones comparten la base de conocimiento en memoria de chatbot.py.
+# La búsqueda se responde directamente en el bucle de eventos (el índice la
+# hace barata); el aprendizaje se encola y lo aplica una sola tarea escritora,
+# de modo que las escrituras a la bitácora nunca se intercalan. La base en
+# memoria solo se modifica en el bucle; a un hilo va únicamente el fsync.
+# Con --semantico, en cambio, cada búsqueda y cada aprendizaje llaman a encode()
+# del modelo, que bloquearía todas las conexiones: esas llamadas van a un único
+# hilo (así lecturas y escrituras de la base siguen sin intercalarse) y al
+# cerrar se guardan los embeddings calculados durante la sesión.
+#
+# Endpoints (JSON):
+#   POST /mensaje   {"sesion": "...", "texto": "..."}
+#        -> {"sesion": "...", "respuesta": "..."} o {"sesion": "...", "respuesta": null, "aprender": true}
+#   POST /aprender  {"sesion": "...", "respuesta": "..."}   (usa la última pregunta sin respuesta)
+#        -> {"sesion": "...", "aprendido": true/false}
+#   GET  /salud     -> {"sesiones": n, "intenciones": n, "cache": {...}, "latencias": {...}}
+
+ESTADOS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           500: "Internal Server Error"}
+
+# Las preguntas pendientes de sesiones sin actividad por más de este tiempo (segundos) se descartan
+TIEMPO_SESION = 1800
+INTERVALO_LIMPIEZA = 60
+
+
+class ServidorChatbot:
+    def __init__(self):
+        self.sesiones = {}  # sesion -> (última pregunta que no supo responder, último acceso)
+        self.cola_escritura = asyncio.Queue()
+        # Hilo único para las llamadas que codifican con el modelo semántico
+        self.hilo_modelo = ThreadPoolExecutor(max_workers=1) if chatbot.semantico is not None else None
+
+    async def en_base(self, funcion, *args):
+        # Sin modelo la búsqueda es barata y se hace en el bucle; con modelo va al hilo
+        if self.hilo_modelo is None:
+            return funcion(*args)
+        return await asyncio.get_running_loop().run_in_executor(self.hilo_modelo, funcion, *args)
+
+    async def escritor(self):
+        # Única tarea que modifica la base; cada petición espera su resultado
+        loop = asyncio.get_running_loop()
+        while True:
+            texto, respuesta, futuro = await self.cola_escritura.get()
+            try:
+                # En el bucle (o en el hilo del modelo): las búsquedas nunca ven el
+                # índice ni la caché a medio cambiar
+                intent = await self.en_base(chatbot.agregar_intencion, texto, respuesta)
+                if intent is not None:
+                    # registrar() hace fsync: solo eso se ejecuta fuera del bucle de eventos
+                    inicio = time.perf_counter()
+                    await loop.run_in_executor(None, chatbot.almacen.registrar, intent)
+                    if chatbot.metricas is not None:
+                        chatbot.metricas.registrar("persistencia", time.perf_counter() - inicio)
+                futuro.set_result(intent is not None)
+            except Exception as e:
+                futuro.set_exception(e)
+            finally:
+                self.cola_escritura.task_done()
+
+    async def mantenimiento(self):
+        # Descarta las preguntas pendientes de sesiones abandonadas
+        while True:
+            await asyncio.sleep(INTERVALO_LIMPIEZA)
+            limite = time.monotonic() - TIEMPO_SESION
+            for sesion in [s for s, (_, acceso) in self.sesiones.items() if acceso < limite]:
+                del self.sesiones[sesion]
+
+    async def mensaje(self, datos):
+        sesion = datos.get("sesion") or uuid.uuid4().hex
+        texto = datos.get("texto")
+        if not isinstance(texto, str) or not texto.strip():
+            return 400, {"error": "Falta 'texto'"}
+        respuesta = await self.en_base(chatbot.buscar_respuesta, texto)
+        if respuesta is None:
+            self.sesiones[sesion] = (texto, time.monotonic())
+            return 200, {"sesion": sesion, "respuesta": None, "aprender": True}
+        self.sesiones.pop(sesion, None)
+        return 200, {"sesion": sesion, "respuesta": respuesta}
+
+    async def aprender(self, datos):
+        sesion = datos.get("sesion")
+        texto = datos.get("texto") or self.sesiones.get(sesion, (None, 0))[0]
+        respuesta = datos.get("respuesta")
+        if not texto or not isinstance(respuesta, str) or not respuesta.strip():
+            return 400, {"error": "Faltan 'respuesta' o una pregunta pendiente en la sesión"}
+        futuro = asyncio.get_running_loop().create_future()
+        await self.cola_escritura.put((texto, respuesta, futuro))
+        aprendido = await futuro
+        self.sesiones.pop(sesion, None)
+        return 200, {"sesion": sesion, "aprendido": aprendido}
+
+    async def despachar(self, metodo, ruta, cuerpo):
+        if ruta == "/salud":
+            salud = {"sesiones": len(self.sesiones), "intenciones": len(chatbot.indice),
+                     "cache": chatbot.cache.estadisticas()}
+            if chatbot.metricas is not None:
+                salud["latencias"] = chatbot.metricas.resumen()
+            return 200, salud
+        rutas = {"/mensaje": self.mensaje, "/aprender": self.aprender}
+        if ruta not in rutas:
+            return 404, {"error": "Ruta desconocida"}
+        if metodo != "POST":
+            return 405, {"error": "Use POST"}
+        try:
+            datos = json.loads(cuerpo or b"{}")
+        except json.JSONDecodeError:
+            return 400, {"error": "JSON inválido"}
+        if not isinstance(datos, dict):
+            return 400, {"error": "Se esperaba un objeto JSON"}
+        return await rutas[ruta](datos)
+
+    async def atender(self, reader, writer):
+        # Una conexión puede enviar varias peticiones (keep-alive)
+        try:
+            while True:
+                linea = await reader.readline()
+                if not linea:
+                    break
+                metodo, ruta, _ = linea.decode("latin-1").split(" ", 2)
+                encabezados = {}
+                while True:
+                    encabezado = await reader.readline()
+                    if encabezado in (b"\r\n", b"\n", b""):
+                        break
+                    nombre, _, valor = encabezado.decode("latin-1").partition(":")
+                    encabezados[nombre.strip().lower()] = valor.strip()
+                longitud = int(encabezados.get("content-length", 0))
+                cuerpo = await reader.readexactly(longitud) if longitud else b""
+
+                try:
+                    estado, respuesta = await self.despachar(metodo, ruta, cuerpo)
+                except Exception as e:
+                    # Un error al buscar o aprender no debe cerrar la conexión sin respuesta
+                    print(f"Error al atender {metodo} {ruta}: {e!r}")
+                    estado, respuesta = 500, {"error": "Error interno del servidor"}
+                contenido = json.dumps(respuesta, ensure_ascii=False).encode("utf-8")
+                cerrar = encabezados.get("connection", "").lower() == "close"
+                writer.write(
+                    f"HTTP/1.1 {estado} {ESTADOS[estado]}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(contenido)}\r\n"
+                    f"Connection: {'close' if cerrar else 'keep-alive'}\r\n\r\n".encode("latin-1") + contenido)
+                await writer.drain()
+                if cerrar:
+                    break
+        except (ValueError, asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+
+async def main(host, puerto):
+    servidor_chatbot = ServidorChatbot()
+    tareas = [asyncio.create_task(servidor_chatbot.escritor()),
+              asyncio.create_task(servidor_chatbot.mantenimiento())]
+    servidor = await asyncio.start_server(servidor_chatbot.atender, host, puerto)
+    print(f"Chatbot escuchando en http://{host}:{puerto}")
+    try:
+        async with servidor:
+            await servidor.serve_forever()
+    finally:
+        for tarea in tareas:
+            tarea.cancel()
+        if servidor_chatbot.hilo_modelo is not None:
+            servidor_chatbot.hilo_modelo.shutdown(wait=True)
+        if chatbot.semantico is not None:
+            # Los embeddings de lo aprendido en la sesión no se vuelven a calcular al arrancar
+            chatbot.semantico.guardar()
+        chatbot.almacen.esperar()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servidor HTTP del chatbot")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8080)
+    parser.add_argument("--semantico", action="store_true")
+    parser.add_argument("--metricas", action="store_true", help="Medir latencias (se ven en /salud)")
+    args = parser.parse_args()
+    if args.semantico:
+        chatbot.activar_semantico()
+    if args.metricas:
+        chatbot.activar_metricas()
+    asyncio.run(main(args.host, args.puerto))
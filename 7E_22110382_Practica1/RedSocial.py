@@ -1,6 +1,7 @@
-from collections import deque
 import networkx as nx
 import matplotlib.pyplot as plt
+import grafos
+from grafos import GrafoCSR, dibujo
 '''
 Algoritmo BFS (Conexión en una red social)
 Este código emplea el algoritmo de Búsqueda en Anchura (BFS) para determinar 
@@ -9,27 +10,22 @@ representa a una persona y las conexiones indican relaciones de amistad.
 La salida del programa muestra el camino más eficiente para conectar a dos 
 individuos dentro de la red y lo visualiza gráficamente.
 '''
-def bfs(graph, start, goal):
-    queue = deque([[start]])  # Cola de rutas posibles
-    visited = set()
-    
-    while queue:
-        path = queue.popleft()
-        node = path[-1]
-        
-        if node == goal:
-            return path
-        
-        if node not in visited:
-            visited.add(node)
-            for neighbor in graph[node]:
-                new_path = list(path)
-                new_path.append(neighbor)
-                queue.append(new_path)
-    
-    return None
+def bfs(graph, start, goal, bidireccional=False):
+    # Acepta el diccionario original o un GrafoCSR ya construido
+    # (el diccionario se convierte una sola vez y el GrafoCSR se reutiliza)
+    graph = grafos.como_csr(graph)
+    # Ambos modos marcan los nodos al encolarlos y guardan solo predecesores
+    if bidireccional:
+        return grafos.bfs_bidireccional(graph, start, goal)
+    return grafos.bfs(graph, start, goal)
+
+def draw_graph(graph, path, coordenadas=None, archivo=None):
+    # Grafos grandes (GrafoCSR): aristas en lote, posiciones en caché y salida sin ventana
+    if isinstance(graph, GrafoCSR) or coordenadas is not None or archivo:
+        dibujo.dibujar_ruta(grafos.como_csr(graph), path, coordenadas=coordenadas, archivo=archivo,
+                            titulo="Red social - Ruta más corta de conexión entre dos personas", etiquetas_pesos=False)
+        return
 
-def draw_graph(graph, path):
     G = nx.Graph()
     for node, neighbors in graph.items():
         for neighbor in neighbors:
@@ -47,18 +43,19 @@ def draw_graph(graph, path):
     plt.title("Red social - Ruta más corta de conexión entre dos personas")
     plt.show()
 
-# Grafo representando conexiones en una red social
-social_network = {
-    'Ana': ['Carlos', 'Beatriz'],
-    'Carlos': ['Ana', 'David', 'Elena'],
-    'Beatriz': ['Ana', 'David'],
-    'David': ['Carlos', 'Beatriz', 'Elena', 'Fernando'],
-    'Elena': ['Carlos', 'David', 'Fernando'],
-    'Fernando': ['David', 'Elena']
-}
+if __name__ == "__main__":
+    # Grafo representando conexiones en una red social
+    social_network = {
+        'Ana': ['Carlos', 'Beatriz'],
+        'Carlos': ['Ana', 'David', 'Elena'],
+        'Beatriz': ['Ana', 'David'],
+        'David': ['Carlos', 'Beatriz', 'Elena', 'Fernando'],
+        'Elena': ['Carlos', 'David', 'Fernando'],
+        'Fernando': ['David', 'Elena']
+    }
 
-start, goal = 'Ana', 'Fernando'
-path = bfs(social_network, start, goal)
-print(f"La conexión más corta entre {start} y {goal} es: {path}")
+    start, goal = 'Ana', 'Fernando'
+    path = bfs(social_network, start, goal)
+    print(f"La conexión más corta entre {start} y {goal} es: {path}")
 
-draw_graph(social_network, path)
+    draw_graph(social_network, path)
@@ -1,6 +1,7 @@
-import heapq
 import networkx as nx
 import matplotlib.pyplot as plt
+import grafos
+from grafos import GrafoCSR, dibujo
 '''
 Algoritmo de Dijkstra (Búsqueda de ruta más corta en calles de una ciudad)
 Este programa utiliza el algoritmo de Dijkstra para encontrar la ruta más 
@@ -10,32 +11,18 @@ que indican la distancia o el tiempo de viaje. La ruta óptima se muestra en una
 gráfica resaltada en rojo.
 '''
 def dijkstra(graph, start, goal):
-    queue = []
-    heapq.heappush(queue, (0, start))  # (cost, node)
-    distances = {node: float('inf') for node in graph}
-    distances[start] = 0
-    predecessors = {node: None for node in graph}
-    
-    while queue:
-        current_distance, current_node = heapq.heappop(queue)
-        
-        if current_node == goal:
-            path = []
-            while current_node:
-                path.append(current_node)
-                current_node = predecessors[current_node]
-            return path[::-1], distances[goal]
-        
-        for neighbor, weight in graph[current_node].items():
-            distance = current_distance + weight
-            if distance < distances[neighbor]:
-                distances[neighbor] = distance
-                predecessors[neighbor] = current_node
-                heapq.heappush(queue, (distance, neighbor))
-    
-    return None, float('inf')
+    # Acepta el diccionario original o un GrafoCSR ya construido
+    # (el diccionario se convierte una sola vez y el GrafoCSR se reutiliza)
+    graph = grafos.como_csr(graph)
+    return grafos.dijkstra(graph, start, goal)
+
+def draw_graph(graph, path, coordenadas=None, archivo=None):
+    # Grafos grandes (GrafoCSR): aristas en lote, posiciones en caché y salida sin ventana
+    if isinstance(graph, GrafoCSR) or coordenadas is not None or archivo:
+        dibujo.dibujar_ruta(grafos.como_csr(graph), path, coordenadas=coordenadas, archivo=archivo,
+                            titulo="Mapa de la ciudad con la ruta más corta resaltada")
+        return
 
-def draw_graph(graph, path):
     G = nx.Graph()
     for node, neighbors in graph.items():
         for neighbor, weight in neighbors.items():
@@ -55,18 +42,19 @@ def draw_graph(graph, path):
     plt.title("Mapa de la ciudad con la ruta más corta resaltada")
     plt.show()
 
-# Grafo representando calles de una ciudad
-graph = {
-    'Casa': {'Supermercado': 4, 'Escuela': 2},
-    'Supermercado': {'Casa': 4, 'Parque': 5},
-    'Escuela': {'Casa': 2, 'Parque': 8, 'Trabajo': 10},
-    'Parque': {'Supermercado': 5, 'Escuela': 8, 'Trabajo': 2, 'Hospital': 6},
-    'Trabajo': {'Escuela': 10, 'Parque': 2, 'Hospital': 3},
-    'Hospital': {'Parque': 6, 'Trabajo': 3}
-}
+if __name__ == "__main__":
+    # Grafo representando calles de una ciudad
+    graph = {
+        'Casa': {'Supermercado': 4, 'Escuela': 2},
+        'Supermercado': {'Casa': 4, 'Parque': 5},
+        'Escuela': {'Casa': 2, 'Parque': 8, 'Trabajo': 10},
+        'Parque': {'Supermercado': 5, 'Escuela': 8, 'Trabajo': 2, 'Hospital': 6},
+        'Trabajo': {'Escuela': 10, 'Parque': 2, 'Hospital': 3},
+        'Hospital': {'Parque': 6, 'Trabajo': 3}
+    }
 
-start, goal = 'Casa', 'Hospital'
-path, cost = dijkstra(graph, start, goal)
-print(f"La ruta más corta desde {start} hasta {goal} es: {path} con un tiempo estimado de {cost} minutos.")
+    start, goal = 'Casa', 'Hospital'
+    path, cost = dijkstra(graph, start, goal)
+    print(f"La ruta más corta desde {start} hasta {goal} es: {path} con un tiempo estimado de {cost} minutos.")
 
-draw_graph(graph, path)
+    draw_graph(graph, path)
@@ -0,0 +1,238 @@
+import argparse
+import heapq
+import json
+import random
+import time
+import tracemalloc
+from collections import deque
+import grafos
+from grafos import EstadisticasBusqueda, HeuristicaALT, construir_jerarquia, generadores, heuristicas
+'''
+Benchmark de los algoritmos de Practica1 sobre grafos sintéticos
+Genera grafos (rejilla, geométrico aleatorio, Barabási–Albert y tipo
+carretera) de distintos tamaños y mide, para un mismo conjunto de consultas
+aleatorias, el tiempo total, la memoria pico, los nodos expandidos y las
+operaciones de heap/cola de cada implementación:
+    - *_dict: las versiones originales sobre diccionario de diccionarios
+      (como referencia, solo hasta --max-referencia aristas); a_star_dict usa
+      una tabla {nodo: estimación} por destino con la misma heurística que la
+      fila a_star contigua (euclidiana si hay coordenadas, si no ALT);
+    - dijkstra, a_star (ALT y euclidiana), bfs y bfs_bidireccional sobre GrafoCSR;
+    - ch: consultas con jerarquía de contracción (con --ch).
+Uso:
+    python benchmark.py --generadores rejilla carretera --aristas 1e3 1e4 1e5 --json resultados.json
+'''
+
+
+# --- Implementaciones originales (diccionario de diccionarios) ---
+
+def dijkstra_dict(graph, start, goal, stats):
+    queue = [(0, start)]
+    distances = {node: float('inf') for node in graph}
+    distances[start] = 0
+    predecessors = {node: None for node in graph}
+    stats.inserciones += 1
+    while queue:
+        current_distance, current_node = heapq.heappop(queue)
+        if current_node == goal:
+            path = []
+            while current_node is not None:
+                path.append(current_node)
+                current_node = predecessors[current_node]
+            return path[::-1], distances[goal]
+        stats.expandidos += 1
+        for neighbor, weight in graph[current_node].items():
+            distance = current_distance + weight
+            if distance < distances[neighbor]:
+                distances[neighbor] = distance
+                predecessors[neighbor] = current_node
+                heapq.heappush(queue, (distance, neighbor))
+                stats.inserciones += 1
+    return None, float('inf')
+
+
+def a_star_dict(graph, start, goal, heuristic, stats):
+    queue = [(0, start)]
+    g_costs = {node: float('inf') for node in graph}
+    g_costs[start] = 0
+    predecessors = {node: None for node in graph}
+    stats.inserciones += 1
+    while queue:
+        current_cost, current_node = heapq.heappop(queue)
+        if current_node == goal:
+            path = []
+            while current_node is not None:  # El original usaba "while current_node" (falla con el id 0)
+                path.append(current_node)
+                current_node = predecessors[current_node]
+            return path[::-1]
+        stats.expandidos += 1
+        for neighbor, weight in graph[current_node].items():
+            g_cost = g_costs[current_node] + weight
+            f_cost = g_cost + heuristic[neighbor]
+            if g_cost < g_costs[neighbor]:
+                g_costs[neighbor] = g_cost
+                predecessors[neighbor] = current_node
+                heapq.heappush(queue, (f_cost, neighbor))
+                stats.inserciones += 1
+    return None
+
+
+def bfs_dict(graph, start, goal, stats):
+    queue = deque([[start]])
+    visited = set()
+    stats.inserciones += 1
+    while queue:
+        path = queue.popleft()
+        node = path[-1]
+        if node == goal:
+            return path
+        if node not in visited:
+            visited.add(node)
+            stats.expandidos += 1
+            for neighbor in graph[node]:
+                new_path = list(path)
+                new_path.append(neighbor)
+                queue.append(new_path)
+                stats.inserciones += 1
+    return None
+
+
+def a_dict(grafo):
+    """Convierte un GrafoCSR al diccionario de diccionarios de los scripts originales."""
+    graph = {}
+    for u in range(grafo.num_nodos):
+        vecinos, pesos = grafo.vecinos(u)
+        graph[u] = dict(zip(vecinos.tolist(), pesos.tolist()))
+    return graph
+
+
+# --- Medición ---
+
+def medir(nombre, consultas, funcion, preparacion=0.0):
+    """Ejecuta todas las consultas y mide tiempo; la memoria pico se mide en la primera."""
+    stats = EstadisticasBusqueda()
+    inicio = time.perf_counter()
+    for origen, destino in consultas:
+        funcion(origen, destino, stats)
+    tiempo = time.perf_counter() - inicio
+
+    # tracemalloc ralentiza la ejecución, por eso va en una pasada aparte
+    tracemalloc.start()
+    funcion(*consultas[0], EstadisticasBusqueda())
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'algoritmo': nombre,
+        'tiempo_total_s': tiempo,
+        'tiempo_consulta_ms': 1000 * tiempo / len(consultas),
+        'preparacion_s': preparacion,
+        'memoria_pico_kb': pico / 1024,
+        'expandidos': stats.expandidos / len(consultas),
+        'operaciones_heap': (stats.inserciones + stats.expandidos + stats.obsoletos) / len(consultas),
+    }
+
+
+def cronometrar(funcion):
+    inicio = time.perf_counter()
+    resultado = funcion()
+    return resultado, time.perf_counter() - inicio
+
+
+def memoria_de(funcion):
+    tracemalloc.start()
+    resultado = funcion()
+    actual, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return resultado, actual / 1024
+
+
+def correr(generador, aristas, num_consultas, semilla, max_referencia, usar_ch, landmarks):
+    (grafo, coordenadas), t_generar = cronometrar(lambda: generadores.GENERADORES[generador](aristas, semilla=semilla))
+    rng = random.Random(semilla)
+    consultas = [(rng.randrange(grafo.num_nodos), rng.randrange(grafo.num_nodos)) for _ in range(num_consultas)]
+    filas = []
+
+    def fila(resultado):
+        resultado.update(generador=generador, nodos=grafo.num_nodos, aristas=grafo.num_aristas)
+        filas.append(resultado)
+
+    csr_kb = (grafo.offsets.nbytes + grafo.targets.nbytes + grafo.weights.nbytes) / 1024
+    referencia = grafo.num_aristas <= max_referencia
+    if referencia:
+        graph, dict_kb = memoria_de(lambda: a_dict(grafo))
+        fila(medir('dijkstra_dict', consultas, lambda s, t, st: dijkstra_dict(graph, s, t, st)))
+        fila(medir('bfs_dict', consultas, lambda s, t, st: bfs_dict(graph, s, t, st)))
+        filas[-1]['memoria_grafo_kb'] = filas[-2]['memoria_grafo_kb'] = dict_kb
+
+    fila(medir('dijkstra', consultas, lambda s, t, st: grafos.dijkstra(grafo, s, t, st)))
+    alt, t_alt = cronometrar(lambda: HeuristicaALT.precalcular(grafo, k=landmarks, semilla=semilla))
+    fila(medir('a_star_alt', consultas, lambda s, t, st: grafos.a_star(grafo, s, t, alt, st), t_alt))
+    h = None
+    if coordenadas is not None and generador in ('geometrico', 'carretera'):
+        # Peso = longitud / velocidad (máx. 3 en carretera): la distancia escalada es admisible
+        escala = 1 / 3 if generador == 'carretera' else 1.0
+        h = heuristicas.euclidiana(grafo, dict(enumerate(coordenadas.tolist())), escala)
+    if referencia:
+        # El original recibe la heurística como tabla fija para un destino: una por consulta
+        h_tabla = h or alt
+        tablas, t_tablas = cronometrar(lambda: {
+            t: {u: h_tabla(u, t) for u in range(grafo.num_nodos)} for _, t in consultas})
+        fila(medir('a_star_dict', consultas, lambda s, t, st: a_star_dict(graph, s, t, tablas[t], st), t_tablas))
+        filas[-1]['memoria_grafo_kb'] = dict_kb
+        del tablas
+    if h is not None:
+        fila(medir('a_star_euclidiana', consultas, lambda s, t, st: grafos.a_star(grafo, s, t, h, st)))
+    fila(medir('bfs', consultas, lambda s, t, st: grafos.bfs(grafo, s, t, st)))
+    fila(medir('bfs_bidireccional', consultas, lambda s, t, st: grafos.bfs_bidireccional(grafo, s, t, st)))
+    if usar_ch:
+        jerarquia, t_ch = cronometrar(lambda: construir_jerarquia(grafo))
+        fila(medir('ch', consultas, lambda s, t, st: jerarquia.consulta(s, t, st), t_ch))
+
+    for resultado in filas:
+        resultado.setdefault('memoria_grafo_kb', csr_kb)
+        resultado['generacion_s'] = t_generar
+    return filas
+
+
+def imprimir_tabla(filas):
+    columnas = [('generador', 11, '{}'), ('aristas', 10, '{}'), ('algoritmo', 18, '{}'),
+                ('tiempo_consulta_ms', 12, '{:.3f}'), ('preparacion_s', 9, '{:.2f}'),
+                ('memoria_pico_kb', 11, '{:.0f}'), ('memoria_grafo_kb', 11, '{:.0f}'),
+                ('expandidos', 11, '{:.0f}'), ('operaciones_heap', 11, '{:.0f}')]
+    encabezados = ['generador', 'aristas', 'algoritmo', 'ms/consulta', 'prep. s',
+                   'pico KB', 'grafo KB', 'expandidos', 'ops heap']
+    print(' '.join(titulo.rjust(ancho) for titulo, (_, ancho, _) in zip(encabezados, columnas)))
+    for resultado in filas:
+        print(' '.join(formato.format(resultado[clave]).rjust(ancho) for clave, ancho, formato in columnas))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de rutas más cortas sobre grafos sintéticos")
+    parser.add_argument('--generadores', nargs='+', default=list(generadores.GENERADORES),
+                        choices=list(generadores.GENERADORES))
+    parser.add_argument('--aristas', nargs='+', type=lambda x: int(float(x)), default=[1000, 10000, 100000],
+                        help="Tamaños en número de aristas (se aceptan valores como 1e6)")
+    parser.add_argument('--consultas', type=int, default=20)
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--landmarks', type=int, default=8)
+    parser.add_argument('--max-referencia', type=lambda x: int(float(x)), default=100000,
+                        help="Tamaño máximo para correr las versiones de diccionario")
+    parser.add_argument('--ch', action='store_true', help="Incluir jerarquías de contracción (preproceso lento)")
+    parser.add_argument('--json', help="Archivo donde guardar los resultados")
+    args = parser.parse_args()
+
+    filas = []
+    for generador in args.generadores:
+        for aristas in args.aristas:
+            filas += correr(generador, aristas, args.consultas, args.semilla,
+                            args.max_referencia, args.ch, args.landmarks)
+
+    imprimir_tabla(filas)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(filas, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
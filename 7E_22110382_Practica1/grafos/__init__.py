@@ -0,0 +1,10 @@
+from .csr import GrafoCSR, como_csr
+from .algoritmos import (dijkstra, dijkstra_desde, a_star, bfs, bfs_bidireccional, reconstruir_ruta,
+                         EstadisticasBusqueda, heuristica_de_tabla)
+from .lotes import matriz_distancias, distancias_desde
+from .jerarquia import construir_jerarquia, JerarquiaContraccion
+from . import heuristicas
+from .alt import HeuristicaALT
+from .carga import cargar_grafo, cargar_cache, guardar_cache
+from .dinamico import RutasDinamicas
+from . import generadores
@@ -0,0 +1,282 @@
+import heapq
+from collections import deque
+'''
+Algoritmos de búsqueda sobre GrafoCSR
+Versiones de dijkstra, a_star y bfs de Practica1 que trabajan con ids enteros
+y arreglos de predecesores en lugar de diccionarios indexados por nombre. Las
+funciones reciben y devuelven nombres para conservar la interfaz original.
+'''
+
+SIN_PREDECESOR = -1
+
+
+class EstadisticasBusqueda:
+    """Contadores del esfuerzo de una búsqueda (se acumulan entre llamadas)."""
+
+    def __init__(self):
+        self.expandidos = 0   # Nodos sacados del heap y expandidos
+        self.inserciones = 0  # Inserciones en el heap
+        self.obsoletos = 0    # Entradas del heap descartadas por estar desactualizadas
+
+    def __repr__(self):
+        return (f"EstadisticasBusqueda(expandidos={self.expandidos}, "
+                f"inserciones={self.inserciones}, obsoletos={self.obsoletos})")
+
+
+def reconstruir_ruta(predecesores, destino):
+    """Recorre el arreglo de predecesores desde el destino hasta el origen."""
+    ruta = []
+    nodo = destino
+    while nodo != SIN_PREDECESOR:
+        ruta.append(nodo)
+        nodo = predecesores[nodo]
+    return ruta[::-1]
+
+
+def dijkstra(grafo, start, goal, estadisticas=None):
+    """
+    Ruta más corta entre dos nodos con el algoritmo de Dijkstra.
+
+    Args:
+        grafo (GrafoCSR): Grafo con pesos no negativos.
+        start, goal: Nombres de los nodos de origen y destino.
+        estadisticas (EstadisticasBusqueda, opcional): Contadores a actualizar.
+
+    Returns:
+        tuple: (ruta como lista de nombres, costo) o (None, inf) si no hay ruta.
+    """
+    origen, destino = grafo.id_de(start), grafo.id_de(goal)
+    offsets, targets, weights = grafo.vistas()
+    distancias = [float('inf')] * grafo.num_nodos
+    predecesores = [SIN_PREDECESOR] * grafo.num_nodos
+    stats = estadisticas if estadisticas is not None else EstadisticasBusqueda()
+    distancias[origen] = 0
+    queue = [(0, origen)]
+    stats.inserciones += 1
+
+    while queue:
+        distancia_actual, nodo = heapq.heappop(queue)
+        if nodo == destino:
+            return grafo.a_nombres(reconstruir_ruta(predecesores, destino)), distancia_actual
+        if distancia_actual > distancias[nodo]:
+            stats.obsoletos += 1
+            continue  # Entrada obsoleta del heap
+        stats.expandidos += 1
+
+        for i in range(offsets[nodo], offsets[nodo + 1]):
+            vecino = targets[i]
+            distancia = distancia_actual + weights[i]
+            if distancia < distancias[vecino]:
+                distancias[vecino] = distancia
+                predecesores[vecino] = nodo
+                heapq.heappush(queue, (distancia, vecino))
+                stats.inserciones += 1
+
+    return None, float('inf')
+
+
+def dijkstra_desde(grafo, origen, objetivos=None):
+    """
+    Dijkstra de un solo origen trabajando directamente con ids.
+
+    Args:
+        grafo (GrafoCSR): Grafo con pesos no negativos.
+        origen (int): Id del nodo de origen.
+        objetivos (iterable, opcional): Ids a alcanzar; la búsqueda se detiene
+            en cuanto todos están asentados. Si es None se recorre todo el grafo.
+
+    Returns:
+        tuple: (distancias, predecesores) como listas indexadas por id.
+    """
+    offsets, targets, weights = grafo.vistas()
+    distancias = [float('inf')] * grafo.num_nodos
+    predecesores = [SIN_PREDECESOR] * grafo.num_nodos
+    pendientes = set(objetivos) if objetivos is not None else None
+    distancias[origen] = 0
+    queue = [(0, origen)]
+
+    while queue:
+        distancia_actual, nodo = heapq.heappop(queue)
+        if distancia_actual > distancias[nodo]:
+            continue
+        if pendientes is not None:
+            pendientes.discard(nodo)
+            if not pendientes:
+                break
+
+        for i in range(offsets[nodo], offsets[nodo + 1]):
+            vecino = targets[i]
+            distancia = distancia_actual + weights[i]
+            if distancia < distancias[vecino]:
+                distancias[vecino] = distancia
+                predecesores[vecino] = nodo
+                heapq.heappush(queue, (distancia, vecino))
+
+    return distancias, predecesores
+
+
+def heuristica_de_tabla(grafo, tabla):
+    """Convierte una tabla {nombre: estimación} en una heurística h(nodo, destino)."""
+    valores = [tabla.get(nombre, 0) for nombre in grafo.nombres]
+    return lambda nodo, destino: valores[nodo]
+
+
+def a_star(grafo, start, goal, heuristic, estadisticas=None):
+    """
+    Ruta óptima entre dos nodos con el algoritmo A*.
+
+    Las entradas obsoletas del heap se descartan al sacarlas (borrado perezoso)
+    y los nodos cerrados no se vuelven a expandir. Si la heurística no es
+    consistente un nodo cerrado se reabre al encontrarle un costo menor, así
+    que la ruta sigue siendo óptima con cualquier heurística admisible.
+
+    Args:
+        grafo (GrafoCSR): Grafo con pesos no negativos.
+        start, goal: Nombres de los nodos de origen y destino.
+        heuristic (dict | callable): Tabla {nombre: estimación} o función
+            h(nodo, destino) sobre ids (ver grafos.heuristicas).
+        estadisticas (EstadisticasBusqueda, opcional): Contadores a actualizar.
+
+    Returns:
+        list: La ruta como lista de nombres, o None si no existe.
+    """
+    origen, destino = grafo.id_de(start), grafo.id_de(goal)
+    offsets, targets, weights = grafo.vistas()
+    h = heuristica_de_tabla(grafo, heuristic) if isinstance(heuristic, dict) else heuristic
+    stats = estadisticas if estadisticas is not None else EstadisticasBusqueda()
+    g_costs = [float('inf')] * grafo.num_nodos
+    predecesores = [SIN_PREDECESOR] * grafo.num_nodos
+    cerrados = bytearray(grafo.num_nodos)
+    g_costs[origen] = 0
+    queue = [(h(origen, destino), 0, origen)]
+    stats.inserciones += 1
+
+    while queue:
+        _, g_actual, nodo = heapq.heappop(queue)
+        if g_actual > g_costs[nodo] or cerrados[nodo]:
+            stats.obsoletos += 1
+            continue
+        if nodo == destino:
+            return grafo.a_nombres(reconstruir_ruta(predecesores, destino))
+        cerrados[nodo] = 1
+        stats.expandidos += 1
+
+        for i in range(offsets[nodo], offsets[nodo + 1]):
+            vecino = targets[i]
+            g_cost = g_actual + weights[i]
+            if g_cost < g_costs[vecino]:
+                g_costs[vecino] = g_cost
+                predecesores[vecino] = nodo
+                cerrados[vecino] = 0  # Solo ocurre con heurísticas no consistentes
+                heapq.heappush(queue, (g_cost + h(vecino, destino), g_cost, vecino))
+                stats.inserciones += 1
+
+    return None
+
+
+def bfs(grafo, start, goal, estadisticas=None):
+    """
+    Ruta con menos saltos entre dos nodos mediante búsqueda en anchura.
+
+    Args:
+        grafo (GrafoCSR): Grafo (se ignoran los pesos).
+        start, goal: Nombres de los nodos de origen y destino.
+        estadisticas (EstadisticasBusqueda, opcional): Contadores a actualizar
+            (las inserciones cuentan nodos encolados).
+
+    Returns:
+        list: La ruta como lista de nombres, o None si no existe.
+    """
+    origen, destino = grafo.id_de(start), grafo.id_de(goal)
+    offsets, targets, _ = grafo.vistas()
+    predecesores = [SIN_PREDECESOR] * grafo.num_nodos
+    visitados = bytearray(grafo.num_nodos)
+    stats = estadisticas if estadisticas is not None else EstadisticasBusqueda()
+    visitados[origen] = 1
+    queue = deque([origen])
+    stats.inserciones += 1
+
+    while queue:
+        nodo = queue.popleft()
+        if nodo == destino:
+            return grafo.a_nombres(reconstruir_ruta(predecesores, destino))
+        stats.expandidos += 1
+        for vecino in targets[offsets[nodo]:offsets[nodo + 1]]:
+            if not visitados[vecino]:
+                visitados[vecino] = 1
+                predecesores[vecino] = nodo
+                queue.append(vecino)
+                stats.inserciones += 1
+
+    return None
+
+
+def _expandir_nivel(grafo, frontera, distancias, predecesores, distancias_otro):
+    """
+    Expande un nivel completo de una de las dos búsquedas de bfs_bidireccional.
+
+    Returns:
+        tuple: (nueva frontera, saltos del mejor encuentro, nodo de encuentro).
+    """
+    offsets, targets, _ = grafo.vistas()
+    nueva_frontera = []
+    mejor_total, encuentro = float('inf'), SIN_PREDECESOR
+    for nodo in frontera:
+        siguiente = distancias[nodo] + 1
+        for vecino in targets[offsets[nodo]:offsets[nodo + 1]]:
+            if distancias[vecino] != -1:
+                continue
+            distancias[vecino] = siguiente
+            predecesores[vecino] = nodo
+            nueva_frontera.append(vecino)
+            if distancias_otro[vecino] != -1 and siguiente + distancias_otro[vecino] < mejor_total:
+                mejor_total, encuentro = siguiente + distancias_otro[vecino], vecino
+    return nueva_frontera, mejor_total, encuentro
+
+
+def bfs_bidireccional(grafo, start, goal, estadisticas=None):
+    """
+    Ruta con menos saltos buscando a la vez desde el origen y desde el destino.
+
+    En cada paso se expande el nivel de la frontera más pequeña; al terminar
+    el primer nivel en el que ambas búsquedas se tocan se une la mejor pareja
+    de rutas. Solo se guardan dos arreglos de distancias y dos de predecesores,
+    por lo que la memoria es lineal en el número de nodos.
+
+    Args:
+        grafo (GrafoCSR): Grafo (se ignoran los pesos).
+        start, goal: Nombres de los nodos de origen y destino.
+        estadisticas (EstadisticasBusqueda, opcional): Contadores a actualizar.
+
+    Returns:
+        list: La ruta como lista de nombres, o None si no existe.
+    """
+    origen, destino = grafo.id_de(start), grafo.id_de(goal)
+    stats = estadisticas if estadisticas is not None else EstadisticasBusqueda()
+    if origen == destino:
+        return [start]
+
+    inverso = grafo.transpuesto()
+    dist_ida, dist_vuelta = [-1] * grafo.num_nodos, [-1] * grafo.num_nodos
+    pred_ida, pred_vuelta = [SIN_PREDECESOR] * grafo.num_nodos, [SIN_PREDECESOR] * grafo.num_nodos
+    dist_ida[origen], dist_vuelta[destino] = 0, 0
+    frontera_ida, frontera_vuelta = [origen], [destino]
+
+    stats.inserciones += 2
+
+    while frontera_ida and frontera_vuelta:
+        if len(frontera_ida) <= len(frontera_vuelta):
+            stats.expandidos += len(frontera_ida)
+            frontera_ida, total, encuentro = _expandir_nivel(grafo, frontera_ida, dist_ida, pred_ida, dist_vuelta)
+            stats.inserciones += len(frontera_ida)
+        else:
+            stats.expandidos += len(frontera_vuelta)
+            frontera_vuelta, total, encuentro = _expandir_nivel(inverso, frontera_vuelta, dist_vuelta, pred_vuelta, dist_ida)
+            stats.inserciones += len(frontera_vuelta)
+
+        if encuentro != SIN_PREDECESOR:
+            ida = reconstruir_ruta(pred_ida, encuentro)
+            vuelta = reconstruir_ruta(pred_vuelta, encuentro)[::-1]
+            return grafo.a_nombres(ida + vuelta[1:])
+
+    return None
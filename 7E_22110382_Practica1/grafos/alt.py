@@ -0,0 +1,103 @@
+import random
+import numpy as np
+from .algoritmos import dijkstra_desde
+'''
+Heurística ALT (A*, Landmarks y desigualdad del Triángulo)
+Se eligen k nodos de referencia (landmarks) y se precalculan las distancias
+de cada nodo hacia y desde ellos. Por la desigualdad del triángulo, para
+cualquier destino t y landmark L:
+    d(v, t) >= d(L, t) - d(L, v)
+    d(v, t) >= d(v, L) - d(t, L)
+El máximo de estas cotas es una heurística admisible para A* que no requiere
+tablas escritas a mano.
+'''
+
+
+class HeuristicaALT:
+    def __init__(self, landmarks, desde, hacia):
+        self.landmarks = np.asarray(landmarks, dtype=np.int32)
+        self.desde = np.asarray(desde, dtype=np.float32)  # desde[v, i] = d(L_i, v)
+        self.hacia = np.asarray(hacia, dtype=np.float32)  # hacia[v, i] = d(v, L_i)
+        # Margen que compensa el redondeo a float32 para no sobreestimar
+        finitos = np.concatenate([self.desde[np.isfinite(self.desde)], self.hacia[np.isfinite(self.hacia)]])
+        maximo = float(finitos.max()) if finitos.size else 0.0
+        self.tolerancia = 4 * float(np.finfo(np.float32).eps) * maximo
+        self._destino = None
+
+    @classmethod
+    def precalcular(cls, grafo, k=8, semilla=None):
+        """
+        Elige k landmarks (selección del más lejano) y calcula sus distancias.
+
+        Args:
+            grafo (GrafoCSR): Grafo con pesos no negativos.
+            k (int): Número de landmarks.
+            semilla (int, opcional): Semilla para el primer nodo de arranque.
+
+        Returns:
+            HeuristicaALT: Heurística lista para pasarse a a_star.
+        """
+        n = grafo.num_nodos
+        k = min(k, n)
+        inverso = grafo.transpuesto()
+        desde = np.empty((n, k), dtype=np.float32)
+        hacia = np.empty((n, k), dtype=np.float32)
+        landmarks = []
+        elegidos = np.zeros(n, dtype=bool)
+        cercania = np.full(n, np.inf)
+
+        # El primer landmark es el nodo más lejano a uno elegido al azar
+        inicial = random.Random(semilla).randrange(n) if n else 0
+        candidato = inicial
+        if n:
+            distancias = np.array(dijkstra_desde(grafo, inicial)[0])
+            alcanzables = np.isfinite(distancias)
+            candidato = int(np.argmax(np.where(alcanzables, distancias, -1)))
+
+        for i in range(k):
+            landmarks.append(candidato)
+            elegidos[candidato] = True
+            desde[:, i] = dijkstra_desde(grafo, candidato)[0]
+            hacia[:, i] = dijkstra_desde(inverso, candidato)[0]
+
+            # Siguiente: el nodo cuya distancia a los landmarks ya elegidos es máxima
+            ida_vuelta = desde[:, i].astype(np.float64) + hacia[:, i]
+            cercania = np.minimum(cercania, ida_vuelta)
+            puntaje = np.where(np.isfinite(cercania) & ~elegidos, cercania, -1.0)
+            if puntaje.max() < 0:
+                # Grafo no conexo: se salta a un nodo que ningún landmark alcanza
+                restantes = np.flatnonzero(~elegidos)
+                if not restantes.size:
+                    break
+                candidato = int(restantes[np.argmax(~np.isfinite(cercania[restantes]))])
+            else:
+                candidato = int(np.argmax(puntaje))
+
+        return cls(landmarks, desde[:, :len(landmarks)], hacia[:, :len(landmarks)])
+
+    def guardar(self, archivo):
+        """Guarda los landmarks y sus distancias en un archivo .npz."""
+        np.savez(archivo, landmarks=self.landmarks, desde=self.desde, hacia=self.hacia)
+
+    @classmethod
+    def cargar(cls, archivo):
+        with np.load(archivo) as datos:
+            return cls(datos['landmarks'], datos['desde'], datos['hacia'])
+
+    def __call__(self, nodo, destino):
+        """Cota inferior de d(nodo, destino); sirve como heurística de a_star."""
+        if destino != self._destino:
+            self._destino = destino
+            self._desde_destino = self.desde[destino].tolist()
+            self._hacia_destino = self.hacia[destino].tolist()
+
+        cota = 0.0
+        for d_lv, d_lt, d_vl, d_tl in zip(self.desde[nodo].tolist(), self._desde_destino,
+                                          self.hacia[nodo].tolist(), self._hacia_destino):
+            # Con distancias infinitas las diferencias pueden dar nan (se ignora)
+            # o inf (el destino es inalcanzable desde el nodo)
+            if d_lt - d_lv > cota:
+                cota = d_lt - d_lv
+            if d_vl - d_tl > cota:
+                cota = d_vl - d_tl
+        return max(0.0, cota - self.tolerancia)
@@ -0,0 +1,265 @@
+import csv
+import inspect
+import itertools
+import json
+import os
+from array import array
+import numpy as np
+from .csr import GrafoCSR
+'''
+Carga de grafos desde archivos con caché binaria mapeada en memoria
+Formatos de texto soportados:
+    csv    -> lista de aristas "origen,destino[,peso]" (encabezado opcional)
+    dimacs -> formato .gr del 9th DIMACS Challenge ("a u v w")
+    osm    -> aristas exportadas de OpenStreetMap (p. ej. con osmnx) en CSV
+              con columnas u, v, length y opcionalmente oneway
+La primera carga convierte el texto a un directorio <archivo>.csr con los
+arreglos CSR en binario; las siguientes los abren con np.memmap, de modo que
+el arranque no depende del tamaño del grafo y varios procesos comparten las
+mismas páginas del sistema operativo. La caché se reconstruye si cambia el
+archivo de texto o la forma de leerlo (formato y opciones del lector).
+'''
+
+VERSION_CACHE = 1
+
+
+class _Internador:
+    """Asigna ids consecutivos a los nombres de nodo conforme aparecen."""
+
+    def __init__(self):
+        self.indice = {}
+        self.nombres = []
+
+    def __call__(self, nombre):
+        i = self.indice.get(nombre)
+        if i is None:
+            i = self.indice[nombre] = len(self.nombres)
+            self.nombres.append(nombre)
+        return i
+
+
+def _es_numero(texto):
+    try:
+        float(texto)
+        return True
+    except ValueError:
+        return False
+
+
+def _a_numero(texto):
+    valor = float(texto)
+    return int(valor) if valor.is_integer() else valor
+
+
+def _parece_encabezado(primeras):
+    """
+    Decide si la primera fila de datos es un encabezado.
+
+    Lo es si su columna de peso no es numérica, o si sus dos ids no son
+    numéricos mientras que los de la fila siguiente sí ("source,target" sobre
+    "1,2"). Con nombres de nodo de texto y sin peso no se puede distinguir:
+    para esos archivos se pasa encabezado=True a leer_csv.
+    """
+    fila = primeras[0]
+    if len(fila) > 2 and not _es_numero(fila[2]):
+        return True
+    if len(primeras) < 2 or _es_numero(fila[0]) or _es_numero(fila[1]):
+        return False
+    siguiente = primeras[1]
+    return _es_numero(siguiente[0]) and _es_numero(siguiente[1])
+
+
+def leer_csv(archivo, dirigido=True, delimitador=',', encabezado=None):
+    """
+    Lee una lista de aristas en CSV.
+
+    Args:
+        archivo (str): Archivo con filas "origen,destino[,peso]".
+        dirigido (bool): Si es False cada arista se agrega en ambos sentidos.
+        delimitador (str): Separador de columnas.
+        encabezado (bool, opcional): Si la primera fila de datos es un
+            encabezado. Por defecto se detecta (ver _parece_encabezado).
+
+    Returns:
+        tuple: (nombres, origenes, destinos, pesos) listos para GrafoCSR.desde_arreglos.
+    """
+    internar = _Internador()
+    origenes, destinos, pesos = array('q'), array('q'), array('d')
+    with open(archivo, newline='', encoding='utf-8') as f:
+        filas = (fila for fila in csv.reader(f, delimiter=delimitador) if fila and not fila[0].startswith('#'))
+        primeras = list(itertools.islice(filas, 2))
+        if encabezado is None:
+            encabezado = bool(primeras) and _parece_encabezado(primeras)
+        if encabezado and primeras:
+            primeras.pop(0)
+        for fila in itertools.chain(primeras, filas):
+            u, v = internar(fila[0].strip()), internar(fila[1].strip())
+            peso = float(fila[2]) if len(fila) > 2 else 1.0
+            origenes.append(u); destinos.append(v); pesos.append(peso)
+            if not dirigido:
+                origenes.append(v); destinos.append(u); pesos.append(peso)
+    return internar.nombres, origenes, destinos, pesos
+
+
+def leer_dimacs(archivo):
+    """
+    Lee un grafo .gr de DIMACS. Los nombres de nodo son los enteros 1..n.
+
+    Returns:
+        tuple: (nombres, origenes, destinos, pesos) listos para GrafoCSR.desde_arreglos.
+    """
+    n = 0
+    origenes, destinos, pesos = array('q'), array('q'), array('d')
+    with open(archivo, encoding='utf-8') as f:
+        for linea in f:
+            if linea.startswith('a'):
+                _, u, v, w = linea.split()
+                origenes.append(int(u) - 1); destinos.append(int(v) - 1); pesos.append(float(w))
+            elif linea.startswith('p'):
+                n = int(linea.split()[2])
+    return np.arange(1, n + 1, dtype=np.int64), origenes, destinos, pesos
+
+
+def leer_osm(archivo, columna_peso='length'):
+    """
+    Lee aristas derivadas de OpenStreetMap (CSV con columnas u, v y el peso).
+
+    Las calles con oneway falso se agregan en ambos sentidos.
+
+    Returns:
+        tuple: (nombres, origenes, destinos, pesos) listos para GrafoCSR.desde_arreglos.
+    """
+    internar = _Internador()
+    origenes, destinos, pesos = array('q'), array('q'), array('d')
+    with open(archivo, newline='', encoding='utf-8') as f:
+        for fila in csv.DictReader(f):
+            u, v = internar(_a_numero(fila['u'])), internar(_a_numero(fila['v']))
+            peso = float(fila[columna_peso])
+            origenes.append(u); destinos.append(v); pesos.append(peso)
+            if fila.get('oneway', 'True').strip().lower() in ('false', '0', 'no'):
+                origenes.append(v); destinos.append(u); pesos.append(peso)
+    return internar.nombres, origenes, destinos, pesos
+
+
+LECTORES = {'csv': leer_csv, 'dimacs': leer_dimacs, 'osm': leer_osm}
+
+
+def _formato_por_extension(archivo):
+    if archivo.endswith('.gr'):
+        return 'dimacs'
+    return 'csv'
+
+
+def _firma(archivo):
+    estado = os.stat(archivo)
+    return {'tamano': estado.st_size, 'mtime': estado.st_mtime}
+
+
+def _lectura(archivo, formato, opciones):
+    """Formato y opciones completas (con los valores por defecto) con que se lee el archivo."""
+    formato = formato or _formato_por_extension(archivo)
+    argumentos = inspect.signature(LECTORES[formato]).bind(archivo, **opciones)
+    argumentos.apply_defaults()
+    return {'formato': formato, 'opciones': dict(list(argumentos.arguments.items())[1:])}
+
+
+def guardar_cache(grafo, directorio, fuente=None, lectura=None):
+    """
+    Escribe los arreglos del grafo en binario y los nombres en una tabla aparte.
+
+    Args:
+        grafo (GrafoCSR): Grafo a guardar.
+        directorio (str): Directorio de la caché (se crea si no existe).
+        fuente (str, opcional): Archivo de texto de origen, para invalidar la caché.
+        lectura (dict, opcional): Formato y opciones con que se leyó la fuente;
+            si cambian, la caché deja de ser vigente.
+    """
+    os.makedirs(directorio, exist_ok=True)
+    nombres_enteros = isinstance(grafo.nombres, np.ndarray) or all(
+        isinstance(nombre, int) for nombre in grafo.nombres)
+    arreglos = {
+        'offsets': np.asarray(grafo.offsets, dtype=np.int64),
+        'targets': np.asarray(grafo.targets, dtype=np.int32),
+        'weights': np.asarray(grafo.weights),
+    }
+    if nombres_enteros:
+        arreglos['nombres'] = np.asarray(grafo.nombres, dtype=np.int64)
+    else:
+        with open(os.path.join(directorio, 'nombres.json'), 'w', encoding='utf-8') as f:
+            json.dump(grafo.nombres, f, ensure_ascii=False)
+
+    for nombre, datos in arreglos.items():
+        datos.tofile(os.path.join(directorio, f'{nombre}.bin'))
+    meta = {
+        'version': VERSION_CACHE,
+        'num_nodos': grafo.num_nodos,
+        'num_aristas': grafo.num_aristas,
+        'weights_dtype': arreglos['weights'].dtype.str,
+        'nombres_enteros': nombres_enteros,
+        'fuente': _firma(fuente) if fuente else None,
+        'lectura': lectura,
+    }
+    # meta.json se escribe al final: su presencia indica que la caché está completa
+    with open(os.path.join(directorio, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=4)
+
+
+def _mapear(directorio, nombre, dtype, longitud):
+    if longitud == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(os.path.join(directorio, f'{nombre}.bin'), dtype=dtype, mode='r', shape=(longitud,))
+
+
+def cargar_cache(directorio):
+    """Abre una caché escrita con guardar_cache mapeando sus arreglos en memoria."""
+    with open(os.path.join(directorio, 'meta.json'), encoding='utf-8') as f:
+        meta = json.load(f)
+    n, m = meta['num_nodos'], meta['num_aristas']
+    if meta['nombres_enteros']:
+        nombres = _mapear(directorio, 'nombres', np.int64, n)
+    else:
+        with open(os.path.join(directorio, 'nombres.json'), encoding='utf-8') as f:
+            nombres = json.load(f)
+    return GrafoCSR(
+        nombres,
+        _mapear(directorio, 'offsets', np.int64, n + 1),
+        _mapear(directorio, 'targets', np.int32, m),
+        _mapear(directorio, 'weights', np.dtype(meta['weights_dtype']), m),
+        directorio_cache=directorio,
+    )
+
+
+def _cache_vigente(directorio, archivo, lectura):
+    try:
+        with open(os.path.join(directorio, 'meta.json'), encoding='utf-8') as f:
+            meta = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return False
+    return (meta.get('version') == VERSION_CACHE and meta.get('fuente') == _firma(archivo)
+            and meta.get('lectura') == lectura)
+
+
+def cargar_grafo(archivo, formato=None, directorio_cache=None, **opciones):
+    """
+    Carga un grafo de texto usando (y creando si hace falta) su caché binaria.
+
+    Args:
+        archivo (str): Archivo de aristas.
+        formato (str, opcional): 'csv', 'dimacs' u 'osm'. Por defecto se deduce
+            de la extensión (.gr es DIMACS, lo demás CSV).
+        directorio_cache (str, opcional): Por defecto <archivo>.csr.
+        **opciones: Se pasan al lector (p. ej. dirigido=False para CSV).
+
+    Returns:
+        GrafoCSR: Grafo con los arreglos mapeados desde la caché.
+    """
+    directorio = directorio_cache or archivo + '.csr'
+    lectura = _lectura(archivo, formato, opciones)
+    if not _cache_vigente(directorio, archivo, lectura):
+        lector = LECTORES[lectura['formato']]
+        nombres, origenes, destinos, pesos = lector(archivo, **lectura['opciones'])
+        grafo = GrafoCSR.desde_arreglos(nombres, np.frombuffer(origenes, dtype=np.int64),
+                                        np.frombuffer(destinos, dtype=np.int64),
+                                        np.frombuffer(pesos, dtype=np.float64))
+        guardar_cache(grafo, directorio, fuente=archivo, lectura=lectura)
+    return cargar_cache(directorio)
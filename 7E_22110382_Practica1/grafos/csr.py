@@ -0,0 +1,191 @@
+import numpy as np
+'''
+Grafo en formato CSR (Compressed Sparse Row)
+Los nombres de los nodos se internan a identificadores enteros (0..n-1) y la
+adyacencia se guarda en tres arreglos contiguos:
+    offsets[u]:offsets[u + 1]  -> rango de aristas que salen del nodo u
+    targets[i]                 -> nodo destino de la arista i
+    weights[i]                 -> peso de la arista i
+Así se evita el diccionario de diccionarios indexado por cadenas, que en mapas
+grandes domina el tiempo de ejecución y la memoria.
+'''
+
+# Conversiones recientes de diccionarios: id -> (diccionario, huella, GrafoCSR)
+_conversiones = {}
+MAX_CONVERSIONES = 8
+
+
+class GrafoCSR:
+    def __init__(self, nombres, offsets, targets, weights, directorio_cache=None):
+        # Los nombres enteros pueden venir como arreglo (p. ej. mapeado de la caché)
+        self.nombres = nombres if isinstance(nombres, np.ndarray) else list(nombres)
+        self.directorio_cache = directorio_cache
+        self._indice = None
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.targets = np.asarray(targets, dtype=np.int32)
+        # Los pesos enteros se conservan como enteros (costos exactos en el demo)
+        self.weights = np.asarray(weights)
+        if self.weights.dtype.kind not in 'iuf':
+            self.weights = self.weights.astype(np.float64)
+        self._transpuesto = None
+
+    @classmethod
+    def desde_aristas(cls, aristas, nombres=None):
+        """
+        Construye el grafo a partir de una secuencia de aristas dirigidas.
+
+        Args:
+            aristas (iterable): Tuplas (origen, destino, peso) con nombres de nodos.
+            nombres (iterable, opcional): Nodos a internar primero (p. ej. aislados).
+
+        Returns:
+            GrafoCSR: El grafo compactado.
+        """
+        indice = {}
+        orden = []
+
+        def internar(nombre):
+            i = indice.get(nombre)
+            if i is None:
+                i = indice[nombre] = len(orden)
+                orden.append(nombre)
+            return i
+
+        for nombre in nombres or ():
+            internar(nombre)
+
+        origenes, destinos, pesos = [], [], []
+        for u, v, w in aristas:
+            origenes.append(internar(u))
+            destinos.append(internar(v))
+            pesos.append(w)
+
+        return cls.desde_arreglos(orden, origenes, destinos, pesos)
+
+    @classmethod
+    def desde_arreglos(cls, nombres, origenes, destinos, pesos):
+        """Construye el grafo a partir de arreglos paralelos de ids (origen, destino, peso)."""
+        n = len(nombres)
+        origenes = np.asarray(origenes, dtype=np.int64)
+        # Orden estable por origen: conserva el orden de inserción de los vecinos
+        orden = np.argsort(origenes, kind='stable')
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(origenes, minlength=n), out=offsets[1:])
+        targets = np.asarray(destinos, dtype=np.int32)[orden]
+        weights = np.asarray(pesos)[orden]
+        return cls(nombres, offsets, targets, weights)
+
+    @classmethod
+    def desde_dict(cls, graph):
+        """
+        Convierte un grafo de diccionarios como los de Practica1.
+
+        Acepta tanto {nodo: {vecino: peso}} como {nodo: [vecinos]}; en el
+        segundo caso todas las aristas pesan 1.
+        """
+        def aristas():
+            for nodo, vecinos in graph.items():
+                if isinstance(vecinos, dict):
+                    for vecino, peso in vecinos.items():
+                        yield nodo, vecino, peso
+                else:
+                    for vecino in vecinos:
+                        yield nodo, vecino, 1
+
+        return cls.desde_aristas(aristas(), nombres=graph.keys())
+
+    @property
+    def indice(self):
+        """Diccionario nombre -> id; se construye en la primera consulta."""
+        if self._indice is None:
+            nombres = self.nombres.tolist() if isinstance(self.nombres, np.ndarray) else self.nombres
+            self._indice = {nombre: i for i, nombre in enumerate(nombres)}
+        return self._indice
+
+    @property
+    def num_nodos(self):
+        return len(self.nombres)
+
+    @property
+    def num_aristas(self):
+        return len(self.targets)
+
+    def id_de(self, nombre):
+        return self.indice[nombre]
+
+    def nombre_de(self, nodo):
+        return self.a_nombres([nodo])[0]
+
+    def vecinos(self, nodo):
+        """Devuelve (targets, weights) del nodo como vistas sin copia."""
+        inicio, fin = self.offsets[nodo], self.offsets[nodo + 1]
+        return self.targets[inicio:fin], self.weights[inicio:fin]
+
+    def vistas(self):
+        """
+        (offsets, targets, weights) como memoryview sobre los mismos arreglos.
+
+        Los bucles de las búsquedas indexan un elemento a la vez; una memoryview
+        devuelve int/float de Python sin rebanar arreglos de numpy ni crear sus
+        escalares, y no copia nada: sirve igual con los arreglos mapeados de la
+        caché y refleja los pesos modificados en su lugar.
+        """
+        return memoryview(self.offsets), memoryview(self.targets), memoryview(self.weights)
+
+    def transpuesto(self):
+        """Grafo con todas las aristas invertidas (se calcula una sola vez)."""
+        if self._transpuesto is None:
+            origenes = np.repeat(np.arange(self.num_nodos), np.diff(self.offsets))
+            self._transpuesto = GrafoCSR.desde_arreglos(self.nombres, self.targets, origenes, self.weights)
+        return self._transpuesto
+
+    def a_nombres(self, ruta):
+        """Traduce una ruta de ids a nombres."""
+        if isinstance(self.nombres, np.ndarray):
+            return self.nombres[np.asarray(ruta, dtype=np.int64)].tolist()
+        return [self.nombres[nodo] for nodo in ruta]
+
+    def __reduce_ex__(self, protocolo):
+        # Un grafo mapeado desde la caché viaja como la ruta de su directorio:
+        # cada proceso vuelve a mapear los mismos archivos y comparte las páginas
+        if self.directorio_cache is not None:
+            from .carga import cargar_cache
+            return cargar_cache, (self.directorio_cache,)
+        return super().__reduce_ex__(protocolo)
+
+    def __contains__(self, nombre):
+        return nombre in self.indice
+
+    def __len__(self):
+        return len(self.nombres)
+
+
+def como_csr(graph):
+    """
+    GrafoCSR de `graph`, convirtiendo cada diccionario una sola vez.
+
+    Las funciones de los scripts reciben el diccionario en cada consulta; al
+    devolver siempre el mismo GrafoCSR se evita repetir la conversión y se
+    conservan sus cachés (transpuesto, posiciones del dibujo). La conversión se
+    repite si cambia el número de nodos o de aristas; para pesos modificados en
+    su lugar use GrafoCSR.desde_dict o RutasDinamicas.
+
+    Args:
+        graph (dict | GrafoCSR): Grafo de diccionarios o un GrafoCSR ya construido.
+
+    Returns:
+        GrafoCSR: El grafo compactado.
+    """
+    if isinstance(graph, GrafoCSR):
+        return graph
+    huella = (len(graph), sum(map(len, graph.values())))
+    # Se guarda el propio diccionario para que su id no se reutilice mientras esté en caché
+    entrada = _conversiones.get(id(graph))
+    if entrada is not None and entrada[0] is graph and entrada[1] == huella:
+        return entrada[2]
+    grafo = GrafoCSR.desde_dict(graph)
+    _conversiones.pop(id(graph), None)
+    if len(_conversiones) >= MAX_CONVERSIONES:
+        del _conversiones[next(iter(_conversiones))]
+    _conversiones[id(graph)] = (graph, huella, grafo)
+    return grafo
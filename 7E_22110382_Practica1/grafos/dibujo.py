@@ -0,0 +1,188 @@
+import weakref
+from collections import deque
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+'''
+Dibujo de rutas sobre GrafoCSR
+A diferencia de draw_graph, que reconstruye un networkx.Graph y recalcula
+spring_layout en cada llamada, aquí:
+    - las posiciones se toman de coordenadas dadas o se calculan una sola vez
+      y quedan en caché por grafo (solo para los nodos que faltan); sin scipy
+      (que spring_layout exige desde 500 nodos) se usa un layout de resortes
+      propio en numpy;
+    - todas las aristas se dibujan en un único LineCollection;
+    - en grafos grandes solo se dibuja la vecindad de la ruta resaltada;
+    - con archivo= se renderiza sin ventana (PNG, SVG, ... según la extensión).
+'''
+
+# Posiciones calculadas por grafo: {id de nodo: (x, y)}
+_cache_posiciones = weakref.WeakKeyDictionary()
+
+
+def vecindad_de_ruta(grafo, ruta, saltos=2, max_nodos=2000):
+    """Ids de los nodos a como mucho `saltos` aristas de la ruta (en ambos sentidos)."""
+    inverso = grafo.transpuesto()
+    distancia = {nodo: 0 for nodo in ruta}
+    queue = deque(ruta)
+    while queue and len(distancia) < max_nodos:
+        nodo = queue.popleft()
+        if distancia[nodo] == saltos:
+            continue
+        for g in (grafo, inverso):
+            for vecino in g.targets[g.offsets[nodo]:g.offsets[nodo + 1]].tolist():
+                if vecino not in distancia:
+                    distancia[vecino] = distancia[nodo] + 1
+                    queue.append(vecino)
+    return np.fromiter(distancia, dtype=np.int64)
+
+
+def _layout_resortes(u, v, inicial, semilla, iteraciones=50, bloque=128):
+    """
+    Fruchterman-Reingold como el spring_layout denso de networkx, sin scipy.
+
+    La repulsión se calcula por bloques de filas y la atracción sobre la lista
+    de aristas (u, v), así la memoria es O(bloque * n) y no O(n^2); para un
+    dibujo basta float32. Las filas de `inicial` que no son nan quedan fijas;
+    las demás se sortean.
+    """
+    n = len(inicial)
+    fijos = ~np.isnan(inicial[:, 0])
+    pos = np.where(np.isnan(inicial), np.random.default_rng(semilla).random((n, 2)), inicial).astype(np.float32)
+    k = np.float32(np.sqrt(1.0 / n))
+    # Temperatura inicial: una décima del dominio, enfriada linealmente
+    t = max(np.ptp(pos[:, 0]), np.ptp(pos[:, 1])) * 0.1
+    dt = t / (iteraciones + 1)
+    desplazamiento = np.empty_like(pos)
+    for _ in range(iteraciones):
+        x, y = pos[:, 0].copy(), pos[:, 1].copy()
+        for i in range(0, n, bloque):
+            dx = x[i:i + bloque, None] - x
+            dy = y[i:i + bloque, None] - y
+            # k^2 / d^2 con distancia mínima 0.01, sin raíces cuadradas
+            fuerza = dx * dx
+            fuerza += dy * dy
+            np.maximum(fuerza, 1e-4, out=fuerza)
+            np.divide(k * k, fuerza, out=fuerza)
+            desplazamiento[i:i + bloque, 0] = np.einsum('ij,ij->i', dx, fuerza)
+            desplazamiento[i:i + bloque, 1] = np.einsum('ij,ij->i', dy, fuerza)
+        delta = pos[u] - pos[v]
+        atraccion = delta * (np.maximum(np.linalg.norm(delta, axis=1), 0.01) / k)[:, None]
+        np.subtract.at(desplazamiento, u, atraccion)
+        np.add.at(desplazamiento, v, atraccion)
+        largo = np.maximum(np.linalg.norm(desplazamiento, axis=1), 0.01)
+        paso = desplazamiento * (t / largo)[:, None]
+        paso[fijos] = 0.0
+        pos += paso
+        t -= dt
+    pos = pos.astype(np.float64)
+    if not fijos.any():
+        # Igual que networkx: centrado y escalado a [-1, 1]
+        pos -= pos.mean(axis=0)
+        pos /= max(np.abs(pos).max(), 1e-12)
+    return pos
+
+
+def _posiciones(grafo, nodos, coordenadas, semilla):
+    """Arreglo (n, 2) con las posiciones de `nodos` (el resto queda en nan)."""
+    pos = np.full((grafo.num_nodos, 2), np.nan)
+    if coordenadas is not None:
+        if isinstance(coordenadas, dict):
+            for nodo in nodos.tolist():
+                pos[nodo] = coordenadas[grafo.nombres[nodo]]
+        else:
+            pos[nodos] = np.asarray(coordenadas, dtype=np.float64)[nodos]
+        return pos
+
+    cache = _cache_posiciones.setdefault(grafo, {})
+    faltantes = [nodo for nodo in nodos.tolist() if nodo not in cache]
+    if faltantes:
+        en_dibujo = np.zeros(grafo.num_nodos, dtype=bool)
+        en_dibujo[nodos] = True
+        origenes = np.repeat(np.arange(grafo.num_nodos), np.diff(grafo.offsets))
+        mascara = en_dibujo[origenes] & en_dibujo[grafo.targets]
+        u, v = origenes[mascara], grafo.targets[mascara]
+        # Los nodos ya colocados quedan fijos para que el dibujo sea estable
+        fijos = [nodo for nodo in nodos.tolist() if nodo in cache]
+        try:
+            import networkx as nx
+            H = nx.Graph()
+            H.add_nodes_from(nodos.tolist())
+            H.add_edges_from(zip(u.tolist(), v.tolist()))
+            cache.update(nx.spring_layout(H, pos={nodo: cache[nodo] for nodo in fijos} or None,
+                                          fixed=fijos or None, seed=semilla))
+        except ImportError:
+            # Sin networkx, o sin scipy (spring_layout lo necesita con 500 nodos o más)
+            local = np.full(grafo.num_nodos, -1, dtype=np.int64)
+            local[nodos] = np.arange(len(nodos))
+            inicial = np.full((len(nodos), 2), np.nan)
+            for nodo in fijos:
+                inicial[local[nodo]] = cache[nodo]
+            cache.update(zip(nodos.tolist(), _layout_resortes(local[u], local[v], inicial, semilla)))
+    for nodo in nodos.tolist():
+        pos[nodo] = cache[nodo]
+    return pos
+
+
+def dibujar_ruta(grafo, ruta, coordenadas=None, archivo=None, titulo=None,
+                 max_nodos=2000, saltos=2, semilla=0, etiquetas_pesos=True):
+    """
+    Dibuja el grafo (o la vecindad de la ruta si es grande) y resalta la ruta.
+
+    Args:
+        grafo (GrafoCSR): Grafo a dibujar.
+        ruta (list): Ruta como lista de nombres, o None.
+        coordenadas (dict | array, opcional): {nombre: (x, y)} o arreglo (n, 2)
+            por id. Sin coordenadas se usa spring_layout una sola vez por nodo.
+        archivo (str, opcional): Si se da, se guarda la figura sin abrir ventana.
+        titulo (str, opcional): Título de la figura.
+        max_nodos (int): A partir de este tamaño solo se dibuja la vecindad
+            (sin ruta, los primeros max_nodos nodos).
+        saltos (int): Radio de la vecindad alrededor de la ruta.
+        semilla (int): Semilla del layout.
+        etiquetas_pesos (bool): Mostrar los pesos en dibujos pequeños.
+    """
+    ids_ruta = [grafo.id_de(nombre) for nombre in ruta] if ruta else []
+    if grafo.num_nodos <= max_nodos or not ids_ruta:
+        nodos = np.arange(min(grafo.num_nodos, max_nodos))
+    else:
+        nodos = vecindad_de_ruta(grafo, ids_ruta, saltos, max_nodos)
+    pos = _posiciones(grafo, nodos, coordenadas, semilla)
+
+    origenes = np.repeat(np.arange(grafo.num_nodos), np.diff(grafo.offsets))
+    visibles = ~np.isnan(pos[origenes, 0]) & ~np.isnan(pos[grafo.targets, 0])
+    segmentos = np.stack([pos[origenes[visibles]], pos[grafo.targets[visibles]]], axis=1)
+
+    if archivo:
+        fig = Figure(figsize=(8, 6))
+        FigureCanvasAgg(fig)
+    else:
+        fig = plt.figure(figsize=(8, 6))
+    ax = fig.add_subplot()
+    ax.add_collection(LineCollection(segmentos, colors='gray', linewidths=0.5 if len(nodos) > 100 else 1, zorder=1))
+    ax.scatter(pos[nodos, 0], pos[nodos, 1], s=600 if len(nodos) <= 50 else 4, c='lightblue', zorder=2)
+
+    if len(ids_ruta) > 1:
+        tramo = np.stack([pos[ids_ruta[:-1]], pos[ids_ruta[1:]]], axis=1)
+        ax.add_collection(LineCollection(tramo, colors='red', linewidths=2, zorder=3))
+
+    # Etiquetas solo cuando el dibujo es pequeño y siguen siendo legibles
+    if len(nodos) <= 50:
+        for nodo in nodos.tolist():
+            ax.annotate(str(grafo.nombres[nodo]), pos[nodo], ha='center', va='center', fontsize=10, zorder=4)
+        pesos = grafo.weights[visibles]
+        if etiquetas_pesos and len(pesos) <= 100:
+            for (inicio, fin), peso in zip(segmentos, pesos.tolist()):
+                ax.annotate(str(peso), (inicio + fin) / 2, ha='center', va='center', fontsize=8, zorder=4)
+
+    ax.autoscale_view()
+    ax.set_axis_off()
+    if titulo:
+        ax.set_title(titulo)
+
+    if archivo:
+        fig.savefig(archivo)
+    else:
+        plt.show()
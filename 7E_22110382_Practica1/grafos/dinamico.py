@@ -0,0 +1,169 @@
+import heapq
+import numpy as np
+from .csr import GrafoCSR
+from .algoritmos import dijkstra_desde, reconstruir_ruta, SIN_PREDECESOR
+'''
+Rutas más cortas con pesos dinámicos
+Se mantienen los árboles de rutas más cortas de varios orígenes registrados y,
+cuando llega un lote de cambios de peso (p. ej. tráfico), se reparan de forma
+incremental en lugar de volver a ejecutar Dijkstra completo:
+    1. Si sube el peso de una arista del árbol, todo el subárbol que cuelga de
+       ella queda afectado: sus distancias se invalidan y cada nodo afectado
+       toma la mejor arista entrante desde un nodo no afectado.
+    2. Si baja el peso de una arista y mejora a su destino, este se relaja.
+    3. Un Dijkstra que arranca solo con esos nodos propaga los cambios.
+Únicamente se vuelven a asentar los nodos cuya distancia puede cambiar.
+'''
+
+
+class _Arbol:
+    """Árbol de rutas más cortas de un origen."""
+
+    def __init__(self, distancias, predecesores):
+        self.distancias = distancias
+        self.predecesores = predecesores
+        self.hijos = {}
+        for nodo, padre in enumerate(predecesores):
+            if padre != SIN_PREDECESOR:
+                self.hijos.setdefault(padre, set()).add(nodo)
+
+    def cambiar_padre(self, nodo, padre):
+        anterior = self.predecesores[nodo]
+        if anterior != SIN_PREDECESOR:
+            self.hijos[anterior].discard(nodo)
+        self.predecesores[nodo] = padre
+        if padre != SIN_PREDECESOR:
+            self.hijos.setdefault(padre, set()).add(nodo)
+
+    def subarbol(self, raiz):
+        nodos, pendientes = [], [raiz]
+        while pendientes:
+            nodo = pendientes.pop()
+            nodos.append(nodo)
+            pendientes.extend(self.hijos.get(nodo, ()))
+        return nodos
+
+
+class RutasDinamicas:
+    def __init__(self, grafo):
+        """
+        Args:
+            grafo (GrafoCSR): Grafo base. Los pesos se copian, así que el grafo
+                original (incluso si está mapeado desde la caché) no se modifica.
+        """
+        self.pesos = np.array(grafo.weights, dtype=np.float64)
+        self.grafo = GrafoCSR(grafo.nombres, grafo.offsets, grafo.targets, self.pesos)
+        # Aristas entrantes: para cada nodo, los índices de las aristas que llegan a él
+        origenes = np.repeat(np.arange(grafo.num_nodos), np.diff(grafo.offsets))
+        self._entrantes = np.argsort(grafo.targets, kind='stable')
+        self._origen_arista = origenes
+        self._offsets_entrada = np.zeros(grafo.num_nodos + 1, dtype=np.int64)
+        np.cumsum(np.bincount(grafo.targets, minlength=grafo.num_nodos), out=self._offsets_entrada[1:])
+        self.arboles = {}
+
+    def registrar(self, origen):
+        """Calcula y guarda el árbol de rutas más cortas de un origen (por nombre)."""
+        nodo = self.grafo.id_de(origen)
+        self.arboles[nodo] = _Arbol(*dijkstra_desde(self.grafo, nodo))
+
+    def desregistrar(self, origen):
+        self.arboles.pop(self.grafo.id_de(origen), None)
+
+    def distancia(self, origen, destino):
+        return self.arboles[self.grafo.id_de(origen)].distancias[self.grafo.id_de(destino)]
+
+    def ruta(self, origen, destino):
+        """Ruta más corta vigente desde un origen registrado, o None."""
+        arbol = self.arboles[self.grafo.id_de(origen)]
+        nodo = self.grafo.id_de(destino)
+        if arbol.distancias[nodo] == float('inf'):
+            return None
+        return self.grafo.a_nombres(reconstruir_ruta(arbol.predecesores, nodo))
+
+    def _aristas(self, u, v):
+        inicio, fin = self.grafo.offsets[u], self.grafo.offsets[u + 1]
+        return (np.flatnonzero(self.grafo.targets[inicio:fin] == v) + inicio).tolist()
+
+    def _mejor_entrante(self, arbol, nodo, afectados):
+        """Mejor arista entrante a `nodo` desde un nodo no afectado."""
+        mejor, padre = float('inf'), SIN_PREDECESOR
+        distancias = arbol.distancias
+        for arista in self._entrantes[self._offsets_entrada[nodo]:self._offsets_entrada[nodo + 1]].tolist():
+            u = int(self._origen_arista[arista])
+            if u not in afectados and distancias[u] + self.pesos[arista] < mejor:
+                mejor, padre = distancias[u] + float(self.pesos[arista]), u
+        return mejor, padre
+
+    def actualizar(self, cambios):
+        """
+        Aplica un lote de cambios de peso y repara los árboles registrados.
+
+        Args:
+            cambios (iterable): Tuplas (origen, destino, nuevo_peso) por nombre.
+                Si hay aristas paralelas, todas toman el nuevo peso.
+
+        Returns:
+            int: Número total de nodos que se volvieron a asentar.
+        """
+        anteriores = {}
+        for u_nombre, v_nombre, peso in cambios:
+            u, v = self.grafo.id_de(u_nombre), self.grafo.id_de(v_nombre)
+            for arista in self._aristas(u, v):
+                # Se compara contra el peso previo al lote, no al cambio anterior
+                anteriores.setdefault(arista, (u, v, float(self.pesos[arista])))
+                self.pesos[arista] = peso
+
+        subidas, bajadas = [], []
+        for arista, (u, v, anterior) in anteriores.items():
+            if self.pesos[arista] > anterior:
+                subidas.append((u, v))
+            elif self.pesos[arista] < anterior:
+                bajadas.append((u, v, arista))
+
+        reasentados = 0
+        for origen, arbol in self.arboles.items():
+            reasentados += self._reparar(origen, arbol, subidas, bajadas)
+        return reasentados
+
+    def _reparar(self, origen, arbol, subidas, bajadas):
+        distancias = arbol.distancias
+        queue = []
+
+        # 1. Subárboles colgando de aristas del árbol que se encarecieron
+        afectados = set()
+        for u, v in subidas:
+            if arbol.predecesores[v] == u and v not in afectados:
+                afectados.update(arbol.subarbol(v))
+        for nodo in afectados:
+            distancias[nodo] = float('inf')
+        for nodo in afectados:
+            distancia, padre = self._mejor_entrante(arbol, nodo, afectados)
+            arbol.cambiar_padre(nodo, padre)
+            if padre != SIN_PREDECESOR:
+                distancias[nodo] = distancia
+                heapq.heappush(queue, (distancia, nodo))
+
+        # 2. Aristas abaratadas que mejoran a su destino
+        for u, v, arista in bajadas:
+            peso = float(self.pesos[arista])
+            if distancias[u] + peso < distancias[v]:
+                distancias[v] = distancias[u] + peso
+                arbol.cambiar_padre(v, u)
+                heapq.heappush(queue, (distancias[v], v))
+
+        # 3. Propagación al estilo Dijkstra solo desde los nodos tocados
+        offsets, targets, pesos = self.grafo.offsets, self.grafo.targets, self.pesos
+        reasentados = 0
+        while queue:
+            distancia, nodo = heapq.heappop(queue)
+            if distancia > distancias[nodo]:
+                continue
+            reasentados += 1
+            inicio, fin = offsets[nodo], offsets[nodo + 1]
+            for vecino, peso in zip(targets[inicio:fin].tolist(), pesos[inicio:fin].tolist()):
+                nueva = distancia + peso
+                if nueva < distancias[vecino]:
+                    distancias[vecino] = nueva
+                    arbol.cambiar_padre(vecino, nodo)
+                    heapq.heappush(queue, (nueva, vecino))
+        return reasentados
@@ -0,0 +1,129 @@
+import math
+import random
+import numpy as np
+from .csr import GrafoCSR
+'''
+Generadores de grafos sintéticos para pruebas de rendimiento
+Todos reciben el número aproximado de aristas dirigidas deseado y devuelven
+(grafo, coordenadas), donde coordenadas es un arreglo (n, 2) o None. Los
+nombres de nodo son los enteros 0..n-1. Las aristas se generan con NumPy para
+poder llegar a decenas de millones sin pasar por listas de Python.
+'''
+
+
+def _con_reversas(origenes, destinos, pesos):
+    """Duplica cada arista en sentido contrario (grafo no dirigido)."""
+    return (np.concatenate([origenes, destinos]), np.concatenate([destinos, origenes]),
+            np.concatenate([pesos, pesos]))
+
+
+def _construir(n, origenes, destinos, pesos):
+    return GrafoCSR.desde_arreglos(np.arange(n, dtype=np.int64), origenes, destinos, pesos)
+
+
+def rejilla(aristas, semilla=0):
+    """Rejilla cuadrada de 4 vecinos con pesos enteros aleatorios de 1 a 10."""
+    rng = np.random.default_rng(semilla)
+    lado = max(2, int(math.sqrt(aristas / 4)) + 1)
+    ids = np.arange(lado * lado).reshape(lado, lado)
+    origenes = np.concatenate([ids[:, :-1].ravel(), ids[:-1, :].ravel()])
+    destinos = np.concatenate([ids[:, 1:].ravel(), ids[1:, :].ravel()])
+    pesos = rng.integers(1, 11, size=len(origenes))
+    filas, columnas = np.divmod(np.arange(lado * lado), lado)
+    coordenadas = np.stack([columnas, filas], axis=1).astype(np.float64)
+    return _construir(lado * lado, *_con_reversas(origenes, destinos, pesos)), coordenadas
+
+
+def geometrico_aleatorio(aristas, grado=8, semilla=0):
+    """
+    Puntos uniformes en el cuadrado unitario unidos si están a menos de un
+    radio elegido para obtener el grado medio pedido. Peso = distancia.
+    """
+    rng = np.random.default_rng(semilla)
+    n = max(2, aristas // grado)
+    radio = math.sqrt(grado / (math.pi * n))
+    puntos = rng.random((n, 2))
+
+    # Cubetas de lado `radio`: solo se comparan puntos de celdas vecinas
+    celdas_lado = max(1, int(1 / radio))
+    cx = np.minimum((puntos[:, 0] * celdas_lado).astype(np.int64), celdas_lado - 1)
+    cy = np.minimum((puntos[:, 1] * celdas_lado).astype(np.int64), celdas_lado - 1)
+    celda = cy * celdas_lado + cx
+    orden = np.argsort(celda, kind='stable')
+    conteo = np.bincount(celda, minlength=celdas_lado * celdas_lado)
+    inicio = np.concatenate([[0], np.cumsum(conteo)[:-1]])
+
+    origenes, destinos = [], []
+    # Media vecindad (5 desplazamientos) para no generar cada par dos veces
+    for dx, dy in ((0, 0), (1, 0), (-1, 1), (0, 1), (1, 1)):
+        nx_, ny_ = cx + dx, cy + dy
+        validos = (nx_ >= 0) & (nx_ < celdas_lado) & (ny_ < celdas_lado)
+        i = np.flatnonzero(validos)
+        vecina = ny_[i] * celdas_lado + nx_[i]
+        cuantos = conteo[vecina]
+        i_rep = np.repeat(i, cuantos)
+        desplazamiento = np.arange(cuantos.sum()) - np.repeat(np.cumsum(cuantos) - cuantos, cuantos)
+        j = orden[np.repeat(inicio[vecina], cuantos) + desplazamiento]
+        mascara = np.linalg.norm(puntos[i_rep] - puntos[j], axis=1) <= radio
+        if (dx, dy) == (0, 0):
+            mascara &= i_rep < j
+        origenes.append(i_rep[mascara])
+        destinos.append(j[mascara])
+
+    origenes, destinos = np.concatenate(origenes), np.concatenate(destinos)
+    pesos = np.linalg.norm(puntos[origenes] - puntos[destinos], axis=1)
+    return _construir(n, *_con_reversas(origenes, destinos, pesos)), puntos
+
+
+def barabasi_albert(aristas, m=3, semilla=0):
+    """Grafo libre de escala por enlace preferencial, con pesos de 1 a 10."""
+    rng = random.Random(semilla)
+    n = max(m + 1, aristas // (2 * m))
+    origenes = np.empty((n - m) * m, dtype=np.int64)
+    destinos = np.empty((n - m) * m, dtype=np.int64)
+    # Lista de extremos repetidos: elegir uniformemente en ella es elegir
+    # proporcionalmente al grado
+    repetidos = list(range(m))
+    k = 0
+    for nodo in range(m, n):
+        elegidos = set()
+        while len(elegidos) < m:
+            elegidos.add(repetidos[int(rng.random() * len(repetidos))])
+        for destino in elegidos:
+            origenes[k], destinos[k] = nodo, destino
+            k += 1
+        repetidos.extend(elegidos)
+        repetidos.extend([nodo] * m)
+    pesos = np.random.default_rng(semilla).integers(1, 11, size=len(origenes))
+    return _construir(n, *_con_reversas(origenes, destinos, pesos)), None
+
+
+def tipo_carretera(aristas, semilla=0, eliminar=0.2, cada_autopista=16):
+    """
+    Red parecida a una ciudad: rejilla con nodos desplazados, un porcentaje de
+    calles eliminadas y avenidas rápidas cada `cada_autopista` filas/columnas.
+    Peso = longitud / velocidad.
+    """
+    rng = np.random.default_rng(semilla)
+    lado = max(2, int(math.sqrt(aristas / (4 * (1 - eliminar)))) + 1)
+    ids = np.arange(lado * lado).reshape(lado, lado)
+    filas, columnas = np.divmod(np.arange(lado * lado), lado)
+    coordenadas = np.stack([columnas, filas], axis=1) + rng.uniform(-0.3, 0.3, size=(lado * lado, 2))
+
+    origenes = np.concatenate([ids[:, :-1].ravel(), ids[:-1, :].ravel()])
+    destinos = np.concatenate([ids[:, 1:].ravel(), ids[1:, :].ravel()])
+    rapidas = np.concatenate([(filas[ids[:, :-1].ravel()] % cada_autopista) == 0,
+                              (columnas[ids[:-1, :].ravel()] % cada_autopista) == 0])
+    conservar = rapidas | (rng.random(len(origenes)) >= eliminar)
+    origenes, destinos, rapidas = origenes[conservar], destinos[conservar], rapidas[conservar]
+    longitud = np.linalg.norm(coordenadas[origenes] - coordenadas[destinos], axis=1)
+    pesos = longitud / np.where(rapidas, 3.0, 1.0)
+    return _construir(lado * lado, *_con_reversas(origenes, destinos, pesos)), coordenadas
+
+
+GENERADORES = {
+    'rejilla': rejilla,
+    'geometrico': geometrico_aleatorio,
+    'barabasi': barabasi_albert,
+    'carretera': tipo_carretera,
+}
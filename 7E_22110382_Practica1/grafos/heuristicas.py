@@ -0,0 +1,64 @@
+import math
+'''
+Heurísticas para A* sobre GrafoCSR
+Cada fábrica devuelve una función h(nodo, destino) que trabaja con ids y
+estima el costo restante. Para que A* sea óptimo la estimación no debe
+superar el costo real; con coordenadas esto depende de las unidades de los
+pesos, por eso las fábricas aceptan un factor de escala.
+'''
+
+RADIO_TIERRA_KM = 6371.0
+
+
+def _coordenadas_por_id(grafo, coordenadas):
+    """Ordena un diccionario {nombre: (x, y)} según los ids del grafo."""
+    xs, ys = [], []
+    for nombre in grafo.nombres:
+        x, y = coordenadas[nombre]
+        xs.append(float(x))
+        ys.append(float(y))
+    return xs, ys
+
+
+def cero(nodo, destino):
+    """Heurística nula: A* se comporta como Dijkstra."""
+    return 0
+
+
+def euclidiana(grafo, coordenadas, escala=1.0):
+    """
+    Distancia en línea recta sobre coordenadas planas.
+
+    Args:
+        grafo (GrafoCSR): Grafo al que pertenecen los ids.
+        coordenadas (dict): {nombre: (x, y)} para todos los nodos.
+        escala (float): Factor para convertir la distancia a unidades de peso.
+    """
+    xs, ys = _coordenadas_por_id(grafo, coordenadas)
+
+    def h(nodo, destino):
+        return escala * math.hypot(xs[nodo] - xs[destino], ys[nodo] - ys[destino])
+    return h
+
+
+def haversine(grafo, coordenadas, escala=1.0):
+    """
+    Distancia de círculo máximo en kilómetros.
+
+    Args:
+        grafo (GrafoCSR): Grafo al que pertenecen los ids.
+        coordenadas (dict): {nombre: (latitud, longitud)} en grados.
+        escala (float): Factor para convertir kilómetros a unidades de peso
+            (p. ej. minutos por kilómetro a la velocidad máxima de la red).
+    """
+    lats, lons = _coordenadas_por_id(grafo, coordenadas)
+    lats = [math.radians(lat) for lat in lats]
+    lons = [math.radians(lon) for lon in lons]
+    cos_lats = [math.cos(lat) for lat in lats]
+
+    def h(nodo, destino):
+        dlat = lats[destino] - lats[nodo]
+        dlon = lons[destino] - lons[nodo]
+        a = math.sin(dlat / 2) ** 2 + cos_lats[nodo] * cos_lats[destino] * math.sin(dlon / 2) ** 2
+        return escala * 2 * RADIO_TIERRA_KM * math.asin(min(1.0, math.sqrt(a)))
+    return h
@@ -0,0 +1,245 @@
+import heapq
+import json
+import numpy as np
+from .csr import GrafoCSR
+from .algoritmos import EstadisticasBusqueda
+'''
+Jerarquías de contracción (Contraction Hierarchies)
+Preprocesamiento fuera de línea para mapas estáticos: los nodos se contraen
+en orden de importancia y se agregan atajos que conservan las distancias. Una
+consulta es un Dijkstra bidireccional que solo sube en el orden de contracción,
+por lo que explora una fracción mínima del grafo. Las distancias coinciden con
+las de dijkstra; ante empates la ruta devuelta puede ser otra de igual costo.
+'''
+
+SIN_MEDIO = -1
+
+
+def _buscar_testigos(salida, origen, excluido, limite_costo, limite_asentados):
+    """Dijkstra local que evita el nodo que se está contrayendo."""
+    distancias = {origen: 0}
+    queue = [(0, origen)]
+    asentados = 0
+    while queue:
+        distancia, nodo = heapq.heappop(queue)
+        if distancia > distancias[nodo]:
+            continue
+        if distancia > limite_costo or asentados >= limite_asentados:
+            break
+        asentados += 1
+        for vecino, (peso, _) in salida[nodo].items():
+            if vecino == excluido:
+                continue
+            nueva = distancia + peso
+            if nueva < distancias.get(vecino, float('inf')):
+                distancias[vecino] = nueva
+                heapq.heappush(queue, (nueva, vecino))
+    return distancias
+
+
+def _atajos_necesarios(salida, entrada, nodo, limite_asentados):
+    """Atajos (u, w, costo) que hay que agregar si se contrae el nodo."""
+    atajos = []
+    for u, (peso_uv, _) in entrada[nodo].items():
+        salientes = [(w, peso_uv + peso_vw) for w, (peso_vw, _) in salida[nodo].items() if w != u]
+        if not salientes:
+            continue
+        testigos = _buscar_testigos(salida, u, nodo, max(c for _, c in salientes), limite_asentados)
+        for w, costo in salientes:
+            if testigos.get(w, float('inf')) > costo:
+                atajos.append((u, w, costo))
+    return atajos
+
+
+def _a_csr(nombres, aristas):
+    """Crea un GrafoCSR y el arreglo de nodos intermedios alineado con sus aristas."""
+    aristas.sort(key=lambda arista: arista[0])
+    origenes = np.array([a[0] for a in aristas], dtype=np.int64)
+    offsets = np.zeros(len(nombres) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(origenes, minlength=len(nombres)), out=offsets[1:])
+    grafo = GrafoCSR(nombres, offsets, [a[1] for a in aristas], [a[2] for a in aristas])
+    return grafo, np.array([a[3] for a in aristas], dtype=np.int32)
+
+
+def construir_jerarquia(grafo, limite_asentados=500):
+    """
+    Calcula el orden de contracción y los atajos de un grafo.
+
+    Args:
+        grafo (GrafoCSR): Grafo dirigido con pesos no negativos.
+        limite_asentados (int): Máximo de nodos que explora cada búsqueda de
+            testigos. Un límite menor acelera el preprocesamiento a cambio de
+            agregar algunos atajos innecesarios (nunca afecta la exactitud).
+
+    Returns:
+        JerarquiaContraccion: La jerarquía lista para consultas.
+    """
+    n = grafo.num_nodos
+    salida = [{} for _ in range(n)]   # salida[u][w] = (peso, medio)
+    entrada = [{} for _ in range(n)]  # entrada[w][u] = (peso, medio)
+    for u in range(n):
+        vecinos, pesos = grafo.vecinos(u)
+        for w, peso in zip(vecinos.tolist(), pesos.tolist()):
+            if w != u and peso < salida[u].get(w, (float('inf'),))[0]:
+                salida[u][w] = entrada[w][u] = (peso, SIN_MEDIO)
+
+    contraidos_vecinos = [0] * n
+
+    def prioridad(nodo):
+        atajos = _atajos_necesarios(salida, entrada, nodo, limite_asentados)
+        return len(atajos) - len(entrada[nodo]) - len(salida[nodo]) + contraidos_vecinos[nodo]
+
+    queue = [(prioridad(nodo), nodo) for nodo in range(n)]
+    heapq.heapify(queue)
+    rango = np.zeros(n, dtype=np.int32)
+    aristas_sube, aristas_baja = [], []
+    siguiente_rango = 0
+
+    while queue:
+        _, nodo = heapq.heappop(queue)
+        # Actualización perezosa: si la prioridad empeoró, se reinserta
+        actual = prioridad(nodo)
+        if queue and actual > queue[0][0]:
+            heapq.heappush(queue, (actual, nodo))
+            continue
+
+        rango[nodo] = siguiente_rango
+        siguiente_rango += 1
+        for w, (peso, medio) in salida[nodo].items():
+            aristas_sube.append((nodo, w, peso, medio))
+        for u, (peso, medio) in entrada[nodo].items():
+            aristas_baja.append((nodo, u, peso, medio))  # Se recorre al revés desde el destino
+
+        for u, w, costo in _atajos_necesarios(salida, entrada, nodo, limite_asentados):
+            if costo < salida[u].get(w, (float('inf'),))[0]:
+                salida[u][w] = entrada[w][u] = (costo, nodo)
+        for u in entrada[nodo]:
+            del salida[u][nodo]
+            contraidos_vecinos[u] += 1
+        for w in salida[nodo]:
+            del entrada[w][nodo]
+            contraidos_vecinos[w] += 1
+        salida[nodo], entrada[nodo] = {}, {}
+
+    sube, medio_sube = _a_csr(grafo.nombres, aristas_sube)
+    baja, medio_baja = _a_csr(grafo.nombres, aristas_baja)
+    return JerarquiaContraccion(rango, sube, medio_sube, baja, medio_baja)
+
+
+class JerarquiaContraccion:
+    def __init__(self, rango, sube, medio_sube, baja, medio_baja):
+        self.rango = rango
+        self.sube = sube              # Aristas u -> w con rango[w] > rango[u]
+        self.medio_sube = medio_sube
+        self.baja = baja              # Aristas w -> u invertidas, con rango[u] > rango[w]
+        self.medio_baja = medio_baja
+
+    def guardar(self, archivo):
+        """Guarda la jerarquía en un archivo .npz."""
+        nombres = self.sube.nombres
+        if isinstance(nombres, np.ndarray):
+            nombres = nombres.tolist()
+        datos = {'rango': self.rango, 'nombres': np.array(json.dumps(nombres))}
+        for prefijo, grafo, medio in (('sube', self.sube, self.medio_sube), ('baja', self.baja, self.medio_baja)):
+            datos[f'{prefijo}_offsets'] = grafo.offsets
+            datos[f'{prefijo}_targets'] = grafo.targets
+            datos[f'{prefijo}_weights'] = grafo.weights
+            datos[f'{prefijo}_medio'] = medio
+        np.savez(archivo, **datos)
+
+    @classmethod
+    def cargar(cls, archivo):
+        """Carga una jerarquía guardada con guardar()."""
+        with np.load(archivo) as datos:
+            nombres = json.loads(str(datos['nombres']))
+            partes = []
+            for prefijo in ('sube', 'baja'):
+                grafo = GrafoCSR(nombres, datos[f'{prefijo}_offsets'], datos[f'{prefijo}_targets'],
+                                 datos[f'{prefijo}_weights'])
+                partes += [grafo, datos[f'{prefijo}_medio']]
+            return cls(datos['rango'], *partes)
+
+    def _medio(self, u, w):
+        """Nodo intermedio de la arista u -> w de la jerarquía (o SIN_MEDIO)."""
+        if self.rango[w] > self.rango[u]:
+            grafo, medio, desde, hacia = self.sube, self.medio_sube, u, w
+        else:
+            grafo, medio, desde, hacia = self.baja, self.medio_baja, w, u
+        inicio, fin = grafo.offsets[desde], grafo.offsets[desde + 1]
+        mejor = None
+        for i in range(inicio, fin):
+            if grafo.targets[i] == hacia and (mejor is None or grafo.weights[i] < grafo.weights[mejor]):
+                mejor = i
+        return int(medio[mejor])
+
+    def _desempacar(self, ruta):
+        """Sustituye cada atajo de la ruta por las aristas originales."""
+        completa = [ruta[0]]
+        pendientes = [(u, w) for u, w in zip(ruta, ruta[1:])][::-1]
+        while pendientes:
+            u, w = pendientes.pop()
+            medio = self._medio(u, w)
+            if medio == SIN_MEDIO:
+                completa.append(w)
+            else:
+                pendientes += [(medio, w), (u, medio)]
+        return completa
+
+    def consulta(self, start, goal, estadisticas=None):
+        """
+        Ruta más corta entre dos nodos usando la jerarquía.
+
+        Args:
+            start, goal: Nombres de los nodos de origen y destino.
+            estadisticas (EstadisticasBusqueda, opcional): Contadores a actualizar.
+
+        Returns:
+            tuple: (ruta como lista de nombres, costo) o (None, inf) si no hay ruta.
+        """
+        origen, destino = self.sube.id_de(start), self.sube.id_de(goal)
+        busquedas = (
+            (self.sube, {origen: 0}, {origen: None}, [(0, origen)]),
+            (self.baja, {destino: 0}, {destino: None}, [(0, destino)]),
+        )
+        mejor, encuentro = float('inf'), None
+        stats = estadisticas if estadisticas is not None else EstadisticasBusqueda()
+        stats.inserciones += 2
+
+        while True:
+            topes = [queue[0][0] if queue else float('inf') for _, _, _, queue in busquedas]
+            if min(topes) >= mejor:
+                break
+            lado = 0 if topes[0] <= topes[1] else 1
+            grafo, distancias, predecesores, queue = busquedas[lado]
+            otras = busquedas[1 - lado][1]
+
+            distancia, nodo = heapq.heappop(queue)
+            if distancia > distancias[nodo]:
+                stats.obsoletos += 1
+                continue
+            stats.expandidos += 1
+            if nodo in otras and distancia + otras[nodo] < mejor:
+                mejor, encuentro = distancia + otras[nodo], nodo
+
+            vecinos, pesos = grafo.vecinos(nodo)
+            for vecino, peso in zip(vecinos.tolist(), pesos.tolist()):
+                nueva = distancia + peso
+                if nueva < distancias.get(vecino, float('inf')):
+                    distancias[vecino] = nueva
+                    predecesores[vecino] = nodo
+                    heapq.heappush(queue, (nueva, vecino))
+                    stats.inserciones += 1
+
+        if encuentro is None:
+            return None, float('inf')
+
+        ida, nodo = [], encuentro
+        while nodo is not None:
+            ida.append(nodo)
+            nodo = busquedas[0][2][nodo]
+        vuelta, nodo = [], busquedas[1][2][encuentro]
+        while nodo is not None:
+            vuelta.append(nodo)
+            nodo = busquedas[1][2][nodo]
+        ruta = self._desempacar(ida[::-1] + vuelta)
+        return self.sube.a_nombres(ruta), mejor
@@ -0,0 +1,73 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from .algoritmos import dijkstra_desde
+'''
+Consultas de ruta más corta por lotes (uno a muchos y muchos a muchos)
+Se ejecuta una sola búsqueda de Dijkstra por origen, que se detiene en cuanto
+todos los destinos pedidos están asentados. Las búsquedas se reparten en un
+pool de procesos; cada trabajador recibe el grafo una sola vez al iniciar.
+'''
+
+_grafo_trabajador = None
+
+
+def _inicializar_trabajador(grafo):
+    global _grafo_trabajador
+    _grafo_trabajador = grafo
+
+
+def _buscar(grafo, origen, destinos, con_predecesores):
+    distancias, predecesores = dijkstra_desde(grafo, origen, destinos)
+    fila = np.array([distancias[d] for d in destinos], dtype=np.float64)
+    if con_predecesores:
+        return fila, np.array(predecesores, dtype=np.int32)
+    return fila, None
+
+
+def _buscar_en_trabajador(origen, destinos, con_predecesores):
+    return _buscar(_grafo_trabajador, origen, destinos, con_predecesores)
+
+
+def matriz_distancias(grafo, origenes, destinos, con_predecesores=False, procesos=None):
+    """
+    Calcula la matriz de distancias entre cada origen y cada destino.
+
+    Args:
+        grafo (GrafoCSR): Grafo con pesos no negativos.
+        origenes (list): Nombres de los nodos de origen.
+        destinos (list): Nombres de los nodos de destino.
+        con_predecesores (bool): Si es True también devuelve el árbol de
+            predecesores (ids) de cada origen.
+        procesos (int, opcional): Número de procesos; por defecto os.cpu_count().
+            Con 1 se calcula en el proceso actual.
+
+    Returns:
+        tuple: (matriz, arboles) donde matriz es un np.ndarray de forma
+            (len(origenes), len(destinos)) con inf donde no hay ruta, y arboles
+            es una lista de arreglos de predecesores o None.
+    """
+    ids_origen = [grafo.id_de(nombre) for nombre in origenes]
+    ids_destino = [grafo.id_de(nombre) for nombre in destinos]
+    procesos = procesos or os.cpu_count() or 1
+
+    if procesos == 1 or len(ids_origen) <= 1:
+        resultados = [_buscar(grafo, origen, ids_destino, con_predecesores) for origen in ids_origen]
+    else:
+        with ProcessPoolExecutor(max_workers=min(procesos, len(ids_origen)),
+                                 initializer=_inicializar_trabajador, initargs=(grafo,)) as pool:
+            n = len(ids_origen)
+            resultados = list(pool.map(_buscar_en_trabajador, ids_origen, [ids_destino] * n,
+                                       [con_predecesores] * n, chunksize=max(1, n // (4 * procesos))))
+
+    matriz = np.empty((len(ids_origen), len(ids_destino)), dtype=np.float64)
+    for i, (fila, _) in enumerate(resultados):
+        matriz[i] = fila
+    arboles = [arbol for _, arbol in resultados] if con_predecesores else None
+    return matriz, arboles
+
+
+def distancias_desde(grafo, origen, destinos, con_predecesores=False):
+    """Versión uno a muchos de matriz_distancias (sin pool de procesos)."""
+    matriz, arboles = matriz_distancias(grafo, [origen], destinos, con_predecesores, procesos=1)
+    return matriz[0], arboles[0] if arboles else None